@@ -1,7 +1,7 @@
 import argparse
 import importlib.metadata
 
-from .tb_creator import create_testbench
+from .tb_creator import build_index, create_testbench
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -12,6 +12,20 @@ if __name__ == "__main__":
     # Optional argument flag which defaults to False
     parser.add_argument("-c", "--create", action="store_true", default=False)
 
+    # Optional directory of Verilog sources to index
+    parser.add_argument("-i", "--index", metavar="DIR", default=None, help="Build or update the module index of DIR")
+
+    # Optional flag to keep the --index file at the top of DIR instead of the cache directory
+    parser.add_argument(
+        "--index-in-tree",
+        action="store_true",
+        default=False,
+        help="Write the --index file into DIR instead of the cache directory",
+    )
+
+    # Optional number of worker processes for --index, defaults to the number of CPUs
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes for --index")
+
     # Optional verbosity counter (eg. -v, -vv, -vvv, etc.)
     parser.add_argument(
         "-v",
@@ -38,3 +52,14 @@ if __name__ == "__main__":
         print("Creating a new testbench")
         # Call the function to create a new example application
         create_testbench()
+
+    if args.index is not None:
+        index = build_index(args.index, jobs=args.jobs, in_tree=args.index_in_tree)
+        if index.path is None:
+            print(f"Indexed {len(index.modules)} modules from {len(index.files)} files, not saved as caching is off")
+        else:
+            print(f"Indexed {len(index.modules)} modules from {len(index.files)} files into {index.path}")
+        for name, files in index.duplicates.items():
+            print(f"  {name} is defined in {', '.join(files)}")
+        for fname, error in index.errors().items():
+            print(f"  {fname}: {error}")
@@ -1,4 +1,4 @@
-from ._create_testbench import create_testbench, mk_verilog_tb_wrap
+from ._create_testbench import create_testbench, mk_verilog_tb_wrap, uut_sources
 from ._helpers import (
     get_fname,
     get_kwargs_dict,
@@ -8,21 +8,38 @@ from ._helpers import (
     param_dict_to_str,
     print_param_changes,
 )
+from ._module_cache import ModuleCache, get_module_cache, set_module_cache
+from ._module_index import ModuleIndex, build_index
+from ._port_classifier import PortBundle, PortClassifier, get_port_classifier
+from ._verilog_expr import VerilogExprError, eval_expr, eval_params, port_width
 from ._verilog_iface import verilog_iface
 from ._verilog_module import verilog_module
 from ._verilog_port import verilog_port
 from ._verilog_reset import verilog_reset
 
 __all__ = [
+    "ModuleCache",
+    "ModuleIndex",
+    "PortBundle",
+    "PortClassifier",
+    "VerilogExprError",
+    "build_index",
     "create_testbench",
+    "eval_expr",
+    "eval_params",
     "get_fname",
     "get_kwargs_dict",
     "get_kwargs_str",
+    "get_module_cache",
+    "get_port_classifier",
     "mk_test_folder",
     "mk_verilog_tb_wrap",
     "param_changes",
     "param_dict_to_str",
+    "port_width",
     "print_param_changes",
+    "set_module_cache",
+    "uut_sources",
     "verilog_iface",
     "verilog_module",
     "verilog_port",
@@ -33,6 +33,7 @@ from pathlib import Path
 
 import questionary
 
+from ._module_index import build_index, index_cache_path
 from ._verilog_iface import verilog_iface
 from ._verilog_module import verilog_module
 from ._verilog_reset import verilog_reset
@@ -125,11 +126,15 @@ def create_testbench(debug=False):  # noqa: PLR0912, PLR0915
     uut = uut.replace(".py", "")
 
     # add all files from src folder
-    tb_lst = ["Yes", "No"]
+    tb_lst = ["Yes", "No", "Only files used by the uut"]
     add_all = questionary.select(
         "Add all Verilog files from source folder:", choices=tb_lst
     ).ask()  # returns value of selection
-    if add_all == "Yes":
+    primary_lib_dirs = []
+    if add_all == tb_lst[2]:
+        # follow module instantiations down from the uut through the index of the source folder
+        primary_src_files, primary_lib_dirs = uut_sources(uut_path)
+    elif add_all == "Yes":
         # make list of file names only
         cdir_file_names = []
         for f in cdir_files_filt:
@@ -142,6 +147,8 @@ def create_testbench(debug=False):  # noqa: PLR0912, PLR0915
     print("Source files found:")
     for psf in primary_src_files:
         print(f"* {psf}")
+    for lib in primary_lib_dirs:
+        print(f"* -y {lib}")
     print("**************************")
 
     # add additional verilog files?
@@ -221,6 +228,7 @@ def create_testbench(debug=False):  # noqa: PLR0912, PLR0915
                 uut_name=uut,
                 primary_src_dir=primary_src_dir,
                 primary_src_files=primary_src_files,
+                primary_lib_dirs=primary_lib_dirs,
                 additional_src_dir=additional_src_dir,
                 additional_src_files=additional_src_files,
                 params_iface=params_iface_lst,
@@ -239,9 +247,14 @@ def create_testbench(debug=False):  # noqa: PLR0912, PLR0915
             print("\n**************************")
             print(f"Connecting parameters to {iface_nm_str} interface")
             params_lst = [p[0] for p in params_iface_lst]
+            # interface parameters that follow from the port widths need no question
+            derived = mod.iface_params(iface_nm_str)
             connected_iface_sig_lst = []
             for sig in iface_sigs_str.split(","):
-                if sig.isupper():
+                if sig.strip() in derived:
+                    print(f"{sig.strip()}={derived[sig.strip()]} from the port widths")
+                    connected_iface_sig_lst.append(f"{sig.strip()}={derived[sig.strip()]}")
+                elif sig.isupper():
                     # probably a parameter
                     choices = ["Custom"]
                     choices.extend(params_lst)
@@ -315,6 +328,7 @@ def create_testbench(debug=False):  # noqa: PLR0912, PLR0915
                     associated_reset=associated_reset,
                     pause=pause,
                     example=example,
+                    is_master=mod.iface_is_master(iface_name),
                 )
             )
 
@@ -334,6 +348,29 @@ def create_testbench(debug=False):  # noqa: PLR0912, PLR0915
                 write_tf_uut(f, uut_name=uut, clocks=clocks_lst, resets=resets_lst, iface_lst=iface_lst)
 
 
+def uut_sources(uut_path, jobs=None):
+    """
+    returns (files, lib_dirs) needed to compile the first module in uut_path, relative to its folder
+    the module index of the folder is built or updated in the cache directory, nothing is written to
+    the source folder, modules that are not found are reported and left out, only uut_path is
+    returned when it could not be scanned
+    """
+    uut_path = Path(uut_path)
+    path = index_cache_path(uut_path.parent)
+    kept = "" if path is None else f", index kept in {path}"
+    print(f"Indexing Verilog files under {uut_path.parent}{kept}")
+    index = build_index(uut_path.parent, jobs=jobs)
+    entry = index.files.get(uut_path.name)
+    modules = [] if entry is None else entry["modules"]
+    if not modules:
+        print(f"Could not scan {uut_path.name}: {index.errors().get(uut_path.name)}")
+        return [uut_path.name], []
+    srcs = index.source_list(modules[0]["name"])
+    for name in srcs.missing:
+        print(f"Module {name} not found under {uut_path.parent}, add its file as an additional Verilog file")
+    return srcs.files, srcs.lib_dirs
+
+
 def mk_verilog_tb_wrap(uut, ofile=None, params=None):
     """
     creates the verilog testbench file for use in a MyHDL cosimulation
@@ -0,0 +1,165 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parsed module cache
+
+Reading the Verilog file is by far the slowest part of building a
+verilog_module, and the same file is read again for every testbench wrapper and
+every point of a parameter sweep. The result of a parse, the module name
+and the mk_ports_lst() port list, is kept in an in process LRU and in a JSON
+file per entry on disk. Entries are keyed by a hash of the file content and the
+parser version, so an edited file or a new parser never returns a stale entry.
+
+Interface classification is not stored, it depends on the interfaces that are
+registered and is cheap to redo from the port list.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import pyparsing
+
+# bump when scan_module(), header_parser() or mk_ports_lst() change what they return
+MODULE_CACHE_VERSION = 2
+MODULE_CACHE_ENV = "VERI_QUICKBENCH_CACHE"
+
+
+def default_cache_dir():
+    """
+    directory of the on disk cache
+    $VERI_QUICKBENCH_CACHE when set, an empty value turns the on disk cache off,
+    else veri_quickbench under $XDG_CACHE_HOME or ~/.cache
+    """
+    path = os.environ.get(MODULE_CACHE_ENV)
+    if path is not None:
+        return Path(path) if path else None
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "veri_quickbench"
+
+
+class ModuleCache(object):
+    def __init__(self, path=None, size=64):
+        """
+        Cache of parsed Verilog modules
+        path - directory for the on disk cache, None keeps entries in memory only
+        size - number of entries kept in memory
+        hits, disk_hits, misses - lookups answered from memory, from disk and by parsing
+        """
+        self.path = None if path is None else Path(path)
+        self.size = size
+        self.version = f"{MODULE_CACHE_VERSION}:{pyparsing.__version__}"
+        self._lru = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, data):
+        """cache key for the bytes of a file"""
+        h = hashlib.sha256(self.version.encode())
+        h.update(b"\0")
+        h.update(data)
+        return h.hexdigest()
+
+    def _remember(self, key, ir):
+        self._lru[key] = ir
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    def get(self, key):
+        """returns the entry for key or None"""
+        ir = self._lru.get(key)
+        if ir is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return ir
+        if self.path is None:
+            return None
+        try:
+            with open(self.path / f"{key}.json", "r") as f:
+                ir = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if ir.get("version") != self.version:
+            return None
+        self._remember(key, ir)
+        self.disk_hits += 1
+        return ir
+
+    def put(self, key, ir):
+        """stores an entry, a cache directory that cannot be written only loses the disk copy"""
+        ir = dict(ir, version=self.version)
+        self._remember(key, ir)
+        if self.path is None:
+            return
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp = self.path / f"{key}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(ir, f)
+            # readers only ever see a complete file
+            os.replace(tmp, self.path / f"{key}.json")
+        except OSError:
+            pass
+
+    def load(self, ifile, parse):
+        """
+        returns the entry for ifile, calling parse(text) on a miss
+        parse - returns a dict with the module "name" and its "ports" list
+        """
+        with open(ifile, "rb") as f:
+            data = f.read()
+        key = self.key(data)
+        ir = self.get(key)
+        if ir is None:
+            self.misses += 1
+            ir = parse(data.decode(errors="replace"))
+            self.put(key, ir)
+        return ir
+
+    def clear(self, disk=False):
+        """empties the in memory entries, and the on disk ones when disk is True"""
+        self._lru.clear()
+        if disk and self.path is not None and self.path.is_dir():
+            for p in self.path.glob("*.json"):
+                p.unlink()
+
+
+_module_cache = None
+
+
+def get_module_cache():
+    """returns the ModuleCache used by verilog_module, created in default_cache_dir() on first use"""
+    global _module_cache  # noqa: PLW0603
+    if _module_cache is None:
+        _module_cache = ModuleCache(path=default_cache_dir())
+    return _module_cache
+
+
+def set_module_cache(cache):
+    """replaces the ModuleCache used by verilog_module, None goes back to the default on next use"""
+    global _module_cache  # noqa: PLW0603
+    _module_cache = cache
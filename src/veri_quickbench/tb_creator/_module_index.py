@@ -0,0 +1,253 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Project wide Verilog module index
+
+Walks a source tree for .v and .sv files and records every module found in
+them: the file, parameters, ports, interface bundles and the modules it
+instantiates. Files are read with scan_file() in a process pool, the index is
+kept in a JSON file in the cache directory, or at the top of the tree when
+asked for, and an update only rescans files whose size or modification time
+changed since the last one.
+
+Interface bundles are worked out in the calling process from the stored ports,
+so plugin interfaces registered there are seen without rescanning.
+
+source_list() follows the instantiations down from a top module and returns
+only the files the design needs, in compile order, instead of every file in
+the source folder.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ._module_cache import default_cache_dir
+from ._port_classifier import get_port_classifier
+from ._verilog_port import verilog_port
+from ._verilog_scanner import VerilogScanError, scan_file
+
+# bump when the layout of the index file or scan_file() output changes
+INDEX_VERSION = 2
+INDEX_FILE = ".veri_quickbench_index.json"
+VERILOG_SUFFIXES = (".v", ".sv")
+# below this many changed files a process pool costs more than it saves
+_POOL_MIN_FILES = 8
+
+# files - relative paths to compile in order, leaf modules first and the top last
+# lib_dirs - relative directories for iverilog -y, holding the <module>.v files not listed in files
+# missing - instantiated modules not found in the index, ie vendor primitives
+SourceList = namedtuple("SourceList", ["files", "lib_dirs", "missing"])
+
+
+def _scan_file(path):
+    """process pool worker, returns (path, modules, error)"""
+    try:
+        with open(path, "rb") as f:
+            text = f.read().decode(errors="replace")
+        return path, scan_file(text), None
+    except (OSError, VerilogScanError) as e:
+        return path, [], str(e)
+
+
+class ModuleIndex(object):
+    def __init__(self, root, path=None):
+        """
+        Index of the Verilog modules under a directory
+        root - top of the source tree
+        path - index file, index_cache_path(root) when None, when caching is off as well the
+               index is only kept in memory and save() and load() do nothing
+        files - dict of file path relative to root -> {"stamp": [mtime_ns, size], "modules": [...], "error": str}
+        modules - dict of module name -> entry, rebuilt from files by update() and load()
+        duplicates - dict of module name -> every file defining it, for names found in more than one file
+        """
+        self.root = Path(root)
+        self.path = index_cache_path(root) if path is None else Path(path)
+        self.files = {}
+        self.modules = {}
+        self.duplicates = {}
+
+    def sources(self):
+        """relative path -> [mtime_ns, size] of the Verilog files under root, hidden directories are skipped"""
+        found = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+            for fn in filenames:
+                if fn.endswith(VERILOG_SUFFIXES):
+                    full = os.path.join(dirpath, fn)
+                    st = os.stat(full)
+                    found[Path(full).relative_to(self.root).as_posix()] = [st.st_mtime_ns, st.st_size]
+        return found
+
+    def update(self, jobs=None):
+        """
+        rescans new and changed files, drops removed ones and rebuilds the module map
+        jobs - worker processes, os.cpu_count() when None, 1 scans in this process
+        returns a dict with the number of files "scanned", "removed" and "unchanged"
+        """
+        found = self.sources()
+        removed = [f for f in self.files if f not in found]
+        for f in removed:
+            del self.files[f]
+        changed = sorted(f for f, stamp in found.items() if self.files.get(f, {}).get("stamp") != stamp)
+        paths = [str(self.root / f) for f in changed]
+        if jobs == 1 or len(paths) < _POOL_MIN_FILES:
+            results = map(_scan_file, paths)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_scan_file, paths, chunksize=max(1, len(paths) // 64)))
+        for f, (_, modules, error) in zip(changed, results):
+            entry = {"stamp": found[f], "modules": modules}
+            if error is not None:
+                entry["error"] = error
+            self.files[f] = entry
+        if changed or removed:
+            self._build()
+        return {"scanned": len(changed), "removed": len(removed), "unchanged": len(found) - len(changed)}
+
+    def _build(self):
+        """module name -> entry from the per file scan results"""
+        classifier = get_port_classifier()
+        self.modules = {}
+        self.duplicates = {}
+        for f in sorted(self.files):
+            for m in self.files[f]["modules"]:
+                name = m["name"]
+                if name in self.modules:
+                    self.duplicates.setdefault(name, [self.modules[name]["file"]]).append(f)
+                    continue
+                ports = [verilog_port(*x) for x in m["ports"]]
+                interfaces = {
+                    b.name: {"iface": b.iface, "master": b.is_master(), "signals": sorted(b.ports)}
+                    for b in classifier.group(ports).values()
+                }
+                self.modules[name] = {
+                    "file": f,
+                    "params": [x for x in m["ports"] if x[0] == "parameter"],
+                    "ports": [x for x in m["ports"] if x[0] == "port"],
+                    "interfaces": interfaces,
+                    "instances": m["instances"],
+                }
+
+    def lookup(self, name):
+        """returns the entry of module name or None"""
+        return self.modules.get(name)
+
+    def source_list(self, top, libs=True):
+        """
+        returns the SourceList of module top and everything it instantiates
+        libs - files named after the only module they define are left to iverilog -y lookup, their
+               directories are returned in lib_dirs instead, the file of top is always listed
+        raises KeyError when top is not in the index
+        """
+        if top not in self.modules:
+            raise KeyError(f"module {top} not found in the index of {self.root}")
+        files = []
+        lib_dirs = []
+        missing = []
+        seen = set()
+        # iterative post order walk, a module is emitted after everything it instantiates
+        stack = [(top, iter(self.modules[top]["instances"]))]
+        seen.add(top)
+        while stack:
+            name, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                f = self.modules[name]["file"]
+                if libs and name != top and self._is_lib_file(name, f):
+                    d = Path(f).parent.as_posix()
+                    if d not in lib_dirs:
+                        lib_dirs.append(d)
+                elif f not in files:
+                    files.append(f)
+            elif child not in seen:
+                seen.add(child)
+                if child in self.modules:
+                    stack.append((child, iter(self.modules[child]["instances"])))
+                else:
+                    missing.append(child)
+        return SourceList(files, lib_dirs, missing)
+
+    def _is_lib_file(self, name, f):
+        """True when iverilog -y finds module name in f, ie a .v file named after its only module"""
+        p = Path(f)
+        return p.suffix == ".v" and p.stem == name and len(self.files[f]["modules"]) == 1
+
+    def errors(self):
+        """relative path -> message for the files that could not be scanned"""
+        return {f: e["error"] for f, e in self.files.items() if "error" in e}
+
+    def save(self):
+        """writes the index file, readers only ever see a complete file"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        """reads the index file, returns False and starts empty when it is missing or from another version"""
+        data = None
+        if self.path is not None:
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            self.files = {}
+            self._build()
+            return False
+        self.files = data["files"]
+        self._build()
+        return True
+
+
+def index_cache_path(root):
+    """index file of root kept in the cache directory, see default_cache_dir(), None when caching is off"""
+    cache = default_cache_dir()
+    if cache is None:
+        return None
+    key = hashlib.sha256(str(Path(root).resolve()).encode()).hexdigest()[:16]
+    return cache / "index" / f"{key}.json"
+
+
+def build_index(root, jobs=None, path=None, in_tree=False):
+    """
+    loads the index of root, brings it up to date, saves it and returns the ModuleIndex
+    path - index file, see ModuleIndex
+    in_tree - if True and path is None, the index is kept in INDEX_FILE at the top of root
+    """
+    if path is None and in_tree:
+        path = Path(root) / INDEX_FILE
+    index = ModuleIndex(root, path=path)
+    index.load()
+    index.update(jobs=jobs)
+    index.save()
+    return index
@@ -0,0 +1,136 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Port to interface classification
+
+A port belongs to an interface bundle when its name has the form
+<prefix><iface>[_<name>]_<signal>, ie s_axis_tdata or m_axi_lite_in_awaddr,
+where <signal> is a signal of the registered interface <iface>. The classifier
+indexes the "_" separated tokens of every registered signal and interface name
+once, a port name is then classified by looking up its trailing tokens in the
+signal index and the tokens before them in the interface index. Names that do
+not end in a signal of the interface, ie s_axis_foo_bar, are plain ports.
+
+Whether the module is master or slave of a bundle follows from the port
+directions: a signal the interface table marks OUT is driven by the master, so
+it is an output of a master module and an input of a slave module.
+"""
+
+from ..tb_endpoints import INTFC_SPECS, get_intfc_lst
+from ..tb_endpoints._intfc import IN, OUT
+
+
+class PortBundle(object):
+    def __init__(self, name, iface, spec):
+        """
+        Ports of one interface instance
+        name - bundle name, ie s_axis
+        iface - interface type, ie axis
+        spec - IntfcSpec of the interface type
+        ports - dict of interface signal name -> verilog_port
+        """
+        self.name = name
+        self.iface = iface
+        self.spec = spec
+        self.ports = {}
+
+    def is_master(self):
+        """
+        True when the module drives the bundle as master/source, False when it is the slave/sink,
+        None when the port directions do not tell, ie only inout ports
+        """
+        directions = {s.name: s.direction for s in self.spec.signals}
+        votes = 0
+        for sig, p in self.ports.items():
+            d = directions.get(sig)
+            if p.pdir == "output":
+                votes += 1 if d == OUT else -1
+            elif p.pdir == "input":
+                votes += 1 if d == IN else -1
+        if votes == 0:
+            return None
+        return votes > 0
+
+
+class PortClassifier(object):
+    def __init__(self, specs=None):
+        """
+        Classifies port names against a set of interface types
+        specs - dict of interface name -> IntfcSpec, the tb_endpoints registry when None
+        """
+        self.specs = dict(INTFC_SPECS if specs is None else specs)
+        self._sigs = {}  # signal name tokens -> names of the interfaces with that signal
+        self._ifaces = {}  # interface name tokens -> interface name
+        for nm, spec in self.specs.items():
+            self._ifaces[tuple(nm.lower().split("_"))] = nm
+            for s in spec.signals:
+                self._sigs.setdefault(tuple(s.name.lower().split("_")), set()).add(nm)
+        self._sig_len = max((len(k) for k in self._sigs), default=0)
+        self._iface_len = max((len(k) for k in self._ifaces), default=0)
+
+    def classify(self, pname):
+        """
+        returns (bundle name, interface name, signal name) when pname is a port of an interface, else None
+        """
+        tokens = pname.split("_")
+        low = [t.lower() for t in tokens]
+        for n in range(1, min(self._sig_len, len(tokens) - 1) + 1):
+            ifaces = self._sigs.get(tuple(low[-n:]))
+            if ifaces is None:
+                continue
+            # the interface name nearest the signal, the longest one at each position
+            for end in range(len(tokens) - n, 0, -1):
+                for k in range(min(self._iface_len, end), 0, -1):
+                    nm = self._ifaces.get(tuple(low[end - k : end]))
+                    if nm in ifaces:
+                        return "_".join(tokens[:-n]), nm, "_".join(low[-n:])
+        return None
+
+    def group(self, ports):
+        """
+        groups the classified ports of a module in one pass
+        ports - list of verilog_port
+        returns a dict of bundle name -> PortBundle, in the order the bundles first appear
+        """
+        bundles = {}
+        for p in ports:
+            if p.pstyle == "port" and p.is_iface:
+                b = bundles.get(p.iface_name)
+                if b is None:
+                    b = bundles[p.iface_name] = PortBundle(p.iface_name, p.iface, self.specs[p.iface])
+                b.ports[p.iface_sig] = p
+        return bundles
+
+
+_classifier = None
+_classifier_key = None
+
+
+def get_port_classifier():
+    """returns a PortClassifier of the registered interfaces, it is only rebuilt when the registry changes"""
+    global _classifier, _classifier_key  # noqa: PLW0603
+    key = get_intfc_lst()  # a new tuple every time the registry changes
+    if _classifier is None or key is not _classifier_key:
+        _classifier = PortClassifier()
+        _classifier_key = key
+    return _classifier
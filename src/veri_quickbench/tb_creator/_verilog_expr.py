@@ -0,0 +1,450 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Verilog constant expressions
+
+Parameter values and port ranges are constant expressions of literals and
+other parameters, ie DATA_WIDTH/8-1 or $clog2(DEPTH). An expression is parsed
+once into a small tree of tuples:
+
+    ("num", value)
+    ("id", name)
+    ("call", name, [args])
+    ("un", op, a)
+    ("bin", op, a, b)
+    ("cond", c, a, b)
+
+which is either evaluated to an int for a given set of parameter values, or
+written out as a Python expression of the parameter names for the generated
+testbench files. Parsed trees and evaluated parameter sets are memoized, a
+parameter sweep evaluates each distinct set once.
+"""
+
+import re
+from functools import lru_cache
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+      (?P<num>(?:\d[\d_]*)?\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-F_xXzZ?]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    | (?P<id>[A-Za-z_][\w$]*)
+    | (?P<sys>\$[A-Za-z_]\w*)
+    | (?P<op>\*\*|<<<|>>>|<<|>>|<=|>=|===|!==|==|!=|&&|\|\||~\^|\^~|[-+*/%<>!~&|^?:(),])
+    )""",
+    re.X,
+)
+
+_BASES = {"b": 2, "o": 8, "d": 10, "h": 16}
+
+# Verilog binary operator precedence, higher binds tighter
+_BINARY = {
+    "||": 1,
+    "&&": 2,
+    "|": 3,
+    "^": 4,
+    "~^": 4,
+    "^~": 4,
+    "&": 5,
+    "==": 6,
+    "!=": 6,
+    "===": 6,
+    "!==": 6,
+    "<": 7,
+    "<=": 7,
+    ">": 7,
+    ">=": 7,
+    "<<": 8,
+    ">>": 8,
+    "<<<": 8,
+    ">>>": 8,
+    "+": 9,
+    "-": 9,
+    "*": 10,
+    "/": 10,
+    "%": 10,
+    "**": 11,
+}
+_UNARY = frozenset(("+", "-", "!", "~"))
+
+
+def _div(a, b):
+    """Verilog integer division truncates toward zero"""
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def _mod(a, b):
+    """the sign of a Verilog remainder follows the dividend"""
+    return a - b * _div(a, b)
+
+
+_OPS = {
+    "||": lambda a, b: int(bool(a) or bool(b)),
+    "&&": lambda a, b: int(bool(a) and bool(b)),
+    "|": lambda a, b: a | b,
+    "^": lambda a, b: a ^ b,
+    "~^": lambda a, b: ~(a ^ b),
+    "^~": lambda a, b: ~(a ^ b),
+    "&": lambda a, b: a & b,
+    "==": lambda a, b: int(a == b),
+    "!=": lambda a, b: int(a != b),
+    "===": lambda a, b: int(a == b),
+    "!==": lambda a, b: int(a != b),
+    "<": lambda a, b: int(a < b),
+    "<=": lambda a, b: int(a <= b),
+    ">": lambda a, b: int(a > b),
+    ">=": lambda a, b: int(a >= b),
+    "<<": lambda a, b: a << b,
+    ">>": lambda a, b: a >> b,
+    "<<<": lambda a, b: a << b,
+    ">>>": lambda a, b: a >> b,
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": _div,
+    "%": _mod,
+    "**": lambda a, b: a**b,
+}
+
+
+def clog2(x):
+    """ceiling of log2, as $clog2, 0 for 0 and 1"""
+    return max(int(x) - 1, 0).bit_length()
+
+
+# abs is not Verilog, width_tree() uses it for ranges whose direction depends on the parameters
+_FUNCS = {"$clog2": clog2, "abs": abs}
+
+
+class VerilogExprError(Exception):
+    pass
+
+
+def _literal(text):
+    """value of a Verilog number, ie 8'hff, 'd10, 4'b1010 or 1_000"""
+    text = text.replace("_", "").replace(" ", "")
+    if "'" not in text:
+        if not text.isdigit():
+            raise VerilogExprError(f"real number {text} in a constant expression")
+        return int(text)
+    _, rest = text.split("'")
+    digits = rest.lstrip("sS")
+    base = _BASES[digits[0].lower()]
+    digits = digits[1:]
+    if any(c in "xXzZ?" for c in digits):
+        raise VerilogExprError(f"{text} has x or z bits")
+    return int(digits, base)
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            raise VerilogExprError(f"cannot read '{text[pos:].strip()}' in {text}")
+        tokens.append((m.lastgroup, m.group(m.lastgroup)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser(object):
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, op=None):
+        kind, t = self.peek()
+        if kind is None:
+            raise VerilogExprError(f"unexpected end of {self.text}")
+        if op is not None and t != op:
+            raise VerilogExprError(f"expected '{op}' but found '{t}' in {self.text}")
+        self.pos += 1
+        return kind, t
+
+    def expr(self):
+        """conditional expression, c ? a : b"""
+        c = self.binary(1)
+        if self.peek()[1] != "?":
+            return c
+        self.take("?")
+        a = self.expr()
+        self.take(":")
+        return ("cond", c, a, self.expr())
+
+    def binary(self, prec):
+        """precedence climbing over _BINARY, every Verilog binary operator is left associative"""
+        a = self.unary()
+        while True:
+            kind, t = self.peek()
+            p = _BINARY.get(t) if kind == "op" else None
+            if p is None or p < prec:
+                return a
+            self.take()
+            a = ("bin", t, a, self.binary(p + 1))
+
+    def unary(self):
+        kind, t = self.take()
+        if kind == "op" and t in _UNARY:
+            return ("un", t, self.unary())
+        if kind == "op" and t == "(":
+            a = self.expr()
+            self.take(")")
+            return a
+        if kind == "num":
+            return ("num", _literal(t))
+        if kind == "id":
+            return ("id", t)
+        if kind == "sys":
+            if t not in _FUNCS:
+                raise VerilogExprError(f"unsupported function {t} in {self.text}")
+            self.take("(")
+            args = [self.expr()]
+            while self.peek()[1] == ",":
+                self.take(",")
+                args.append(self.expr())
+            self.take(")")
+            return ("call", t, args)
+        raise VerilogExprError(f"unexpected '{t}' in {self.text}")
+
+
+@lru_cache(maxsize=1024)
+def parse_expr(text):
+    """returns the tree of a Verilog constant expression, raises VerilogExprError"""
+    p = _Parser(text)
+    tree = p.expr()
+    if p.pos != len(p.tokens):
+        raise VerilogExprError(f"unexpected '{p.peek()[1]}' in {text}")
+    return tree
+
+
+def _eval(tree, params):
+    kind = tree[0]
+    if kind == "num":
+        return tree[1]
+    if kind == "id":
+        try:
+            return params[tree[1]]
+        except KeyError:
+            raise VerilogExprError(f"unknown parameter {tree[1]}") from None
+    if kind == "bin":
+        a = _eval(tree[2], params)
+        b = _eval(tree[3], params)
+        try:
+            return _OPS[tree[1]](a, b)
+        except (ZeroDivisionError, ValueError) as e:
+            raise VerilogExprError(f"{e} evaluating {tree[1]}") from None
+    if kind == "un":
+        a = _eval(tree[2], params)
+        return {"+": a, "-": -a, "!": int(not a), "~": ~a}[tree[1]]
+    if kind == "cond":
+        return _eval(tree[2] if _eval(tree[1], params) else tree[3], params)
+    return _FUNCS[tree[1]](*(_eval(a, params) for a in tree[2]))
+
+
+def _value(value, params):
+    """int of a parameter value, an int or a Verilog expression string"""
+    if isinstance(value, int):
+        return value
+    return _eval(parse_expr(str(value).lstrip("= ")), params)
+
+
+def eval_expr(text, params=None):
+    """
+    returns the int value of a Verilog constant expression
+    params - dict of parameter name -> value, values are ints or expressions of the parameters before them
+    """
+    return _value(text, eval_params(tuple((params or {}).items())))
+
+
+@lru_cache(maxsize=256)
+def _eval_params(decls, overrides):
+    values = {}
+    over = dict(overrides)
+    for name, value in decls:
+        try:
+            values[name] = _value(over.pop(name, value), values)
+        except VerilogExprError as e:
+            raise VerilogExprError(f"parameter {name}: {e}") from None
+    for name, value in over.items():
+        values[name] = _value(value, values)
+    return values
+
+
+def eval_params(decls, overrides=()):
+    """
+    returns a dict of parameter name -> int, evaluated in declaration order so a value may use the ones before it
+    decls - tuple of (name, value) pairs, values are ints or Verilog expressions, ie the module's parameters
+    overrides - tuple of (name, value) pairs replacing the declared values, ie one point of a sweep
+    the result is memoized per decls and overrides
+    """
+    return dict(_eval_params(tuple(decls), tuple(overrides)))
+
+
+def _range(size):
+    """msb and lsb trees of a range such as [DATA_WIDTH-1:0]"""
+    inner = size.strip()
+    if inner.startswith("[") and inner.endswith("]"):
+        inner = inner[1:-1]
+    p = _Parser(inner)
+    msb = p.expr()
+    p.take(":")
+    lsb = p.expr()
+    if p.pos != len(p.tokens):
+        raise VerilogExprError(f"unexpected '{p.peek()[1]}' in {size}")
+    return msb, lsb
+
+
+def port_width(size, params=None):
+    """
+    number of bits of a port range such as [DATA_WIDTH/8-1:0], 1 for ''
+    params - dict of parameter name -> int, ie from eval_params()
+    """
+    if not size.strip():
+        return 1
+    width = _eval(width_tree(size), params or {})
+    if width < 1:
+        raise VerilogExprError(f"{size} is {width} bits wide")
+    return width
+
+
+def _offset(tree, k):
+    """tree + k, folding constants and the -1 of a [N-1:0] range"""
+    if k == 0:
+        return tree
+    if tree[0] == "num":
+        return ("num", tree[1] + k)
+    if tree[0] == "bin" and tree[1] in ("+", "-") and tree[3][0] == "num":
+        c = tree[3][1] if tree[1] == "+" else -tree[3][1]
+        return _offset(tree[2], c + k)
+    return ("bin", "+", tree, ("num", k)) if k > 0 else ("bin", "-", tree, ("num", -k))
+
+
+def width_tree(size):
+    """
+    tree of the width of a port range, msb - lsb + 1 for [N-1:0] and lsb - msb + 1 for [0:N-1],
+    when both ends are expressions the direction is only known once the parameters are
+    """
+    msb, lsb = _range(size)
+    if msb[0] == "num" and lsb[0] == "num":
+        return ("num", abs(msb[1] - lsb[1]) + 1)
+    if lsb[0] == "num":
+        return _offset(msb, 1 - lsb[1])
+    if msb[0] == "num":
+        return _offset(lsb, 1 - msb[1])
+    return _offset(("call", "abs", [("bin", "-", msb, lsb)]), 1)
+
+
+# Python operator for each Verilog one and its Python precedence
+_PY_BINARY = {
+    "|": ("|", 7),
+    "^": ("^", 8),
+    "&": ("&", 9),
+    "<<": ("<<", 10),
+    ">>": (">>", 10),
+    "<<<": ("<<", 10),
+    ">>>": (">>", 10),
+    "+": ("+", 11),
+    "-": ("-", 11),
+    "*": ("*", 12),
+    "**": ("**", 14),
+}
+_PY_COMPARE = {"===": "==", "!==": "!="}
+_PY_ATOM = 16
+
+
+def _wrap(src, prec, need):
+    """src in parentheses when its precedence is below need"""
+    return src if prec >= need else f"({src})"
+
+
+def _py_div(op, a, b, positive):
+    """
+    (python source, precedence) of a / b or a % b, a and b are (python source, precedence)
+    positive - b is a positive number, the usual case of a width divided by a constant
+    Verilog division truncates toward zero where // floors and the remainder follows the dividend,
+    both stay in integers so they are exact past 2**53, see _div() and _mod()
+    """
+    (a, pa), (b, pb) = a, b
+    if positive:
+        n = _wrap(a, pa, 13)
+        div, pdiv = f"({n} // {b} if {a} >= 0 else -(-{n} // {b}))", _PY_ATOM
+    else:
+        div, pdiv = f"abs({a}) // abs({b}) * (1 if ({a} < 0) == ({b} < 0) else -1)", 12
+    if op == "/":
+        return div, pdiv
+    return f"{_wrap(a, pa, 11)} - {_wrap(b, pb, 12)} * {_wrap(div, pdiv, 13)}", 11
+
+
+def _py(tree):  # noqa: PLR0911
+    """(python source, precedence) of a tree"""
+    kind = tree[0]
+    if kind == "num":
+        return str(tree[1]), _PY_ATOM if tree[1] >= 0 else 13
+    if kind == "id":
+        return tree[1], _PY_ATOM
+    if kind == "call":
+        a = _py(tree[2][0])[0]
+        if tree[1] == "abs":
+            return f"abs({a})", _PY_ATOM
+        return f"max({a} - 1, 0).bit_length()", _PY_ATOM
+    if kind == "un":
+        a, p = _py(tree[2])
+        if tree[1] == "!":
+            return f"int(not {a})", _PY_ATOM
+        return tree[1] + (a if p >= 13 else f"({a})"), 13  # noqa: PLR2004
+    if kind == "cond":
+        c, a, b = (_py(x)[0] for x in tree[1:])
+        return f"({a} if {c} else {b})", _PY_ATOM
+    op = tree[1]
+    a, pa = _py(tree[2])
+    b, pb = _py(tree[3])
+    if op in ("~^", "^~"):
+        return f"~({a} ^ {b})", 13
+    if op in ("&&", "||"):
+        return f"int(bool({a}) {'and' if op == '&&' else 'or'} bool({b}))", _PY_ATOM
+    if op in ("/", "%"):
+        return _py_div(op, (a, pa), (b, pb), tree[3][0] == "num" and tree[3][1] > 0)
+    if op not in _PY_BINARY:
+        # comparisons give 0 or 1 in Verilog
+        return f"int({a} {_PY_COMPARE.get(op, op)} {b})", _PY_ATOM
+    py_op, p = _PY_BINARY[op]
+    # Verilog is left associative, so only the right operand is wrapped at equal precedence, ** the other way round
+    a = a if pa > p or (pa == p and op != "**") else f"({a})"
+    b = b if pb > p else f"({b})"
+    return f"{a} {py_op} {b}", p
+
+
+def to_python(text):
+    """Python source of a Verilog constant expression, parameter names are kept as they are"""
+    return _py(parse_expr(text))[0]
+
+
+def width_to_python(size):
+    """Python source of the width of a port range, ie [DATA_WIDTH-1:0] becomes DATA_WIDTH"""
+    return _py(width_tree(size))[0]
@@ -35,6 +35,7 @@ class verilog_iface:
         port_lst=None,
         pause=None,
         example=None,
+        is_master=None,
     ):
         """
         iface_type - interface type ()
@@ -42,6 +43,8 @@ class verilog_iface:
         associated_clock - string name of associated clock
         associated_reset - string name of associated reset
         example - boolean - show example code when True
+        is_master - boolean - True if the module drives the interface as master/source,
+                    when None the name decides, s_ is a slave and anything else a master
         """
         self.iface_type = iface_type
         self.name = name
@@ -55,14 +58,13 @@ class verilog_iface:
         self.pause = pause
 
         # check if master or slave interface
-        # fixme: for now just check if name starts with s_ or m_
-        self.is_master = True
-        if self.name[0:2].lower() == "s_":
-            self.is_master = False
+        if is_master is None:
+            is_master = self.name[0:2].lower() != "s_"
+        self.is_master = is_master
 
         self.example = example
 
-    def create_iface_endpoint_template_myhdl(self):
+    def create_iface_endpoint_template_myhdl(self):  # noqa: PLR0912
         """
         creates a template for MyHDL for TBD
         """
@@ -108,6 +110,37 @@ class verilog_iface:
         pause = {pause_axis},
         xname='{self.name}'
     )
+    """
+        elif "axi_lite" in self.iface_type:
+            if self.is_master:
+                return f"""
+    sink_{self.name} = AXILiteSlave(data_width=params_iface['AXI_DATA_WIDTH'], addr_width=params_iface['AXI_ADDR_WIDTH'], fill=0)
+    sink_{self.name}_logic = sink_{self.name}.create_logic(
+        clk = tf.{self.associated_clock},
+        rst = {reset_str},
+        axil = tf.{self.name},
+        pause_waddr={pause_axi_waddr},
+        pause_wdata={pause_axi_wdata},
+        pause_bresp={pause_axi_bresp},
+        pause_araddr={pause_axi_araddr},
+        pause_rdata={pause_axi_rdata},
+        xname='{self.name}'
+    )
+    """
+            else:
+                return f"""
+    source_{self.name} = AXILiteMaster(data_width=params_iface['AXI_DATA_WIDTH'], addr_width=params_iface['AXI_ADDR_WIDTH'], check_resp=True)
+    source_{self.name}_logic = source_{self.name}.create_logic(
+        clk = tf.{self.associated_clock},
+        rst = {reset_str},
+        axil = tf.{self.name},
+        pause_waddr={pause_axi_waddr},
+        pause_wdata={pause_axi_wdata},
+        pause_bresp={pause_axi_bresp},
+        pause_araddr={pause_axi_araddr},
+        pause_rdata={pause_axi_rdata},
+        xname='{self.name}'
+    )
     """
         elif "axi" in self.iface_type:
             if self.is_master:
@@ -146,40 +179,28 @@ class verilog_iface:
     def create_iface_pause_template_myhdl(self):
         """
         creates pause logic for any interfaces
+        pause signals are added to the PauseEngine of the associated clock, see write_tf_uut()
         """
         if self.pause is False:
             return ""
+        engine = f"pause_{self.associated_clock}"
         if "axis" in self.iface_type:
             return f"""
-    {self.name}_pause = Signal(bool(0))
-    @instance
-    def {self.name}_randPause():
-        while 1:
-            {self.name}_pause.next = random.randint(1, PAUSE_FACTOR) == 1
-            yield tf.{self.associated_clock}.posedge
+    {self.name}_pause = {engine}.add("{self.name}_pause", RandomPause(1 / PAUSE_FACTOR))
     """
         elif "axi" in self.iface_type:
             return f"""
-    {self.name}_pause_araddr = Signal(bool(0))
-    {self.name}_pause_rdata = Signal(bool(0))
-    {self.name}_pause_awaddr = Signal(bool(0))
-    {self.name}_pause_wdata = Signal(bool(0))
-    {self.name}_pause_bresp = Signal(bool(0))
-    @instance
-    def {self.name}_randPause():
-        while 1:
-            {self.name}_pause_araddr.next = random.randint(1, PAUSE_FACTOR) == 1
-            {self.name}_pause_rdata.next = random.randint(1, PAUSE_FACTOR) == 1
-            {self.name}_pause_awaddr.next = random.randint(1, PAUSE_FACTOR) == 1
-            {self.name}_pause_wdata.next = random.randint(1, PAUSE_FACTOR) == 1
-            {self.name}_pause_bresp.next = random.randint(1, PAUSE_FACTOR) == 1
-            yield tf.{self.associated_clock}.posedge
+    {self.name}_pause_araddr = {engine}.add("{self.name}_pause_araddr", RandomPause(1 / PAUSE_FACTOR))
+    {self.name}_pause_rdata = {engine}.add("{self.name}_pause_rdata", RandomPause(1 / PAUSE_FACTOR))
+    {self.name}_pause_awaddr = {engine}.add("{self.name}_pause_awaddr", RandomPause(1 / PAUSE_FACTOR))
+    {self.name}_pause_wdata = {engine}.add("{self.name}_pause_wdata", RandomPause(1 / PAUSE_FACTOR))
+    {self.name}_pause_bresp = {engine}.add("{self.name}_pause_bresp", RandomPause(1 / PAUSE_FACTOR))
     """
         else:
             print(f"Warning: interface {self.iface_type} has no endpoint template")
             return ""
 
-    def create_iface_example_template_myhdl(self):
+    def create_iface_example_template_myhdl(self):  # noqa: PLR0911
         """
         creates example template for any interfaces
         """
@@ -197,6 +218,23 @@ class verilog_iface:
         snd_frm = send_axis(source=source_{self.name}, data=[i for i in range(10)], list_is_beats=True, tid=0, tdest=0, tuser=0, debug=True, endian="little")
         # can also pass array of elements into here and set list_is_beats = False
         #snd_frm = send_axis(source=source_{self.name}, data=[i for i in range(10)], list_is_beats=False, tid=0, tdest=0, tuser=0, debug=True, endian="little")
+        """
+            elif "axi_lite" in self.iface_type:
+                if self.is_master:
+                    return f"""
+        # example sink_{self.name} register map
+        sink_{self.name}.load(addr=0, data=[0x12345678, 0x0, 0xdeadbeef])
+        # writes are applied to sink_{self.name}.regs and logged
+        wr_a_actual, wr_d_actual = sink_{self.name}.get_write_log()
+        """
+                else:
+                    return f"""
+        # example source_{self.name}
+        source_{self.name}.issue_write(addr=0, data=0x1)
+        source_{self.name}.issue_read(addr=0)
+        while not source_{self.name}.empty():
+            yield tf.{self.associated_clock}.posedge
+        rd_a, rd_d, rd_resp = source_{self.name}.get_read_log()
         """
             elif "axi" in self.iface_type:
                 if self.is_master:
@@ -25,6 +25,7 @@
 # =======================================================================
 
 import sys
+from functools import lru_cache
 
 from pyparsing import (
     Group,
@@ -43,8 +44,13 @@ from pyparsing import (
     oneOf,
 )
 
-from ..tb_endpoints import get_intfc_inits
+from .. import tb_endpoints
+from ..tb_endpoints import get_intfc, get_intfc_inits
+from ._module_cache import get_module_cache
+from ._port_classifier import get_port_classifier
+from ._verilog_expr import VerilogExprError, eval_expr, eval_params, port_width, width_to_python
 from ._verilog_port import verilog_port
+from ._verilog_scanner import VerilogScanError, scan_module
 
 
 class verilog_module:
@@ -60,11 +66,10 @@ class verilog_module:
             print(f"Parsing {ifile}")
         self.debug = debug
 
-        with open(ifile, "r") as f:
-            pars = self.header_parser(debug=debug)
-            self.prs = pars.parseFile(f)
-
-        self.name = self.prs["module_name"]
+        # prs is only set when the pyparsing grammar reads the file
+        self.prs = None
+        ir = get_module_cache().load(ifile, self.parse_ir)
+        self.name = ir["name"]
 
         # create a list of ports/params
         self.ports_lst = []
@@ -73,7 +78,7 @@ class verilog_module:
         # for x in param_lst:
         #     self.ports_lst.append(verilog_port(pstyle=x[0], pdir=x[1], ptype=x[2], psign=x[3], psize=x[4], pname=x[5], pvalue=x[6], debug=debug))
 
-        p_lst = self.mk_ports_lst(self.prs, debug=self.debug)
+        p_lst = ir["ports"]
         for x in p_lst:
             self.ports_lst.append(
                 verilog_port(
@@ -87,12 +92,33 @@ class verilog_module:
                     debug=False,
                 )
             )
+        # interface bundles, bundle name -> PortBundle
+        self.bundles = get_port_classifier().group(self.ports_lst)
+
+    def parse_ir(self, text, scanner=True):
+        """
+        parses the Verilog source text, returns the module name and mk_ports_lst() list as
+        {"name": ..., "ports": ...}, the form kept by the module cache
+        scanner - read the header with scan_module(), the pyparsing grammar is used when
+                  False or when the scanner does not understand the header
+        """
+        if scanner:
+            try:
+                return scan_module(text)
+            except VerilogScanError as e:
+                if self.debug:
+                    print(f"header scanner failed ({e}), parsing with pyparsing")
+        pars = self.header_parser(debug=self.debug)
+        self.prs = pars.parseString(text)
+        return {"name": str(self.prs["module_name"]), "ports": self.mk_ports_lst(self.prs, debug=self.debug)}
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def header_parser(debug=False):
         """
         A simple parser for Verilog module interfaces. Collects class
         name, parameter names, and port names.
+        The grammar is built once and reused.
         """
 
         to_eol = SkipTo(LineEnd(), include=True)
@@ -323,47 +349,64 @@ class verilog_module:
                - python (translate verilog value string into python form Ie: 8'hff becomes 0xff)
         """
         ret_lst = []
+        values = {}
         for p in self.ports_lst:
             if p.pstyle == "parameter":
                 prmv = p.pvalue.split("=")
                 if value_format == "verilog":
                     ret_lst.append((p.pname, prmv[1]))
                 elif value_format == "python":
-                    # crude attempt to convert parameter value to integer
+                    # evaluate the value, it may use the parameters declared before it
+                    try:
+                        values[p.pname] = eval_expr(p.pvalue[1:], values)
+                    except VerilogExprError as e:
+                        print(
+                            f"Error attempting to convert value for {p.pname} from verilog: {prmv[1]} to python integer ({e}), will default parameter to 0"
+                        )
+                        values[p.pname] = 0
                     if "'h" in prmv[1].lower():
-                        # parameter is hex value
-                        splt = prmv[1].lower().split("'")
-                        try:
-                            new_v = f"0x{int(splt[1][1:], 16):x}"
-                        except:  # noqa: E722
-                            print(
-                                f"Error attempting to convert value for {p.pname} from verilog: {prmv[1]} to python integer, will default parameter to 0"
-                            )
-                            new_v = "0x0"
-                    elif "'d" in prmv[1].lower():
-                        # parameter is decimal value
-                        splt = prmv[1].lower().split("'")
-                        try:
-                            new_v = f"{int(splt[1][1:])}"
-                        except:  # noqa: E722
-                            print(
-                                f"Error attempting to convert value for {p.pname} from verilog: {prmv[1]} to python integer, will default parameter to 0"
-                            )
-                            new_v = "0"
+                        new_v = hex(values[p.pname])
                     else:
-                        # assume integer
-                        try:
-                            new_v = prmv[1].lstrip()  # remove leading spaces
-                            new_v = f"{int(new_v)}"
-                        except:  # noqa: E722
-                            print(
-                                f"Error attempting to convert value for {p.pname} from verilog: {prmv[1]} to python integer, will default parameter to 0"
-                            )
-                            new_v = "0"
+                        new_v = f"{values[p.pname]}"
                     ret_lst.append((p.pname, new_v))
 
         return ret_lst
 
+    def param_values(self, params=None):
+        """
+        evaluates the parameters, returns a dict of parameter name -> int
+        params - dict of parameter name -> value replacing the declared ones, ie one point of a sweep
+        results are memoized per parameter set, raises VerilogExprError when a value cannot be evaluated
+        """
+        decls = tuple((p.pname, p.pvalue[1:]) for p in self.ports_lst if p.pstyle == "parameter")
+        return eval_params(decls, tuple((params or {}).items()))
+
+    def port_widths(self, params=None):
+        """
+        returns a dict of port name -> number of bits
+        params - dict of parameter name -> value replacing the declared ones
+        """
+        values = self.param_values(params)
+        return {p.pname: port_width(p.psize, values) for p in self.ports_lst if p.pstyle == "port"}
+
+    def iface_params(self, iface_name):
+        """
+        interface parameters given by the port widths of bundle iface_name, ie DATA_WIDTH of an axis
+        bundle whose tdata port is [W-1:0]
+        returns a dict of interface parameter name -> Python expression of the module parameters
+        """
+        bundle = self.bundles[iface_name]
+        ret = {}
+        for s in bundle.spec.signals:
+            p = bundle.ports.get(s.name)
+            if p is None or not p.psize or not isinstance(s.width, str) or not s.width.isidentifier():
+                continue
+            try:
+                ret.setdefault(s.width, width_to_python(p.psize))
+            except VerilogExprError:
+                pass
+        return ret
+
     def print_inst_ports(self, pstyle):
         """
         creates the ports section of an instantiation template
@@ -487,19 +530,17 @@ class verilog_module:
         get list of interface names and list of interface types
         """
 
-        # figure out interfaces
-        iface_name_lst = []
-        iface_type_lst = []
-        for p in self.ports_lst:
-            if p.pstyle == "port":
-                if p.is_iface:
-                    # nm = p.iface_name + p.iface
-                    nm = p.iface_name
-                    if nm not in iface_name_lst:
-                        iface_name_lst.append(nm)
-                        iface_type_lst.append(p.iface)
+        iface_name_lst = list(self.bundles)
+        iface_type_lst = [b.iface for b in self.bundles.values()]
         return iface_name_lst, iface_type_lst
 
+    def iface_is_master(self, iface_name):
+        """
+        True if the module is master/source of interface iface_name, False if it is slave/sink,
+        None if the port directions do not tell
+        """
+        return self.bundles[iface_name].is_master()
+
     def print_myhdl_imports(self):
         """
         prints out endpoint imports for all interface types found
@@ -513,8 +554,13 @@ class verilog_module:
         for p in self.ports_lst:
             if p.pstyle == "port":
                 if p.is_iface:
-                    iface_type_lst.append("from veri_quickbench.tb_endpoints import " + p.iface)
-        iface_type_lst = list(set(iface_type_lst))
+                    if getattr(tb_endpoints, p.iface, None) is get_intfc(p.iface):
+                        iface_type_lst.append("from veri_quickbench.tb_endpoints import " + p.iface)
+                    else:
+                        # registered by a plugin, looked up when the testbench runs
+                        iface_type_lst.append("from veri_quickbench.tb_endpoints import get_intfc")
+                        iface_type_lst.append(f'{p.iface} = get_intfc("{p.iface}")')
+        iface_type_lst = list(dict.fromkeys(iface_type_lst))
         ret_str = "\n".join(iface_type_lst)
         return ret_str
 
@@ -720,34 +766,14 @@ class verilog_module:
     def portsize_to_signal(size):
         """
         takes a verilog port size ie '[5:0]' and turns it into a myhdl equivalent
-        intbv(0)[6:]
+        intbv(0)[6:], parameters are kept so '[DATA_WIDTH-1:0]' becomes intbv(0)[DATA_WIDTH:]
         """
         if size == "":
             return "bool(0)"
-        else:
-            indices = size.strip(" []").split(":")
-            if len(indices) == 2:  # noqa: PLR2004
-                msb = indices[0]
-                lsb = indices[1]
-
-                if msb == "0":
-                    msb = ""
-                if lsb == "0":
-                    lsb = ""
-
-                if msb.isdigit():
-                    msb = "%d" % (int(msb) + 1)
-                if lsb.isdigit():
-                    lsb = "%d" % (int(lsb) + 1)
-
-                if msb[-2:] == "-1":
-                    msb = msb[:-2]
-                if lsb[-2:] == "-1":
-                    lsb = lsb[:-2]
-
-                return "intbv(0)[%s:%s]" % (msb, lsb)
-            else:
-                return "intbv(0)[??]"
+        try:
+            return "intbv(0)[%s:]" % width_to_python(size)
+        except VerilogExprError:
+            return "intbv(0)[??]"
 
 
 if __name__ == "__main__":
@@ -22,6 +22,7 @@
 
 
 from ..tb_endpoints import get_intfc_lst
+from ._port_classifier import get_port_classifier
 
 
 class verilog_port:
@@ -76,31 +77,16 @@ class verilog_port:
 
         # search for signals that may be part of an interface
         self.is_iface = False
-        if_lst = get_intfc_lst(debug=debug)
-        for intfc_nm in if_lst:
-            if intfc_nm in self.pname:
-                s = self.pname.split(intfc_nm)
-                if len(s) == 0:
-                    if debug:
-                        print(f"{self.pname} not in {if_lst}")
-                    self.is_iface = False
-                    self.iface_name = ""
-                    self.iface = ""
-                elif len(s) == 1:
-                    raise Exception(f"Name {self.pname} either has no unique part before or after interface type")
-                elif len(s) == 2:  # noqa: PLR2004
-                    self.is_iface = True
-                    self.iface = intfc_nm.strip("_")  # remove underscore from interface
-
-                    if "_" in s[1][1:]:
-                        iface_full = s[1].split("_")
-                        self.iface_name = s[0] + intfc_nm + "_".join(iface_full[:-1])
-                        self.iface_sig = iface_full[-1]
-                    else:
-                        self.iface_name = s[0] + self.iface
-                        self.iface_sig = s[1]
-                else:
-                    raise Exception(f"signal split has too many parts {s}")
+        self.iface = ""
+        self.iface_name = ""
+        self.iface_sig = ""
+        if debug:
+            print(get_intfc_lst())
+        if self.pstyle == "port":
+            found = get_port_classifier().classify(self.pname)
+            if found is not None:
+                self.is_iface = True
+                self.iface_name, self.iface, self.iface_sig = found
         new_value = pvalue
         if ";" in pvalue:
             new_value, _ = pvalue.split(";")
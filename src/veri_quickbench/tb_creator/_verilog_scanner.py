@@ -0,0 +1,316 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Header only Verilog scanner
+
+Reads the parameters and ports of the first module in a file with a single
+regex tokenizer, tokens are produced lazily and never revisited. For a
+Verilog-2001 header scanning stops at the ";" that ends the header, so the
+module body is never tokenized. A Verilog-95 header only lists port names, the
+declarations are then picked out of the body in one pass, function and task
+bodies are skipped.
+
+scan_module() returns the same form as verilog_module.parse_ir(), one
+[pstyle, pdir, ptype, psign, psize, pname, pvalue] list per parameter and port,
+scan_file() reads every module of a file and also walks the bodies for the
+modules they instantiate. Both raise VerilogScanError on anything they do not
+understand, ie SystemVerilog interface ports or preprocessor directives within
+the header, so the caller can fall back to the pyparsing grammar.
+"""
+
+import re
+
+_TOKEN = re.compile(
+    r"""
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+    | (?P<num>\d*'[sS]?[bBoOdDhH][0-9a-fA-F_xXzZ?]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    | (?P<id>[A-Za-z_][\w$]*|\\\S+)
+    | (?P<sys>\$[A-Za-z_][\w$]*)
+    | (?P<directive>`[A-Za-z_]\w*)
+    | (?P<str>"(?:\\.|[^"\\\n])*")
+    | (?P<op>.)
+    """,
+    re.S | re.X,
+)
+
+_DIRS = frozenset(("input", "output", "inout"))
+_NET_TYPES = frozenset(("wire", "reg", "tri", "integer"))
+_PARAM_KEYWORDS = frozenset(("parameter", "localparam"))
+_PARAM_TYPES = frozenset(("integer", "real", "realtime", "time"))
+_SKIP_BLOCKS = {"function": "endfunction", "task": "endtask"}
+# may be followed by ": label", ie begin : g_lane
+_LABELLED = frozenset(("begin", "end", "fork", "join", "join_any", "join_none"))
+_OPEN = {"(": ")", "[": "]", "{": "}"}
+_CLOSE = frozenset(_OPEN.values())
+_KEYWORDS = _DIRS | _NET_TYPES | _PARAM_KEYWORDS | _PARAM_TYPES | {"signed", "module", "endmodule", "type"}
+# statements starting with one of these are not module instances
+_RESERVED = _KEYWORDS | frozenset(
+    """
+    always always_comb always_ff always_latch and assign assert automatic begin bit buf bufif0 bufif1 byte
+    case casex casez cover defparam default disable else end endcase endfunction endgenerate endtask enum
+    event for force forever fork function genvar generate if initial int join logic longint macromodule nand
+    negedge nor not notif0 notif1 or posedge real release repeat return shortint signed string struct
+    supply0 supply1 task tri0 tri1 typedef unsigned var void wait wand while wor xnor xor
+    """.split()
+)
+
+
+class VerilogScanError(Exception):
+    pass
+
+
+class _Tokens(object):
+    def __init__(self, text):
+        self._it = _TOKEN.finditer(text)
+        self._peek = None
+
+    def peek(self):
+        """next token match without consuming it, None at the end of the text"""
+        if self._peek is None:
+            for m in self._it:
+                if m.lastgroup != "skip":
+                    self._peek = m
+                    break
+        return self._peek
+
+    def peek_text(self):
+        m = self.peek()
+        return None if m is None else m.group()
+
+    def next(self):
+        m = self.peek()
+        if m is None:
+            raise VerilogScanError("unexpected end of file")
+        self._peek = None
+        return m
+
+    def accept(self, text):
+        """consumes the next token when it is text"""
+        if self.peek_text() == text:
+            self._peek = None
+            return True
+        return False
+
+    def expect(self, text):
+        m = self.next()
+        if m.group() != text:
+            raise VerilogScanError(f"expected '{text}' but found '{m.group()}' at offset {m.start()}")
+
+    def identifier(self):
+        m = self.next()
+        if m.lastgroup != "id" or m.group() in _KEYWORDS:
+            raise VerilogScanError(f"expected an identifier but found '{m.group()}' at offset {m.start()}")
+        return m.group()
+
+
+def _join(matches):
+    """text of a run of tokens, tokens that were apart in the source are separated by a space"""
+    out = []
+    prev = None
+    for m in matches:
+        if prev is not None and m.start() != prev.end():
+            out.append(" ")
+        out.append(m.group())
+        prev = m
+    return "".join(out)
+
+
+def _until(toks, stops):
+    """tokens up to a stop token outside any brackets, the stop token is left in toks"""
+    matches = []
+    depth = 0
+    while True:
+        t = toks.peek_text()
+        if t is None:
+            raise VerilogScanError("unexpected end of file")
+        if depth == 0 and t in stops:
+            return matches
+        if t in _OPEN:
+            depth += 1
+        elif t in _CLOSE:
+            depth -= 1
+            if depth < 0:
+                raise VerilogScanError(f"unbalanced '{t}'")
+        matches.append(toks.next())
+
+
+def _range(toks):
+    """[msb:lsb] as written, '' when there is none"""
+    if not toks.accept("["):
+        return ""
+    inner = _until(toks, ("]",))
+    toks.expect("]")
+    return "[" + _join(inner) + "]"
+
+
+def _value(toks, end):
+    """'= value' of a declaration, '' when there is none"""
+    if not toks.accept("="):
+        return ""
+    return "= " + _join(_until(toks, (",", end)))
+
+
+def _declarations(toks, pstyle, end, out):
+    """
+    a list of parameter or port declarations up to end, a direction or parameter keyword
+    sets the direction, type, sign and range of the names after it
+    """
+    pdir = None
+    ptype = psign = psize = ""
+    while True:
+        t = toks.peek_text()
+        if pstyle == "port" and t in _DIRS:
+            pdir = toks.next().group().lower()
+            ptype = toks.next().group().lower() if toks.peek_text() in _NET_TYPES else ""
+            psign = toks.next().group() if toks.peek_text() == "signed" else ""
+            psize = _range(toks)
+        elif pstyle == "parameter" and t in _PARAM_KEYWORDS:
+            toks.next()
+            pdir = ""
+            if toks.peek_text() in _PARAM_TYPES:
+                toks.next()
+            if toks.peek_text() == "signed":
+                toks.next()
+            psize = _range(toks)
+        elif pdir is None:
+            raise VerilogScanError(f"expected a {pstyle} declaration but found '{t}'")
+        name = toks.identifier()
+        out.append([pstyle, pdir, ptype, psign, psize, name, _value(toks, end)])
+        if not toks.accept(","):
+            toks.expect(end)
+            return
+
+
+def _instance(toks):
+    """
+    after a module name at the start of a statement, returns True and consumes the rest of the
+    instance head when the statement is an instantiation, ie foo #(...) u_foo [3:0] (
+    """
+    if toks.accept("#"):
+        if not toks.accept("("):
+            return False
+        _until(toks, (")",))
+        toks.expect(")")
+    m = toks.peek()
+    if m is None or m.lastgroup != "id" or m.group() in _RESERVED:
+        return False
+    toks.next()
+    _range(toks)
+    return toks.peek_text() == "("
+
+
+def _body(toks, out, instances=None):
+    """
+    walks a module body up to endmodule
+    out - Verilog-95 parameter and port declarations are added, None when the header declared them
+    instances - names of instantiated modules are added when not None
+    """
+    while True:
+        m = toks.peek()
+        if m is None:
+            raise VerilogScanError("endmodule not found")
+        t = m.group()
+        if t == "endmodule":
+            toks.next()
+            return
+        if out is not None and t in _DIRS:
+            _declarations(toks, "port", ";", out)
+        elif out is not None and t == "parameter":
+            _declarations(toks, "parameter", ";", out)
+        elif t in _SKIP_BLOCKS:
+            end = _SKIP_BLOCKS[t]
+            while toks.next().group() != end:
+                pass
+        elif t in _LABELLED:
+            toks.next()
+            # the label is not a module name
+            if toks.accept(":"):
+                toks.next()
+        else:
+            toks.next()
+            if instances is not None and m.lastgroup == "id" and t not in _RESERVED and _instance(toks):
+                if t not in instances:
+                    instances.append(t)
+
+
+def _find_module(toks):
+    """consumes tokens up to and including the next module keyword, False at the end of the text"""
+    while True:
+        m = toks.peek()
+        if m is None:
+            return False
+        toks.next()
+        if m.lastgroup == "id" and m.group() in ("module", "macromodule"):
+            return True
+
+
+def _module(toks, instances=None):
+    """the module after the module keyword, the body is only walked for Verilog-95 or instances"""
+    name = toks.identifier()
+    ports = []
+    if toks.accept("#"):
+        toks.expect("(")
+        if not toks.accept(")"):
+            _declarations(toks, "parameter", ")", ports)
+    style95 = False
+    if toks.accept("(") and not toks.accept(")"):
+        m = toks.peek()
+        if m is not None and m.lastgroup == "id" and m.group() not in _DIRS:
+            # Verilog-95, only names here, declared in the body
+            style95 = True
+            _until(toks, (")",))
+            toks.expect(")")
+        else:
+            _declarations(toks, "port", ")", ports)
+    m = toks.next()
+    if m.group() != ";":
+        raise VerilogScanError(f"expected ';' after the header of {name} but found '{m.group()}'")
+    ir = {"name": name, "ports": ports}
+    if style95 or instances is not None:
+        _body(toks, ports if style95 else None, instances)
+    if instances is not None:
+        ir["instances"] = instances
+    return ir
+
+
+def scan_module(text):
+    """
+    returns {"name": module name, "ports": [[pstyle, pdir, ptype, psign, psize, pname, pvalue], ...]}
+    for the first module in text, raises VerilogScanError when the header is not understood
+    """
+    toks = _Tokens(text)
+    if not _find_module(toks):
+        raise VerilogScanError("no module found")
+    return _module(toks)
+
+
+def scan_file(text):
+    """
+    returns a list with an entry for every module in text, as scan_module() with "instances",
+    the names of the modules it instantiates in the order they first appear
+    """
+    toks = _Tokens(text)
+    modules = []
+    while _find_module(toks):
+        modules.append(_module(toks, instances=[]))
+    return modules
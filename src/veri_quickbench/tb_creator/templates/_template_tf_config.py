@@ -21,11 +21,12 @@
 # SOFTWARE.
 
 
-def write_tf_config(  # noqa: PLR0913
+def write_tf_config(  # noqa: PLR0912, PLR0913
     f,
     uut_name=None,
     primary_src_dir=None,
     primary_src_files=None,
+    primary_lib_dirs=None,
     additional_src_dir=None,
     additional_src_files=None,
     params_iface=None,
@@ -37,6 +38,8 @@ def write_tf_config(  # noqa: PLR0913
                     - Ie. typically something like: Path(__file__).parents[2]/'src'
     primary_src_files - list of files (including uut) from primary source folder
                       - Ie. ['uut.v', 'submodule1.v', 'submodule2.v']
+    primary_lib_dirs - list of folders under the primary source folder passed to iverilog as -y library dirs
+                     - Ie. ['.', 'common']
     additional_src_dir - relative path for additional source directory (from testbench root folder)
                        - used for xilinx primitives such as glbl.v typically placed into testbench directory
                        - Ie. typically something like: str(Path(__file__).parent
@@ -50,6 +53,8 @@ def write_tf_config(  # noqa: PLR0913
         primary_src_dir = "Path(__file__).parents[2]/'src'"
     if primary_src_files is None:
         primary_src_files = []
+    if primary_lib_dirs is None:
+        primary_lib_dirs = []
 
     if additional_src_dir is None:
         additional_src_dir = "Path(__file__).parent"
@@ -62,6 +67,8 @@ def write_tf_config(  # noqa: PLR0913
     src_files.append("srcs = []\n")
     for src in primary_src_files:
         src_files.append(f'srcs.append(str(SRC_DIR / "{src}"))\n')
+    for lib in primary_lib_dirs:
+        src_files.append(f'srcs.append("-y " + str(SRC_DIR / "{lib}"))\n')
     for src in additional_src_files:
         src_files.append(f'srcs.append(str({additional_src_dir} / "{src}"))\n')
     src_files.append('VERILOG_SRC_FILES = " ".join(srcs)')
@@ -48,11 +48,21 @@ def write_tf_uut(  # noqa: PLR0913
     for reset in resets:
         reset_assertions += f"      {reset.create_reset_template_myhdl()}"
 
-    # TBD: create random pauses
+    # one pause engine per clock domain drives all of its pause signals
     pause_logic = ""
+    pause_clocks = []
     for iface in iface_lst:
-        if iface.pause is True:
-            pause_logic += f"      {iface.create_iface_pause_template_myhdl()}"
+        if iface.pause is True and iface.associated_clock not in pause_clocks:
+            pause_clocks.append(iface.associated_clock)
+    for clk in pause_clocks:
+        pause_logic += f"""
+    pause_{clk} = PauseEngine(seed=PAUSE_SEED)"""
+        for iface in iface_lst:
+            if iface.pause is True and iface.associated_clock == clk:
+                pause_logic += f"      {iface.create_iface_pause_template_myhdl()}"
+        pause_logic += f"""
+    pause_{clk}_logic = pause_{clk}.create_logic(tf.{clk})
+"""
 
     # create code for asserting reset at start of testbench
     endpoint_instances = ""
@@ -134,11 +144,16 @@ from veri_quickbench.tb_creator import (
     print_param_changes,
 )
 from veri_quickbench.tb_endpoints import (
+    AXILiteMaster,
+    AXILiteSlave,
     AXIMaster,
     AXISlave,
     AXIStreamFrame,
     AXIStreamSink,
     AXIStreamSource,
+    PauseEngine,
+    RandomPause,
+    log_to_console,
     send_axis,
     wait_axis,
 )
@@ -146,7 +161,10 @@ from veri_quickbench.tb_endpoints import (
 
 {import_str}
 
-PAUSE_FACTOR = 1000 # will pause 1/PAUSE_FACTOR
+PAUSE_FACTOR = 4 # will pause 1/PAUSE_FACTOR
+PAUSE_SEED = 0 # change for a different, repeatable, pause pattern
+LOG_LEVEL = "WARNING" # "DEBUG" logs every frame sent and received by the endpoints
+log_to_console(level=LOG_LEVEL) # log_to_file() writes to a buffered text or binary file instead
 
 @block
 def tb(
@@ -196,9 +214,6 @@ def tb(
     @instance
     def check():
 
-        global PAUSE_FACTOR # noqa: PLW0603
-        PAUSE_FACTOR = 4
-
         #######################
         # Resets
         #######################{reset_assertions}
@@ -1,3 +1,4 @@
+from ._arbiter import AXIStreamArbiter, RandomBurstArbiter, RoundRobinArbiter, WeightedArbiter
 from ._axi_ep import (
     AXIBusWidthError,
     AXIMaster,
@@ -5,19 +6,81 @@ from ._axi_ep import (
     AXISlave,
     AXITransactionError,
 )
+from ._axi_monitor import AXILatencyHistogram, AXIMonitor
+from ._axi_trace import (
+    AXI_TRACE_READ,
+    AXI_TRACE_WRITE,
+    AXITraceError,
+    AXITraceReader,
+    AXITraceRecord,
+    AXITraceRecorder,
+    AXITraceReplay,
+)
+from ._axil_ep import AXILiteMaster, AXILiteSlave
+from ._axis_check import (
+    AXIStreamBeatChecker,
+    AXIStreamByteCounter,
+    AXIStreamCRC32Checker,
+    AXIStreamHashChecker,
+)
 from ._axis_ep import (
+    AXIStreamBeats,
     AXIStreamFrame,
     AXIStreamSink,
     AXIStreamSource,
     BeatSizeError,
     ElementSizeError,
 )
-from ._intfc import axi, axi_lite, axis, get_intfc_inits, get_intfc_lst
+from ._intfc import (
+    INTFC_SPECS,
+    IntfcSig,
+    IntfcSpec,
+    axi,
+    axi_lite,
+    axis,
+    get_intfc,
+    get_intfc_inits,
+    get_intfc_lst,
+    load_intfc_plugins,
+    make_intfc,
+    register_intfc,
+    unregister_intfc,
+)
+from ._log import (
+    LOGGER_NAME,
+    BinaryLogHandler,
+    endpoint_logger,
+    log_to_console,
+    log_to_file,
+    read_binary_log,
+    set_log_level,
+)
+from ._patterns import (
+    PRBS,
+    PRBS_TAPS,
+    CountingPattern,
+    PatternChecker,
+    PRBSChecker,
+    WalkingOnesPattern,
+    pattern_frames,
+)
+from ._scoreboard import (
+    SB_DUPLICATE,
+    SB_MATCH,
+    SB_REORDER,
+    SB_UNEXPECTED,
+    AXIStreamScoreboard,
+    AXIStreamScoreboardError,
+    frame_key,
+)
 from ._sim_helpers import (
     axi4_wait_bit,
     axi4_wait_read_data,
+    beats2buffer,
     beats2bytearray,
     beats2bytes,
+    beats2ranges,
+    buffer2beats,
     bytestobeats,
     checker,
     chk_axis_packets,
@@ -27,32 +90,101 @@ from ._sim_helpers import (
     tkeep_resize,
     wait_axis,
 )
+from ._stats import AXIStreamStats, FrameLatencyTracker
+from ._traffic import (
+    BurstIdlePause,
+    DutyCyclePause,
+    PauseEngine,
+    PauseProfile,
+    RandomPause,
+    TokenBucketPause,
+)
 
 __all__ = [
+    "AXI_TRACE_READ",
+    "AXI_TRACE_WRITE",
+    "INTFC_SPECS",
+    "LOGGER_NAME",
+    "PRBS",
+    "PRBS_TAPS",
+    "SB_DUPLICATE",
+    "SB_MATCH",
+    "SB_REORDER",
+    "SB_UNEXPECTED",
     "AXIBusWidthError",
+    "AXILatencyHistogram",
+    "AXILiteMaster",
+    "AXILiteSlave",
     "AXIMaster",
     "AXIMemoryError",
+    "AXIMonitor",
     "AXISlave",
+    "AXIStreamArbiter",
+    "AXIStreamBeatChecker",
+    "AXIStreamBeats",
+    "AXIStreamByteCounter",
+    "AXIStreamCRC32Checker",
     "AXIStreamFrame",
+    "AXIStreamHashChecker",
+    "AXIStreamScoreboard",
+    "AXIStreamScoreboardError",
     "AXIStreamSink",
     "AXIStreamSource",
+    "AXIStreamStats",
+    "AXITraceError",
+    "AXITraceReader",
+    "AXITraceRecord",
+    "AXITraceRecorder",
+    "AXITraceReplay",
     "AXITransactionError",
     "BeatSizeError",
+    "BinaryLogHandler",
+    "BurstIdlePause",
+    "CountingPattern",
+    "DutyCyclePause",
     "ElementSizeError",
+    "FrameLatencyTracker",
+    "IntfcSig",
+    "IntfcSpec",
+    "PRBSChecker",
+    "PatternChecker",
+    "PauseEngine",
+    "PauseProfile",
+    "RandomBurstArbiter",
+    "RandomPause",
+    "RoundRobinArbiter",
+    "TokenBucketPause",
+    "WalkingOnesPattern",
+    "WeightedArbiter",
     "axi",
     "axi4_wait_bitaxi4_wait_read_data",
     "axi_lite",
     "axis",
+    "beats2buffer",
     "beats2bytearray",
     "beats2bytes",
+    "beats2ranges",
+    "buffer2beats",
     "bytestobeats",
     "checker",
     "chk_axis_packets",
+    "endpoint_logger",
+    "frame_key",
+    "get_intfc",
     "get_intfc_inits",
     "get_intfc_lst",
     "lineinfo",
+    "load_intfc_plugins",
+    "log_to_console",
+    "log_to_file",
+    "make_intfc",
+    "pattern_frames",
+    "read_binary_log",
+    "register_intfc",
     "send_axis",
     "send_axis_packets",
+    "set_log_level",
     "tkeep_resize",
+    "unregister_intfc",
     "wait_axis",
 ]
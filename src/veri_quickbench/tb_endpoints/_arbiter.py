@@ -0,0 +1,119 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Beat arbiters for AXIStreamSource(interleave=...)
+
+The source calls update(flows) whenever the set of frames being sent changes
+and select() once per beat. select() returns the index in flows of the frame
+whose next beat goes on the bus. Any schedule is worked out in update() so
+select() does a constant amount of work.
+"""
+
+import random
+
+
+class AXIStreamArbiter(object):
+    """Base class, flows is the list of (tdest, tid) of the frames being sent"""
+
+    def update(self, flows):
+        self.flows = flows
+
+    def select(self):
+        raise NotImplementedError
+
+
+class RoundRobinArbiter(AXIStreamArbiter):
+    """One beat from each frame in turn"""
+
+    def __init__(self):
+        self._i = -1
+
+    def select(self):
+        self._i = (self._i + 1) % len(self.flows)
+        return self._i
+
+
+class WeightedArbiter(AXIStreamArbiter):
+    def __init__(self, weights=None, default=1):
+        """
+        Smooth weighted round robin, a frame gets weight beats out of every sum of weights
+        weights - dict of (tdest, tid) to integer weight
+        default - weight of flows not in weights
+        """
+        self.weights = {} if weights is None else weights
+        self.default = default
+        self._schedule = []
+        self._i = 0
+
+    def update(self, flows):
+        self.flows = flows
+        weights = [self.weights.get(f, self.default) for f in flows]
+        if any(w < 1 for w in weights):
+            raise ValueError("weights must be >= 1")
+        total = sum(weights)
+        current = [0] * len(flows)
+        self._schedule = []
+        for _ in range(total):
+            for i, w in enumerate(weights):
+                current[i] += w
+            i = current.index(max(current))
+            current[i] -= total
+            self._schedule.append(i)
+        self._i = 0
+
+    def select(self):
+        i = self._schedule[self._i]
+        self._i += 1
+        if self._i == len(self._schedule):
+            self._i = 0
+        return i
+
+
+class RandomBurstArbiter(AXIStreamArbiter):
+    def __init__(self, max_burst=4, seed=None):
+        """
+        Sends bursts of 1 to max_burst beats from a randomly chosen frame
+        seed - seed of the arbiter's own random stream
+        """
+        if not isinstance(max_burst, (int,)) or max_burst < 1:
+            raise ValueError(f"max_burst={max_burst} must be an integer >= 1")
+        self.max_burst = max_burst
+        self.rng = random.Random(seed)  # noqa: S311
+        self._i = 0
+        self._left = 0
+
+    def update(self, flows):
+        # the frame being burst may have finished, or moved in flows
+        if self._left and self._i < len(self.flows) and self.flows[self._i] in flows:
+            self._i = flows.index(self.flows[self._i])
+        else:
+            self._left = 0
+        self.flows = flows
+
+    def select(self):
+        if not self._left:
+            self._i = self.rng.randrange(len(self.flows))
+            self._left = self.rng.randint(1, self.max_burst)
+        self._left -= 1
+        return self._i
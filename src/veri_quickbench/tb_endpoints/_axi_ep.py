@@ -25,6 +25,7 @@ import math
 
 from myhdl import Signal, block, instance, instances
 
+from ._axi_trace import axi_trace_monitor
 from ._axis_ep import (
     AXIStreamFrame,
     AXIStreamSink,
@@ -32,6 +33,7 @@ from ._axis_ep import (
     ElementSizeError,
 )
 from ._intfc import axis
+from ._log import endpoint_logger
 
 # todo: create an issue_write_as_beats()
 
@@ -60,6 +62,7 @@ class AXIMaster(object):
         aw_first=False,
         check_bresp=True,
         store_as_beats=False,
+        log_reads=True,
     ):
         """
         Takes the following and converts to axi beats:
@@ -74,6 +77,7 @@ class AXIMaster(object):
         repr_items - number of items to print in data, keep, etc. arrays when printing an AXIStreamFrame, -1=full, 0=none
         aw_first- if True, forces aw channel to happen before wd channel
         check_bresp - if True, bresp channel is checked on a transaction
+        log_reads - if False, read data is not kept in self.a, self.d, self.tid (long running replays)
         """
         if data_width is None or not isinstance(data_width, (int,)):
             raise TypeError("data_width must be a integer multiple of 8")
@@ -97,6 +101,7 @@ class AXIMaster(object):
         self.aw_first = aw_first  # sends awvalid stream before wvalid
         self.check_bresp = check_bresp  # waits for bresp before transaction finished
         self.store_as_beats = store_as_beats
+        self.log_reads = log_reads
 
         self.has_logic = False
         self.wqueue = []  # pending write transactions
@@ -104,6 +109,8 @@ class AXIMaster(object):
         self.a = []  # addresses of read bytes
         self.d = []  # read bytes
         self.tid = []
+        self.writes_done = 0  # completed write transactions
+        self.reads_done = 0  # completed read transactions
 
     def issue_write(self, addr, data, tid=0):
         """
@@ -214,7 +221,13 @@ class AXIMaster(object):
         pause_araddr=0,
         pause_rdata=0,
         xname=None,
+        trace=None,
+        stats=None,
     ):
+        """
+        trace - optional AXITraceRecorder, every completed write and read on axi is recorded to it
+        stats - optional AXIMonitor attached to axi, collects per channel utilization, stalls and latency
+        """
         if self.has_logic:
             raise RuntimeError("create_logic() has already been called on this instance.")
         self.has_logic = True
@@ -340,6 +353,11 @@ class AXIMaster(object):
             xname="m_axi4 rdata",
         )
 
+        if trace is not None:
+            trace_logic = axi_trace_monitor(clk, rst, axi, trace)  # noqa: F841
+        if stats is not None:
+            stats_logic = stats.create_logic(clk, rst, axi)  # noqa: F841
+
         @instance
         def logic():
             while True:
@@ -350,6 +368,7 @@ class AXIMaster(object):
 
                     # AW Channel
                     axi.awburst.next = 1
+                    axi.awsize.next = self.bytes_per_beat.bit_length() - 1  # full width beats
                     axis_frame = AXIStreamFrame(
                         data=[adr],
                         tid=awid,
@@ -378,11 +397,13 @@ class AXIMaster(object):
                         while axis_resp.empty():
                             yield clk.posedge
                         axis_resp.recv()
+                    self.writes_done += 1
 
                 if self.rqueue:
                     #  TODO: for now just issue one read at a time, change later!
                     (adr, len_beats, arid) = self.rqueue.pop(0)
                     axi.arburst.next = 1
+                    axi.arsize.next = self.bytes_per_beat.bit_length() - 1
                     axis_frame = AXIStreamFrame(
                         data=[adr],
                         tid=arid,
@@ -396,8 +417,11 @@ class AXIMaster(object):
                     while axis_rdata.empty():
                         yield clk.posedge
                     d = axis_rdata.recv()
+                    self.reads_done += 1
 
-                    if self.store_as_beats:
+                    if not self.log_reads:
+                        pass
+                    elif self.store_as_beats:
                         raise NotImplementedError("Not implemented yet!")
                         # self.a.append(adr)
                         # d_beats = d.to_beats(endian=self.endian)
@@ -614,10 +638,17 @@ class AXISlave(object):
         pause_araddr=0,
         pause_rdata=0,
         xname=None,
+        trace=None,
+        stats=None,
     ):
+        """
+        trace - optional AXITraceRecorder, every completed write and read on axi is recorded to it
+        stats - optional AXIMonitor attached to axi, collects per channel utilization, stalls and latency
+        """
         if self.has_logic:
             raise RuntimeError("create_logic() has already been called on this instance.")
         self.has_logic = True
+        log = endpoint_logger(xname)
         aw_size = len(axi.awaddr)
         wd_size = len(axi.wdata)
         ar_size = len(axi.araddr)
@@ -740,6 +771,11 @@ class AXISlave(object):
             xname="s_axi4 rdata",
         )
 
+        if trace is not None:
+            trace_logic = axi_trace_monitor(clk, rst, axi, trace)  # noqa: F841
+        if stats is not None:
+            stats_logic = stats.create_logic(clk, rst, axi)  # noqa: F841
+
         @instance
         def logic():  # noqa: PLR0912, PLR0915
             while True:
@@ -792,7 +828,6 @@ class AXISlave(object):
 
                     if (araddr & self.adr_lbits_mask) != 0:
                         if not self.allow_unaligned:
-                            print("unaligned address detected")
                             raise AXITransactionError(
                                 "Unaligned transaction not allowed for AXISlave with allow_unaliged=False."
                             )
@@ -832,7 +867,7 @@ class AXISlave(object):
                             id_new = self.tid[index_a : index_a + len_bytes]
 
                         if id_new[0] != arid:
-                            print("Warning: ARID mismatch.")
+                            log.warning("ARID mismatch, read %d from data written with id %d", arid, id_new[0])
                         # a_reverse = a_new
                         d_reverse = d_new
                         # d_reverse.reverse()
@@ -0,0 +1,286 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Passive AXI bandwidth and latency monitor
+
+Only counters and fixed size histograms are kept, the start cycle and byte
+count of each outstanding transaction are the only per transaction state, so
+memory use does not grow with the length of a test. Per ID state is kept in
+dicts holding the IDs seen on the bus, not one slot for every possible ID.
+"""
+
+import logging
+from collections import defaultdict, deque
+
+from myhdl import block, instance
+
+from ._log import endpoint_logger
+
+AXI_MONITOR_CHANNELS = ("aw", "w", "b", "ar", "r")
+
+
+def _pop(queues, key):
+    """oldest value queued under key or None, the key is deleted once its queue is empty"""
+    q = queues.get(key)
+    if not q:
+        return None
+    value = q.popleft()
+    if not q:
+        del queues[key]
+    return value
+
+
+class AXILatencyHistogram(object):
+    def __init__(self, bins=32, bin_width=4):
+        """
+        Fixed size latency histogram
+        bins - number of bins, the last bin also counts every latency past the end
+        bin_width - width of each bin in clock cycles
+        """
+        if not isinstance(bins, (int,)) or bins < 1:
+            raise ValueError(f"bins={bins} must be an integer >= 1")
+        if not isinstance(bin_width, (int,)) or bin_width < 1:
+            raise ValueError(f"bin_width={bin_width} must be an integer >= 1")
+        self.bin_width = bin_width
+        self.counts = [0] * bins
+        self.clear()
+
+    def clear(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.n = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def add(self, latency):
+        b = latency // self.bin_width
+        if b >= len(self.counts):
+            b = len(self.counts) - 1
+        self.counts[b] += 1
+        self.n += 1
+        self.total += latency
+        if self.min is None or latency < self.min:
+            self.min = latency
+        if self.max is None or latency > self.max:
+            self.max = latency
+
+    def mean(self):
+        return self.total / self.n if self.n else 0.0
+
+    def percentile(self, p):
+        """returns the upper edge of the bin holding the p'th percentile, 0 <= p <= 100"""
+        if not self.n:
+            return 0
+        target = self.n * p / 100
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= target:
+                if i == len(self.counts) - 1:
+                    return self.max
+                return min((i + 1) * self.bin_width - 1, self.max)
+        return self.max
+
+
+class AXIMonitor(object):
+    def __init__(self, bins=32, bin_width=4, interval=None):
+        """
+        Passive monitor for an axi interface bundle
+        bins, bin_width - size of the read and write latency histograms, see AXILatencyHistogram
+        interval - when not None, a report is logged at WARNING level every interval clock cycles, so it
+                   is shown at the default level of the generated testbench
+        """
+        if interval is not None and (not isinstance(interval, (int,)) or interval < 1):
+            raise ValueError(f"interval={interval} must be None or an integer >= 1")
+        self.interval = interval
+        self.wr_latency = AXILatencyHistogram(bins=bins, bin_width=bin_width)
+        self.rd_latency = AXILatencyHistogram(bins=bins, bin_width=bin_width)
+        self.has_logic = False
+        self.clear()
+
+    def clear(self):
+        """clears all counters and histograms, outstanding transactions are still tracked"""
+        self.cycles = 0
+        self.beats = dict.fromkeys(AXI_MONITOR_CHANNELS, 0)  # handshakes per channel
+        self.busy = dict.fromkeys(AXI_MONITOR_CHANNELS, 0)  # cycles with valid high per channel
+        self.wr_bytes = 0
+        self.rd_bytes = 0
+        self.wr_done = defaultdict(int)  # completed writes per id
+        self.rd_done = defaultdict(int)  # completed reads per id
+        self.wr_id_bytes = defaultdict(int)
+        self.rd_id_bytes = defaultdict(int)
+        self.wr_max_outstanding = 0
+        self.rd_max_outstanding = 0
+        self.wr_latency.clear()
+        self.rd_latency.clear()
+
+    def stalls(self, channel):
+        """cycles channel had valid high without ready, ie backpressure"""
+        return self.busy[channel] - self.beats[channel]
+
+    def wr_bytes_per_cycle(self):
+        return self.wr_bytes / self.cycles if self.cycles else 0.0
+
+    def rd_bytes_per_cycle(self):
+        return self.rd_bytes / self.cycles if self.cycles else 0.0
+
+    def report(self, xname=None):
+        """returns a printable summary of the counters and histograms"""
+        name = "" if xname is None else f"{xname}: "
+        lines = [
+            f"{name}cycles={self.cycles}",
+            f"  write: {self.wr_bytes} bytes, {self.wr_bytes_per_cycle():.3f} bytes/cycle, "
+            f"max outstanding {self.wr_max_outstanding}, latency min/mean/p99/max "
+            f"{self.wr_latency.min}/{self.wr_latency.mean():.1f}/{self.wr_latency.percentile(99)}/{self.wr_latency.max}",
+            f"  read:  {self.rd_bytes} bytes, {self.rd_bytes_per_cycle():.3f} bytes/cycle, "
+            f"max outstanding {self.rd_max_outstanding}, latency min/mean/p99/max "
+            f"{self.rd_latency.min}/{self.rd_latency.mean():.1f}/{self.rd_latency.percentile(99)}/{self.rd_latency.max}",
+            "  channel handshakes/stalls: "
+            + ", ".join(f"{c}={self.beats[c]}/{self.stalls(c)}" for c in AXI_MONITOR_CHANNELS),
+        ]
+        for i in sorted(self.wr_done.keys() | self.rd_done.keys()):
+            lines.append(
+                f"  id {i}: writes={self.wr_done.get(i, 0)} ({self.wr_id_bytes.get(i, 0)} bytes), "
+                f"reads={self.rd_done.get(i, 0)} ({self.rd_id_bytes.get(i, 0)} bytes)"
+            )
+        return "\n".join(lines)
+
+    @block
+    def create_logic(self, clk, rst, axi=None, xname=None):  # noqa: PLR0915
+        """
+        attaches the monitor to axi, nothing on the bus is driven
+        """
+        if self.has_logic:
+            raise RuntimeError("create_logic() has already been called on this instance.")
+        self.has_logic = True
+        bytes_per_beat = len(axi.rdata) // 8
+        log = endpoint_logger(xname)
+
+        @instance
+        def logic():  # noqa: PLR0912, PLR0915
+            aw_req = None
+            ar_req = None
+            aw_order = deque()  # awid of each accepted aw, in order, until its w burst is seen
+            w_bursts = deque()  # bytes of each complete w burst, until its aw is seen
+            w_acc = 0
+            # per id state is dropped again once nothing is outstanding on the id
+            wr_start = {}  # id -> start cycle of each outstanding write
+            rd_start = {}  # id -> start cycle of each outstanding read
+            wr_pend_bytes = {}  # id -> bytes of each write burst seen on w, until its response
+            rd_acc = {}  # id -> bytes of the read burst in progress
+            wr_outstanding = 0
+            rd_outstanding = 0
+            while True:
+                yield clk.posedge, rst.posedge
+
+                if rst:
+                    aw_req = None
+                    ar_req = None
+                    aw_order.clear()
+                    w_bursts.clear()
+                    w_acc = 0
+                    wr_start.clear()
+                    rd_start.clear()
+                    wr_pend_bytes.clear()
+                    rd_acc.clear()
+                    wr_outstanding = 0
+                    rd_outstanding = 0
+                    continue
+
+                self.cycles += 1
+                now = self.cycles
+
+                # write address
+                if axi.awvalid:
+                    self.busy["aw"] += 1
+                    if aw_req is None:
+                        aw_req = now
+                    if axi.awready:
+                        self.beats["aw"] += 1
+                        awid = int(axi.awid)
+                        wr_start.setdefault(awid, deque()).append(aw_req)
+                        aw_order.append(awid)
+                        aw_req = None
+                        wr_outstanding += 1
+                        self.wr_max_outstanding = max(self.wr_max_outstanding, wr_outstanding)
+
+                # write data, w bursts are in the same order as aw
+                if axi.wvalid:
+                    self.busy["w"] += 1
+                    if axi.wready:
+                        self.beats["w"] += 1
+                        nbytes = bin(int(axi.wstrb)).count("1")
+                        self.wr_bytes += nbytes
+                        w_acc += nbytes
+                        if axi.wlast:
+                            w_bursts.append(w_acc)
+                            w_acc = 0
+                while aw_order and w_bursts:
+                    wr_pend_bytes.setdefault(aw_order.popleft(), deque()).append(w_bursts.popleft())
+
+                # write response
+                if axi.bvalid:
+                    self.busy["b"] += 1
+                    if axi.bready:
+                        self.beats["b"] += 1
+                        bid = int(axi.bid)
+                        start = _pop(wr_start, bid)
+                        if start is not None:
+                            self.wr_latency.add(now - start)
+                            wr_outstanding -= 1
+                        self.wr_done[bid] += 1
+                        self.wr_id_bytes[bid] += _pop(wr_pend_bytes, bid) or 0
+
+                # read address
+                if axi.arvalid:
+                    self.busy["ar"] += 1
+                    if ar_req is None:
+                        ar_req = now
+                    if axi.arready:
+                        self.beats["ar"] += 1
+                        rd_start.setdefault(int(axi.arid), deque()).append(ar_req)
+                        ar_req = None
+                        rd_outstanding += 1
+                        self.rd_max_outstanding = max(self.rd_max_outstanding, rd_outstanding)
+
+                # read data
+                if axi.rvalid:
+                    self.busy["r"] += 1
+                    if axi.rready:
+                        self.beats["r"] += 1
+                        rid = int(axi.rid)
+                        self.rd_bytes += bytes_per_beat
+                        rd_acc[rid] = rd_acc.get(rid, 0) + bytes_per_beat
+                        if axi.rlast:
+                            start = _pop(rd_start, rid)
+                            if start is not None:
+                                self.rd_latency.add(now - start)
+                                rd_outstanding -= 1
+                            self.rd_done[rid] += 1
+                            self.rd_id_bytes[rid] += rd_acc.pop(rid)
+
+                if self.interval is not None and now % self.interval == 0 and log.isEnabledFor(logging.WARNING):
+                    log.warning("%s", self.report(xname))
+
+        return logic
@@ -0,0 +1,328 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Transaction level AXI trace files and replay
+
+A trace file is a small header followed by fixed size little endian records,
+one per completed AXI transaction. Records are packed into a preallocated
+buffer and written out in blocks so long soak runs only touch the file every
+buffer_records transactions. AXITraceReader memory maps the file so large
+traces can be scanned without reading them into memory. AXITraceReplay pulls
+records from a trace one at a time, so replaying a trace does not load it.
+"""
+
+import mmap
+import os
+import struct
+from collections import deque, namedtuple
+
+from myhdl import block, instance
+
+AXI_TRACE_MAGIC = b"VQBAXITR"
+AXI_TRACE_VERSION = 1
+AXI_TRACE_WRITE = 0
+AXI_TRACE_READ = 1
+
+# magic, version, record size
+_HEADER = struct.Struct("<8sII")
+# channel, size, resp, len, id, addr, request, accept, complete
+_RECORD = struct.Struct("<BBBBIQQQQ")
+
+AXITraceRecord = namedtuple(
+    "AXITraceRecord",
+    ["channel", "size", "resp", "len", "id", "addr", "request", "accept", "complete"],
+)
+
+
+class AXITraceError(Exception):
+    pass
+
+
+def _check_header(buf, path):
+    """
+    validates the header at the start of buf, raises AXITraceError if it is not an AXI trace
+    """
+    if len(buf) < _HEADER.size:
+        raise AXITraceError(f"{path} is too short to be an AXI trace file")
+    magic, version, rec_size = _HEADER.unpack_from(buf, 0)
+    if magic != AXI_TRACE_MAGIC:
+        raise AXITraceError(f"{path} is not an AXI trace file")
+    if version != AXI_TRACE_VERSION or rec_size != _RECORD.size:
+        raise AXITraceError(f"{path} has unsupported trace version {version}, record size {rec_size}")
+
+
+class AXITraceRecorder(object):
+    def __init__(self, path, buffer_records=4096):
+        """
+        Append only writer for AXI transaction records
+        path - trace file, created with a header if it does not exist, appended to if it does
+        buffer_records - number of records held in memory before being written to path
+        """
+        if not isinstance(buffer_records, (int,)) or buffer_records < 1:
+            raise ValueError(f"buffer_records={buffer_records} must be an integer >= 1")
+        self.path = path
+        self.buffer_records = buffer_records
+        self.count = 0  # records written through this recorder
+        self._buf = bytearray(buffer_records * _RECORD.size)
+        self._offset = 0
+
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                _check_header(f.read(_HEADER.size), path)
+            self._f = open(path, "ab")
+        else:
+            self._f = open(path, "ab")
+            self._f.write(_HEADER.pack(AXI_TRACE_MAGIC, AXI_TRACE_VERSION, _RECORD.size))
+
+    def record(self, channel, tid, addr, length, size, request, accept, complete, resp=0):  # noqa: PLR0913
+        """
+        adds a single transaction to the trace
+        channel - AXI_TRACE_WRITE or AXI_TRACE_READ
+        length - axlen of the burst, number of beats - 1
+        size - axsize of the burst
+        request, accept, complete - clock cycles of axvalid, axvalid & axready and the last bresp/rdata beat
+        """
+        _RECORD.pack_into(self._buf, self._offset, channel, size, resp, length, tid, addr, request, accept, complete)
+        self._offset += _RECORD.size
+        self.count += 1
+        if self._offset == len(self._buf):
+            self.flush()
+
+    def flush(self):
+        """writes any buffered records to the trace file"""
+        if self._offset:
+            self._f.write(memoryview(self._buf)[: self._offset])
+            self._offset = 0
+        self._f.flush()
+
+    def close(self):
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class AXITraceReader(object):
+    def __init__(self, path):
+        """
+        Memory mapped reader for a trace written by AXITraceRecorder
+        """
+        self.path = path
+        self._f = open(path, "rb")
+        if os.path.getsize(path) == 0:
+            self._f.close()
+            raise AXITraceError(f"{path} is too short to be an AXI trace file")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _check_header(self._mm, path)
+        except AXITraceError:
+            self.close()
+            raise
+        # ignore a partially written record at the end of the file
+        self._n = (len(self._mm) - _HEADER.size) // _RECORD.size
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._n
+        if i < 0 or i >= self._n:
+            raise IndexError(f"trace record {i} out of range")
+        return AXITraceRecord._make(_RECORD.unpack_from(self._mm, _HEADER.size + i * _RECORD.size))
+
+    def __iter__(self):
+        end = _HEADER.size + self._n * _RECORD.size
+        with memoryview(self._mm) as mv:
+            for rec in _RECORD.iter_unpack(mv[_HEADER.size : end]):
+                yield AXITraceRecord._make(rec)
+
+    def close(self):
+        if not self._mm.closed:
+            self._mm.close()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+@block
+def axi_trace_monitor(clk, rst, axi, recorder):
+    """
+    Passive monitor that writes one record to recorder for each completed AXI write and read
+    Request cycle is the first cycle axvalid is seen, accept is the axvalid & axready cycle,
+    complete is the bresp handshake for writes and the rlast handshake for reads.
+    """
+
+    @instance
+    def logic():  # noqa: PLR0912
+        cycle = 0
+        aw_req = None
+        ar_req = None
+        wr_pending = {}  # awid -> deque of (addr, len, size, request, accept)
+        rd_pending = {}  # arid -> deque of (addr, len, size, request, accept)
+        rd_resp = {}  # rid -> worst rresp seen in the current burst
+        while True:
+            yield clk.posedge, rst.posedge
+            cycle += 1
+
+            if rst:
+                aw_req = None
+                ar_req = None
+                wr_pending.clear()
+                rd_pending.clear()
+                rd_resp.clear()
+                continue
+
+            if axi.awvalid:
+                if aw_req is None:
+                    aw_req = cycle
+                if axi.awready:
+                    q = wr_pending.setdefault(int(axi.awid), deque())
+                    q.append((int(axi.awaddr), int(axi.awlen), int(axi.awsize), aw_req, cycle))
+                    aw_req = None
+
+            if axi.bvalid and axi.bready:
+                q = wr_pending.get(int(axi.bid))
+                if q:
+                    addr, length, size, req, acc = q.popleft()
+                    recorder.record(AXI_TRACE_WRITE, int(axi.bid), addr, length, size, req, acc, cycle, int(axi.bresp))
+
+            if axi.arvalid:
+                if ar_req is None:
+                    ar_req = cycle
+                if axi.arready:
+                    q = rd_pending.setdefault(int(axi.arid), deque())
+                    q.append((int(axi.araddr), int(axi.arlen), int(axi.arsize), ar_req, cycle))
+                    ar_req = None
+
+            if axi.rvalid and axi.rready:
+                rid = int(axi.rid)
+                resp = max(rd_resp.get(rid, 0), int(axi.rresp))
+                if axi.rlast:
+                    rd_resp.pop(rid, None)
+                    q = rd_pending.get(rid)
+                    if q:
+                        addr, length, size, req, acc = q.popleft()
+                        recorder.record(AXI_TRACE_READ, rid, addr, length, size, req, acc, cycle, resp)
+                else:
+                    rd_resp[rid] = resp
+
+    return logic
+
+
+class AXITraceReplay(object):
+    def __init__(self, master, trace, time_scale=1.0, max_outstanding=1, data_fn=None):
+        """
+        Replays AXI transactions from a trace through an AXIMaster
+        master - AXIMaster the transactions are issued to, use log_reads=False on long traces
+        trace - AXITraceReader or any iterable of AXITraceRecord, only read one record ahead
+        time_scale - spacing between transaction requests relative to the trace
+                   - 1.0 keeps the recorded timing, 0.5 halves the gaps, 0 issues as fast as possible
+        max_outstanding - number of transactions queued in master that have not completed, AXIMaster
+                          runs them one at a time on the bus, so this only bounds its queues
+        data_fn - when not None, called with each write record and returns the bytes to write,
+                  otherwise zeros are written
+        """
+        if time_scale < 0:
+            raise ValueError(f"time_scale={time_scale} must be >= 0")
+        if not isinstance(max_outstanding, (int,)) or max_outstanding < 1:
+            raise ValueError(f"max_outstanding={max_outstanding} must be an integer >= 1")
+        self.master = master
+        self.trace = trace
+        self.time_scale = time_scale
+        self.max_outstanding = max_outstanding
+        self.data_fn = data_fn
+        self.has_logic = False
+        self.issued = 0
+        self.done = False
+        self._base = 0  # transactions completed by master before the replay started
+        self._zeros = {}  # write data reused for each burst length
+
+    def outstanding(self):
+        """transactions issued to master that have not completed"""
+        return self._base + self.issued - self.master.writes_done - self.master.reads_done
+
+    def _issue(self, rec):
+        if 1 << rec.size != self.master.bytes_per_beat:
+            # AXIMaster only issues full width bursts, a narrow one would move the wrong number of bytes
+            raise AXITraceError(
+                f"record with size {rec.size} ({1 << rec.size} bytes per beat) cannot be replayed on a "
+                f"{self.master.bytes_per_beat} byte bus"
+            )
+        if rec.channel == AXI_TRACE_WRITE:
+            if self.data_fn is None:
+                nbytes = (rec.len + 1) * self.master.bytes_per_beat
+                data = self._zeros.get(nbytes)
+                if data is None:
+                    data = self._zeros[nbytes] = bytes(nbytes)
+            else:
+                data = self.data_fn(rec)
+            self.master.issue_write(addr=rec.addr, data=data, tid=rec.id)
+        else:
+            self.master.issue_read(addr=rec.addr, len_beats=rec.len + 1, arid=rec.id)
+        self.issued += 1
+
+    @block
+    def create_logic(self, clk, rst):
+        """
+        drives the master from the trace, self.done is set once every transaction has completed
+        """
+        if self.has_logic:
+            raise RuntimeError("create_logic() has already been called on this instance.")
+        self.has_logic = True
+
+        @instance
+        def logic():
+            records = iter(self.trace)
+            rec = next(records, None)
+            trace_start = None if rec is None else rec.request
+            start = None
+            cycle = 0
+            self._base = self.master.writes_done + self.master.reads_done
+            while True:
+                yield clk.posedge, rst.posedge
+                if rst:
+                    continue
+                cycle += 1
+                if start is None:
+                    start = cycle
+
+                while rec is not None and self.outstanding() < self.max_outstanding:
+                    if cycle - start < (rec.request - trace_start) * self.time_scale:
+                        break
+                    self._issue(rec)
+                    rec = next(records, None)
+
+                if rec is None and self.outstanding() == 0:
+                    self.done = True
+
+        return logic
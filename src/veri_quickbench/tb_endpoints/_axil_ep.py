@@ -0,0 +1,410 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+AXI4-Lite endpoints
+
+Unlike AXIMaster/AXISlave these do not build AXIStream frames for each channel.
+Every access is a single beat, so one process per endpoint drives all five
+channels directly.
+"""
+
+from collections import deque
+
+from myhdl import block, instance
+
+from ._axi_ep import AXIBusWidthError, AXIMemoryError, AXITransactionError
+from ._axis_ep import ElementSizeError
+from ._log import endpoint_logger
+
+AXIL_RESP_OKAY = 0
+AXIL_RESP_SLVERR = 2
+AXIL_RESP_DECERR = 3
+
+
+def _check_widths(data_width, addr_width):
+    """
+    validates data_width, addr_width passed into AXILiteMaster, AXILiteSlave
+    """
+    if data_width is None or not isinstance(data_width, (int,)):
+        raise TypeError("data_width must be a integer multiple of 8")
+    elif data_width % 8 != 0:
+        raise ElementSizeError(f"data_width={data_width}, which is not a multiple of 8")
+    if addr_width is None or not isinstance(addr_width, (int,)):
+        raise TypeError("addr_width must be an integer")
+
+
+def _check_bus(name, data_width, addr_width, axil):
+    """
+    checks that the connected axi_lite bus matches the configured widths
+    """
+    if data_width != len(axil.wdata) or data_width != len(axil.rdata):
+        raise AXIBusWidthError(
+            f"{name} configured with data_width {data_width} but connected WD/RD bus widths are {len(axil.wdata)}/{len(axil.rdata)}"
+        )
+    if addr_width != len(axil.awaddr) or addr_width != len(axil.araddr):
+        raise AXIBusWidthError(
+            f"{name} configured with addr_width {addr_width} but connected AW/AR bus widths are {len(axil.awaddr)}/{len(axil.araddr)}"
+        )
+
+
+class AXILiteMaster(object):
+    def __init__(self, data_width=None, addr_width=None, check_resp=True):
+        """
+        Single beat register access master for an axi_lite interface
+        data_width - width of wdata, rdata in bits
+        addr_width - width of awaddr, araddr in bits
+        check_resp - if True, a non OKAY bresp/rresp raises AXITransactionError
+        """
+        _check_widths(data_width, addr_width)
+        self.data_width = data_width
+        self.addr_width = addr_width
+        self.bytes_per_beat = data_width // 8
+        self.adr_lbits_mask = self.bytes_per_beat - 1
+        self.data_max = 2**data_width - 1
+        self.strb_full = 2**self.bytes_per_beat - 1
+        self.check_resp = check_resp
+
+        self.has_logic = False
+        self.wqueue = deque()  # pending writes (addr, data, wstrb)
+        self.rqueue = deque()  # pending reads (addr)
+        self.wr_busy = False  # write on the bus, waiting for bresp
+        self.rd_busy = False  # read on the bus, waiting for rdata
+        self.a = []  # addresses of read words
+        self.d = []  # read words
+        self.resp = []  # rresp for each read word
+        self.bresp = []  # bresp for each write
+
+    def issue_write(self, addr, data, wstrb=None):
+        """
+        AXI4-Lite Write
+        addr - byte address, must be aligned to data_width
+        data - integer word that fits in data_width
+        wstrb - byte enables, None writes all bytes
+        """
+        if not isinstance(data, (int,)):
+            raise TypeError(f"data={data} passed into issue_write should be an integer")
+        if data < 0 or data > self.data_max:
+            raise ElementSizeError(f"data={hex(data)} passed into issue_write does not fit in {self.data_width} bits")
+        if addr & self.adr_lbits_mask:
+            raise AXITransactionError(
+                f"issue_write() - address {addr} must be aligned to axi beat width {self.bytes_per_beat}"
+            )
+        if wstrb is None:
+            wstrb = self.strb_full
+        self.wqueue.append((addr, data, wstrb))
+
+    def issue_read(self, addr):
+        """AXI4-Lite Read of a single word"""
+        if addr & self.adr_lbits_mask:
+            raise AXITransactionError(
+                f"issue_read() - address {addr} must be aligned to axi beat width {self.bytes_per_beat}"
+            )
+        self.rqueue.append(addr)
+
+    def write_empty(self):
+        """True when no writes are queued or waiting on bresp"""
+        return not self.wqueue and not self.wr_busy
+
+    def read_empty(self):
+        """True when no reads are queued or waiting on rdata"""
+        return not self.rqueue and not self.rd_busy
+
+    def empty(self):
+        return self.write_empty() and self.read_empty()
+
+    def get_read_log(self):
+        """returns address, read data and rresp lists"""
+        return self.a, self.d, self.resp
+
+    def clear(self):
+        """clears address, read data and response lists"""
+        self.a = []
+        self.d = []
+        self.resp = []
+        self.bresp = []
+
+    @block
+    def create_logic(  # noqa: PLR0913, PLR0915
+        self,
+        clk,
+        rst,
+        axil=None,
+        pause_waddr=0,
+        pause_wdata=0,
+        pause_bresp=0,
+        pause_araddr=0,
+        pause_rdata=0,
+        xname=None,
+    ):
+        """
+        pause_waddr, pause_wdata hold off starting a write, pause_araddr holds off starting a read
+        pause_bresp, pause_rdata deassert bready, rready
+        """
+        if self.has_logic:
+            raise RuntimeError("create_logic() has already been called on this instance.")
+        self.has_logic = True
+        log = endpoint_logger(xname)
+        _check_bus("AXILiteMaster", self.data_width, self.addr_width, axil)
+
+        @instance
+        def logic():  # noqa: PLR0912, PLR0915
+            aw_pending = False
+            w_pending = False
+            ar_pending = False
+            wr_addr = 0
+            rd_addr = 0
+
+            while True:
+                yield clk.posedge, rst.posedge
+
+                if rst:
+                    axil.drive(awvalid=0, wvalid=0, bready=0, arvalid=0, rready=0)
+                    aw_pending = False
+                    w_pending = False
+                    ar_pending = False
+                    self.wr_busy = False
+                    self.rd_busy = False
+                    continue
+
+                # write channels
+                if aw_pending and axil.awready:
+                    axil.awvalid.next = 0
+                    aw_pending = False
+                if w_pending and axil.wready:
+                    axil.wvalid.next = 0
+                    w_pending = False
+                if self.wr_busy and axil.bvalid and axil.bready:
+                    bresp = int(axil.bresp)
+                    self.bresp.append(bresp)
+                    self.wr_busy = False
+                    if xname is not None:
+                        log.debug("write 0x%x bresp %d", wr_addr, bresp)
+                    if self.check_resp and bresp != AXIL_RESP_OKAY:
+                        raise AXITransactionError(f"[{xname}] write to {hex(wr_addr)} returned bresp {bresp}")
+                if not self.wr_busy and self.wqueue and not (pause_waddr or pause_wdata):
+                    wr_addr, data, wstrb = self.wqueue.popleft()
+                    axil.drive(awaddr=wr_addr, awvalid=1, wdata=data, wstrb=wstrb, wvalid=1)
+                    aw_pending = True
+                    w_pending = True
+                    self.wr_busy = True
+                axil.drive(bready=self.wr_busy and not pause_bresp)
+
+                # read channels
+                if ar_pending and axil.arready:
+                    axil.arvalid.next = 0
+                    ar_pending = False
+                if self.rd_busy and axil.rvalid and axil.rready:
+                    rresp = int(axil.rresp)
+                    self.a.append(rd_addr)
+                    self.d.append(int(axil.rdata))
+                    self.resp.append(rresp)
+                    self.rd_busy = False
+                    if xname is not None:
+                        log.debug("read 0x%x = 0x%x rresp %d", rd_addr, self.d[-1], rresp)
+                    if self.check_resp and rresp != AXIL_RESP_OKAY:
+                        raise AXITransactionError(f"[{xname}] read from {hex(rd_addr)} returned rresp {rresp}")
+                if not self.rd_busy and self.rqueue and not pause_araddr:
+                    rd_addr = self.rqueue.popleft()
+                    axil.drive(araddr=rd_addr, arvalid=1)
+                    ar_pending = True
+                    self.rd_busy = True
+                axil.drive(rready=self.rd_busy and not pause_rdata)
+
+        return logic
+
+
+class AXILiteSlave(object):
+    def __init__(self, data_width=None, addr_width=None, fill=None, log_writes=True):
+        """
+        Register map backed AXI4-Lite slave
+        data_width - width of wdata, rdata in bits
+        addr_width - width of awaddr, araddr in bits
+        fill - value returned when reading an address not in self.regs, if None reads
+               of unmapped addresses return DECERR
+        log_writes - if True, each write is appended to self.a, self.d
+
+        self.regs is a dict of word aligned byte address -> register value and
+        can be pre-loaded directly or with load()
+        """
+        _check_widths(data_width, addr_width)
+        self.data_width = data_width
+        self.addr_width = addr_width
+        self.bytes_per_beat = data_width // 8
+        self.adr_lbits_mask = self.bytes_per_beat - 1
+        self.data_max = 2**data_width - 1
+        self.fill = fill
+        self.log_writes = log_writes
+
+        # optional hooks, called with (addr, data) on a write and (addr) on a read
+        # a read hook returns the value to put on rdata
+        self.wr_fn = None
+        self.rd_fn = None
+
+        self.has_logic = False
+        self.regs = {}
+        self.a = []  # addresses written
+        self.d = []  # words written
+
+    def load(self, addr, data):
+        """
+        loads registers
+        addr - starting word aligned byte address
+        data - integer or list of integers, one per register
+        """
+        if addr & self.adr_lbits_mask:
+            raise AXIMemoryError(f"load() - address {addr} must be aligned to axi beat width {self.bytes_per_beat}")
+        if isinstance(data, (int,)):
+            data = [data]
+        elif not isinstance(data, (list, tuple)):
+            raise TypeError(f"data={data} passed into load should be int or list of ints")
+        for i, d in enumerate(data):
+            if not isinstance(d, (int,)):
+                raise TypeError(f"data[{i}]={d} passed into load should be an integer")
+            if d < 0 or d > self.data_max:
+                raise ElementSizeError(f"data[{i}]={hex(d)} passed into load does not fit in {self.data_width} bits")
+            self.regs[addr + i * self.bytes_per_beat] = d
+
+    def get_write_log(self):
+        """returns address and write data lists"""
+        return self.a, self.d
+
+    def clear(self):
+        """clears address and write data lists"""
+        self.a = []
+        self.d = []
+
+    def _write(self, addr, data, wstrb):
+        """applies a write with byte enables to the register map"""
+        addr = addr & ~self.adr_lbits_mask
+        mask = 0
+        for b in range(self.bytes_per_beat):
+            if (wstrb >> b) & 1:
+                mask |= 0xFF << (8 * b)
+        old = self.regs.get(addr, 0 if self.fill is None else self.fill)
+        new = (old & ~mask) | (data & mask)
+        self.regs[addr] = new
+        if self.log_writes:
+            self.a.append(addr)
+            self.d.append(new)
+        if self.wr_fn is not None:
+            self.wr_fn(addr, new)
+        return AXIL_RESP_OKAY
+
+    def _read(self, addr):
+        """returns (rdata, rresp) for a read of addr"""
+        addr = addr & ~self.adr_lbits_mask
+        if self.rd_fn is not None:
+            return self.rd_fn(addr), AXIL_RESP_OKAY
+        if addr in self.regs:
+            return self.regs[addr], AXIL_RESP_OKAY
+        if self.fill is not None:
+            return self.fill, AXIL_RESP_OKAY
+        return 0, AXIL_RESP_DECERR
+
+    @block
+    def create_logic(  # noqa: PLR0913, PLR0915
+        self,
+        clk,
+        rst,
+        axil=None,
+        pause_waddr=0,
+        pause_wdata=0,
+        pause_bresp=0,
+        pause_araddr=0,
+        pause_rdata=0,
+        xname=None,
+    ):
+        """
+        pause_waddr, pause_wdata, pause_araddr deassert awready, wready, arready
+        pause_bresp, pause_rdata hold off bvalid, rvalid
+        """
+        if self.has_logic:
+            raise RuntimeError("create_logic() has already been called on this instance.")
+        self.has_logic = True
+        log = endpoint_logger(xname)
+        _check_bus("AXILiteSlave", self.data_width, self.addr_width, axil)
+
+        @instance
+        def logic():  # noqa: PLR0915
+            aw_valid = False  # latched write address
+            w_valid = False  # latched write data
+            b_pending = False  # write done, bresp not yet on bus
+            r_pending = False  # read done, rdata not yet on bus
+            wr_addr = 0
+            wr_data = 0
+            wr_strb = 0
+            bresp = 0
+            rdata = 0
+            rresp = 0
+
+            while True:
+                yield clk.posedge, rst.posedge
+
+                if rst:
+                    axil.drive(awready=0, wready=0, bvalid=0, arready=0, rvalid=0)
+                    aw_valid = False
+                    w_valid = False
+                    b_pending = False
+                    r_pending = False
+                    continue
+
+                # write channels
+                if axil.awvalid and axil.awready:
+                    wr_addr = int(axil.awaddr)
+                    aw_valid = True
+                if axil.wvalid and axil.wready:
+                    wr_data = int(axil.wdata)
+                    wr_strb = int(axil.wstrb)
+                    w_valid = True
+                if axil.bvalid and axil.bready:
+                    axil.bvalid.next = 0
+                    b_pending = False
+                    aw_valid = False
+                    w_valid = False
+                elif aw_valid and w_valid and not b_pending and not axil.bvalid:
+                    bresp = self._write(wr_addr, wr_data, wr_strb)
+                    b_pending = True
+                    if xname is not None:
+                        log.debug("write 0x%x = 0x%x wstrb %x", wr_addr, wr_data, wr_strb)
+                if b_pending and not axil.bvalid and not pause_bresp:
+                    axil.drive(bresp=bresp, bvalid=1)
+                axil.drive(
+                    awready=not aw_valid and not (axil.awvalid and axil.awready) and not pause_waddr,
+                    wready=not w_valid and not (axil.wvalid and axil.wready) and not pause_wdata,
+                )
+
+                # read channels
+                if axil.rvalid and axil.rready:
+                    axil.rvalid.next = 0
+                    r_pending = False
+                elif axil.arvalid and axil.arready:
+                    rd_addr = int(axil.araddr)
+                    rdata, rresp = self._read(rd_addr)
+                    r_pending = True
+                    if xname is not None:
+                        log.debug("read 0x%x = 0x%x", rd_addr, rdata)
+                if r_pending and not axil.rvalid and not pause_rdata:
+                    axil.drive(rdata=rdata, rresp=rresp, rvalid=1)
+                axil.drive(arready=not r_pending and not (axil.arvalid and axil.arready) and not pause_araddr)
+
+        return logic
@@ -0,0 +1,131 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Incremental checkers for AXIStreamSink(on_beat=...)
+
+Each checker is called once per accepted beat and folds the beat into a
+running result, so nothing received is kept.
+"""
+
+import hashlib
+import zlib
+
+from ._axis_ep import ElementSizeError
+
+
+class AXIStreamBeatChecker(object):
+    def __init__(self, data_width=None, element_size_bits=8, endian="little"):
+        """
+        Base class for on_beat checkers, subclasses implement update(data, tlast)
+        data_width - width of tdata in bits
+        element_size_bits - size of element within tdata, one tkeep bit per element
+        endian - 'little' first element in lower bits of tdata, 'big' first element in upper bits
+        """
+        if data_width is None or not isinstance(data_width, (int,)):
+            raise TypeError("data_width must be an integer")
+        if data_width % element_size_bits != 0:
+            raise ElementSizeError(
+                f"data_width={data_width} is not a multiple of element_size_bits={element_size_bits}"
+            )
+        self.data_width = data_width
+        self.element_size_bits = element_size_bits
+        self.elements_per_beat = data_width // element_size_bits
+        self.element_bytes = (element_size_bits + 7) // 8
+        self.endian = endian
+        self.keep_full = 2**self.elements_per_beat - 1
+        self.beats = 0
+        self.frames = 0
+
+    def beat_bytes(self, tdata, tkeep):
+        """returns the kept elements of a beat as bytes, first element first"""
+        if tkeep == self.keep_full and self.element_size_bits == 8:  # noqa: PLR2004
+            return tdata.to_bytes(self.elements_per_beat, self.endian)
+        mask = 2**self.element_size_bits - 1
+        out = bytearray()
+        for j in range(self.elements_per_beat):
+            e = j if self.endian == "little" else self.elements_per_beat - j - 1
+            if (tkeep >> e) & 1:
+                out += ((tdata >> (e * self.element_size_bits)) & mask).to_bytes(self.element_bytes, "little")
+        return bytes(out)
+
+    def __call__(self, tdata, tkeep, tdest, tid, tuser, tlast):  # noqa: PLR0913
+        self.beats += 1
+        self.update(self.beat_bytes(tdata, tkeep), tlast)
+        if tlast:
+            self.frames += 1
+
+    def update(self, data, tlast):
+        raise NotImplementedError
+
+
+class AXIStreamByteCounter(AXIStreamBeatChecker):
+    """Counts beats, frames and bytes received"""
+
+    def __init__(self, data_width=None, element_size_bits=8, endian="little"):
+        super().__init__(data_width=data_width, element_size_bits=element_size_bits, endian=endian)
+        self.bytes = 0
+
+    def __call__(self, tdata, tkeep, tdest, tid, tuser, tlast):  # noqa: PLR0913
+        # no need to extract the data, only the number of kept elements
+        self.beats += 1
+        self.bytes += bin(tkeep).count("1") * self.element_bytes
+        if tlast:
+            self.frames += 1
+
+    def update(self, data, tlast):
+        self.bytes += len(data)
+
+
+class AXIStreamCRC32Checker(AXIStreamBeatChecker):
+    """
+    CRC-32 (zlib) of the received bytes
+    crc - running crc of the whole stream
+    frame_crc - crc of the last complete frame
+    """
+
+    def __init__(self, data_width=None, element_size_bits=8, endian="little"):
+        super().__init__(data_width=data_width, element_size_bits=element_size_bits, endian=endian)
+        self.crc = 0
+        self.frame_crc = None
+        self._frame_crc = 0
+
+    def update(self, data, tlast):
+        self.crc = zlib.crc32(data, self.crc)
+        self._frame_crc = zlib.crc32(data, self._frame_crc)
+        if tlast:
+            self.frame_crc = self._frame_crc
+            self._frame_crc = 0
+
+
+class AXIStreamHashChecker(AXIStreamBeatChecker):
+    """Running hashlib digest of the received bytes"""
+
+    def __init__(self, data_width=None, element_size_bits=8, endian="little", algorithm="sha256"):
+        super().__init__(data_width=data_width, element_size_bits=element_size_bits, endian=endian)
+        self.hash = hashlib.new(algorithm)
+
+    def update(self, data, tlast):
+        self.hash.update(data)
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
@@ -45,16 +45,21 @@ THE SOFTWARE.
 # SOFTWARE.
 
 import copy
+import itertools
+import logging
+from collections import deque
+from fractions import Fraction
 
 from myhdl import (
     Signal,
     always_comb,
     block,
     instance,
-    instances,
 )
 
+from ._arbiter import RoundRobinArbiter
 from ._intfc import axis as axis_iface
+from ._log import endpoint_logger
 
 
 class ElementSizeError(Exception):
@@ -476,25 +481,130 @@ class AXIStreamFrame(object):  # noqa: PLW1641
         return self.data.__iter__()
 
 
+class AXIStreamBeats(object):
+    def __init__(self, tdata, tkeep=None, tdest=0, tid=0, tuser=0):
+        """
+        Frame that is already split into beats, AXIStreamSource sends it without
+        converting elements to beats
+        tdata - list of beat values
+        tkeep - list of tkeep values, None keeps every element of every beat
+        tdest, tid, tuser - used for every beat
+        """
+        self.tdata = tdata
+        self.tkeep = tkeep
+        self.tdest = tdest
+        self.tid = tid
+        self.tuser = tuser
+
+    def __len__(self):
+        return len(self.tdata)
+
+    def __repr__(self):
+        return f"AXIStreamBeats(beats={len(self.tdata)}, tdest={self.tdest}, tid={self.tid}, tuser={self.tuser})"
+
+    def iter_beats(self, keep_full):
+        """yields (tdata, tkeep, tdest, tid, tuser, tlast) for each beat"""
+        n = len(self.tdata)
+        for i, d in enumerate(self.tdata):
+            k = keep_full if self.tkeep is None else self.tkeep[i]
+            yield d, k, self.tdest, self.tid, self.tuser, int(i == n - 1)
+
+
 class AXIStreamSource(object):
-    def __init__(self, repr_items=-1, elements_per_beat=None, element_size_bits=None):
+    def __init__(  # noqa: PLR0913
+        self,
+        repr_items=-1,
+        elements_per_beat=None,
+        element_size_bits=None,
+        stats=None,
+        interleave=1,
+        arbiter=None,
+        rate=None,
+        burst=1,
+    ):
+        """
+        stats - optional AXIStreamStats updated every clock cycle
+        interleave - number of frames sent at the same time, their beats are interleaved
+                     frames of the same (tdest, tid) are never interleaved and keep their order
+        arbiter - picks the frame of each beat when interleave > 1, RoundRobinArbiter() when None
+                  see WeightedArbiter and RandomBurstArbiter
+        rate - when not None, limits tvalid to an average of rate beats per cycle, 0 < rate <= 1
+               with a token bucket, the average is exact for rates with a denominator up to 2**16
+        burst - token bucket depth in beats, after an idle or stalled period up to burst beats
+                more than rate allows are sent before rate applies again
+        """
+        if not isinstance(interleave, (int,)) or interleave < 1:
+            raise ValueError(f"interleave={interleave} must be an integer >= 1")
+        if rate is not None and not 0 < rate <= 1:
+            raise ValueError(f"rate={rate} must be None or > 0 and <= 1")
+        if not isinstance(burst, (int,)) or burst < 1:
+            raise ValueError(f"burst={burst} must be an integer >= 1")
+        self.rate = None if rate is None else Fraction(rate).limit_denominator(2**16)
+        self.burst = burst
+        self.interleave = interleave
+        self.arbiter = RoundRobinArbiter() if arbiter is None else arbiter
         self.has_logic = False
-        self.queue = []
+        self.queue = deque()
+        self.stats = stats
+        self._enqueued = deque()  # stats.cycles when each queued frame was sent, only with stats
         self.repr_items = repr_items
         # note: the following are typically updated during create_logic call
         self.elements_per_beat = elements_per_beat
         self.element_size_bits = element_size_bits
+        # frames pulled lazily from feed(), at most prefetch frames are held in self.queue
+        self.feeder = None
+        self.prefetch = 0
 
     def send(self, frame):
-        self.queue.append(AXIStreamFrame(frame))
+        if isinstance(frame, (AXIStreamBeats,)):
+            self.queue.append(frame)
+        else:
+            self.queue.append(AXIStreamFrame(frame))
+        if self.stats is not None:
+            self._enqueued.append(self.stats.cycles)
+            if self.stats.tracker is not None:
+                self.stats.tracker.sent(self.queue[-1])
+
+    def send_beats(self, tdata, tkeep=None, tdest=0, tid=0, tuser=0):
+        """
+        Sends a frame given as a list of tdata beats, see AXIStreamBeats
+        """
+        self.send(AXIStreamBeats(tdata, tkeep=tkeep, tdest=tdest, tid=tid, tuser=tuser))
 
     def write(self, data):
         self.send(data)
 
+    def feed(self, frames, prefetch=4):
+        """
+        Sends frames pulled from an iterator or generator as the bus accepts them
+        frames - iterable of anything send() accepts, only read prefetch frames ahead
+        prefetch - number of frames pulled ahead of the frame being sent
+        """
+        if not isinstance(prefetch, (int,)) or prefetch < 1:
+            raise ValueError(f"prefetch={prefetch} must be an integer >= 1")
+        if self.feeder is None:
+            self.feeder = iter(frames)
+        else:
+            self.feeder = itertools.chain(self.feeder, frames)
+        self.prefetch = prefetch
+        self._refill()
+
+    def _refill(self):
+        """pulls frames from self.feeder until prefetch frames are queued or it is exhausted"""
+        while self.feeder is not None and len(self.queue) < self.prefetch:
+            try:
+                frame = next(self.feeder)
+            except StopIteration:
+                self.feeder = None
+                break
+            self.send(frame)
+
     def count(self):
         return len(self.queue)
 
     def empty(self):
+        """True when nothing is queued and any feed() iterator is exhausted"""
+        self._refill()
         return self.count() == 0
 
     @block
@@ -512,24 +622,43 @@ class AXIStreamSource(object):
         if self.has_logic:
             raise RuntimeError("Logic has already been created for this AXIStreamSource instance.")
         self.has_logic = True
+        log = endpoint_logger(xname)
 
         tready_int = Signal(bool(False))
         tvalid_int = Signal(bool(False))
+        throttle = Signal(bool(False))  # no rate tokens left
+
+        # token bucket in units of 1/rate_den beats, a beat uses rate_den units and rate_num are added
+        # every cycle, the bucket holds at least rate_den + rate_num - 1 so no tokens are lost while
+        # waiting for a whole beat and the average is exact
+        rate = self.rate
+        rate_num = rate_den = rate_cap = 0
+        if rate is not None:
+            rate_num = rate.numerator
+            rate_den = rate.denominator
+            rate_cap = max(self.burst * rate_den, rate_den + rate_num - 1)
+
+        def drive_beat(beat):
+            """drives a (tdata, tkeep, tdest, tid, tuser, tlast) beat, only signals that change are assigned"""
+            updates = axis.drive(tdata=beat[0], tkeep=beat[1], tdest=beat[2], tid=beat[3], tuser=beat[4], tlast=beat[5])
+            if self.stats is not None:
+                self.stats.signal_updates += updates
+                self.stats.signal_skips += len(beat) - updates
 
         @always_comb
         def pause_logic():
-            tready_int.next = axis.tready and not pause
-            axis.tvalid.next = tvalid_int and not pause
+            tready_int.next = axis.tready and not pause and not throttle
+            axis.tvalid.next = tvalid_int and not pause and not throttle
 
         @instance
         def logic():  # noqa: PLR0912, PLR0915
             frame = AXIStreamFrame(repr_items=self.repr_items)
-            data = []
-            keep = []
-            dest = []
-            tid = []
-            user = []
-            last = []
+            beats = iter(())
+            stats = self.stats
+            enqueued = 0  # stats.cycles when the frame being sent was queued
+            first_beat = True
+            frame_start = 0
+            tokens = 0 if rate is None else rate_cap
 
             # set these unless they are being overwritten
             if self.elements_per_beat is None:
@@ -541,85 +670,317 @@ class AXIStreamSource(object):
                 yield clk.posedge, rst.posedge
 
                 if rst:
-                    axis.tdata.next = 0
-                    axis.tkeep.next = 0
-                    axis.tdest.next = 0
-                    axis.tid.next = 0
-                    axis.tuser.next = False
+                    axis.drive(tdata=0, tkeep=0, tdest=0, tid=0, tuser=0, tlast=0)
                     tvalid_int.next = False
-                    axis.tlast.next = False
+                    tokens = 0 if rate is None else rate_cap
+                    throttle.next = False
                 else:
+                    if rate is not None:
+                        if tready_int and axis.tvalid:
+                            tokens -= rate_den
+                        tokens = min(tokens + rate_num, rate_cap)
+                        throttle.next = tokens < rate_den
+                    if stats is not None:
+                        stats.cycles += 1
+                        if axis.tvalid:
+                            stats.busy += 1
+                            if tready_int:
+                                stats.beats += 1
+                                if first_beat:
+                                    stats.queue_latency.add(stats.cycles - enqueued)
+                                    frame_start = stats.cycles
+                                    first_beat = False
+                                if axis.tlast:
+                                    stats.frames += 1
+                                    stats.frame_cycles.add(stats.cycles - frame_start)
+                                    first_beat = True
+                            else:
+                                stats.stalls += 1
                     if tready_int and axis.tvalid:
-                        if len(data) > 0:
-                            axis.tdata.next = data.pop(0)
-                            axis.tkeep.next = keep.pop(0)
-                            axis.tdest.next = dest.pop(0)
-                            axis.tid.next = tid.pop(0)
-                            axis.tuser.next = user.pop(0)
+                        beat = next(beats, None)
+                        if beat is not None:
+                            drive_beat(beat)
                             tvalid_int.next = True
-                            axis.tlast.next = last.pop(0)
                         else:
                             tvalid_int.next = False
-                            axis.tlast.next = False
+                            axis.drive(tlast=0)
                     if (axis.tlast and tready_int and axis.tvalid) or not tvalid_int:
-                        if len(self.queue) > 0:
-                            frame = self.queue.pop(0)
-                            frame.elements_per_beat = self.elements_per_beat
-                            frame.element_size_bits = self.element_size_bits
-                            data, keep, dest, user, tid, last = frame.to_beats()
-                            if xname is not None:
-                                if frame.repr_items != 0:
-                                    print("[%s] Sending frame %s" % (xname, repr(frame)))
-                                else:
-                                    print("s", end="", flush=True)
-                            axis.tdata.next = data.pop(0)
-                            axis.tkeep.next = keep.pop(0)
-                            axis.tdest.next = dest.pop(0)
-                            axis.tid.next = tid.pop(0)
-                            axis.tuser.next = user.pop(0)
+                        if not self.queue:
+                            self._refill()
+                        if self.queue:
+                            frame = self.queue.popleft()
+                            if stats is not None:
+                                enqueued = self._enqueued.popleft()
+                            self._refill()
+                            if isinstance(frame, (AXIStreamBeats,)):
+                                beats = frame.iter_beats(2**self.elements_per_beat - 1)
+                            else:
+                                frame.elements_per_beat = self.elements_per_beat
+                                frame.element_size_bits = self.element_size_bits
+                                data, keep, dest, user, tid, last = frame.to_beats()
+                                beats = zip(data, keep, dest, tid, user, last)
+                            if xname is not None and log.isEnabledFor(logging.DEBUG):
+                                log.debug("Sending frame %s", repr(frame))
+                            beat = next(beats)
+                            drive_beat(beat)
                             tvalid_int.next = True
-                            axis.tlast.next = last.pop(0)
 
-        return instances()
+        @instance
+        def logic_interleaved():  # noqa: PLR0912, PLR0915
+            # each slot is [flow, beats, next beat, frame, stats.cycles at send(), stats.cycles at first beat]
+            slots = []
+            cur = None  # slot of the beat on the bus
+            stats = self.stats
+            arbiter = self.arbiter
+            scan = 4 * self.interleave  # queued frames looked at for a flow that is not busy
+            tokens = 0 if rate is None else rate_cap
+
+            if self.elements_per_beat is None:
+                self.elements_per_beat = len(axis.tkeep)
+            if self.element_size_bits is None:
+                self.element_size_bits = int((len(axis.tdata) + self.elements_per_beat - 1) / self.elements_per_beat)
+            keep_full = 2**self.elements_per_beat - 1
+
+            def activate():
+                """moves queued frames into free slots, returns True when any were added"""
+                added = False
+                busy = {slot[0] for slot in slots}
+                i = 0
+                while len(slots) < self.interleave:
+                    if i >= len(self.queue):
+                        self._refill()
+                        if i >= len(self.queue):
+                            break
+                    if i >= scan:
+                        break
+                    frame = self.queue[i]
+                    if isinstance(frame, (AXIStreamBeats,)):
+                        flow = (frame.tdest, frame.tid)
+                    else:
+                        flow = (frame.dest[0] if frame.dest else 0, frame.tid[0] if frame.tid else 0)
+                    if flow in busy:
+                        # later frames of the flow wait as well, so it keeps its order
+                        i += 1
+                        continue
+                    busy.add(flow)
+                    del self.queue[i]
+                    enqueued = 0
+                    if stats is not None:
+                        enqueued = self._enqueued[i]
+                        del self._enqueued[i]
+                    if isinstance(frame, (AXIStreamBeats,)):
+                        beats = list(frame.iter_beats(keep_full))
+                    else:
+                        frame.elements_per_beat = self.elements_per_beat
+                        frame.element_size_bits = self.element_size_bits
+                        data, keep, dest, user, tid, last = frame.to_beats()
+                        beats = list(zip(data, keep, dest, tid, user, last))
+                    slots.append([flow, beats, 0, frame, enqueued, 0])
+                    added = True
+                    if xname is not None and log.isEnabledFor(logging.DEBUG):
+                        log.debug("Sending frame %s", repr(frame))
+                return added
+
+            while True:
+                yield clk.posedge, rst.posedge
+
+                if rst:
+                    axis.drive(tdata=0, tkeep=0, tdest=0, tid=0, tuser=0, tlast=0)
+                    tvalid_int.next = False
+                    slots = []
+                    cur = None
+                    tokens = 0 if rate is None else rate_cap
+                    throttle.next = False
+                    continue
+
+                changed = False
+                if rate is not None:
+                    if tready_int and axis.tvalid:
+                        tokens -= rate_den
+                    tokens = min(tokens + rate_num, rate_cap)
+                    throttle.next = tokens < rate_den
+                if stats is not None:
+                    stats.cycles += 1
+                    if axis.tvalid:
+                        stats.busy += 1
+                        if not tready_int:
+                            stats.stalls += 1
+                if tready_int and axis.tvalid:
+                    if stats is not None:
+                        stats.beats += 1
+                        if cur[2] == 0:
+                            stats.queue_latency.add(stats.cycles - cur[4])
+                            cur[5] = stats.cycles
+                        if cur[2] == len(cur[1]) - 1:
+                            stats.frames += 1
+                            stats.frame_cycles.add(stats.cycles - cur[5])
+                    cur[2] += 1
+                    if cur[2] == len(cur[1]):
+                        slots.remove(cur)
+                        changed = True
+                    cur = None
+                if cur is None:
+                    if len(slots) < self.interleave and activate():
+                        changed = True
+                    if changed and slots:
+                        arbiter.update([slot[0] for slot in slots])
+                    if slots:
+                        cur = slots[arbiter.select()]
+                        beat = cur[1][cur[2]]
+                        drive_beat(beat)
+                        tvalid_int.next = True
+                    else:
+                        tvalid_int.next = False
+                        axis.drive(tlast=0)
+
+        if self.interleave > 1:
+            return logic_interleaved, pause_logic
+        return logic, pause_logic
 
 
 class AXIStreamSink(object):
-    def __init__(self, repr_items=-1, skip_asserts=False, capture_leading=False):
+    def __init__(  # noqa: PLR0913
+        self,
+        repr_items=-1,
+        skip_asserts=False,
+        capture_leading=False,
+        on_beat=None,
+        on_frame=None,
+        store=True,
+        stats=None,
+        interleaved=False,
+    ):
         """
         capture_leading - capture elements with keep=0 bits during first beat
+        on_beat - when not None, called as on_beat(tdata, tkeep, tdest, tid, tuser, tlast) for every beat
+        on_frame - when not None, called with each received AXIStreamFrame
+                 - with store=False the frame is reused once on_frame returns
+        store - if False, received frames are not kept, use with on_beat/on_frame
+                so long tests run in constant memory
+        stats - optional AXIStreamStats updated every clock cycle
+        interleaved - if True, beats are reassembled per (tdest, tid) so frames of different
+                      flows may be interleaved beat by beat, see AXIStreamSource(interleave=...)
         """
         self.has_logic = False
-        self.queue = []
+        # received frames in arrival order and indexed by flow, a frame taken through one
+        # index is marked and skipped when it reaches the front of the others
+        self._rx = deque()
+        self._flows = {}  # (tdest, tid) -> deque
+        self._dests = {}  # tdest -> deque
+        self._tids = {}  # tid -> deque
+        self._flow_counts = {}  # frames waiting per index key
+        self._dest_counts = {}
+        self._tid_counts = {}
+        self._count = 0
         self.read_queue = []
         self.repr_items = repr_items
         self.skip_asserts = skip_asserts
         self.capture_leading = capture_leading
-
-    def recv(self):
+        self.on_beat = on_beat
+        self.on_frame = on_frame
+        self.store = store
+        self.stats = stats
+        self.interleaved = interleaved
+        self.beats = 0  # beats received
+        self.frames = 0  # frames received
+
+    @property
+    def queue(self):
+        """received frames that have not been taken, in arrival order"""
+        return [e[0] for e in self._rx if not e[1]]
+
+    def _put(self, frame):
+        tdest = frame.dest[0] if frame.dest else 0
+        tid = frame.tid[0] if frame.tid else 0
+        entry = [frame, False, tdest, tid]  # frame, taken, tdest, tid
+        self._rx.append(entry)
+        for index, counts, key in self._keys(tdest, tid):
+            if key in index:
+                index[key].append(entry)
+                counts[key] += 1
+            else:
+                index[key] = deque((entry,))
+                counts[key] = 1
+        self._count += 1
+
+    def _keys(self, tdest, tid):
+        return (
+            (self._flows, self._flow_counts, (tdest, tid)),
+            (self._dests, self._dest_counts, tdest),
+            (self._tids, self._tid_counts, tid),
+        )
+
+    def recv(self, tdest=None, tid=None):
         """
-        returns AXIS Frame that was received
+        returns AXIS Frame that was received, None when there is none
+        tdest, tid - when not None, returns the oldest frame of that tdest and/or tid
         """
-        if len(self.queue) > 0:
-            return self.queue.pop(0)
+        if tdest is None and tid is None:
+            q = self._rx
+        elif tid is None:
+            q = self._dests.get(tdest)
+        elif tdest is None:
+            q = self._tids.get(tid)
+        else:
+            q = self._flows.get((tdest, tid))
+        while q:
+            entry = q.popleft()
+            if entry[1]:
+                continue
+            entry[1] = True
+            self._count -= 1
+            for index, counts, key in self._keys(entry[2], entry[3]):
+                counts[key] -= 1
+                if not counts[key]:
+                    # nothing left waiting, drop the queue so short lived flows do not build up
+                    del counts[key]
+                    del index[key]
+                else:
+                    iq = index[key]
+                    while iq[0][1]:
+                        iq.popleft()
+            while self._rx and self._rx[0][1]:
+                self._rx.popleft()
+            return entry[0]
         return None
 
     def read(self, count=-1):
         """
         returns accumulated data from any AXIS Frames received
         """
-        while len(self.queue) > 0:
-            self.read_queue.extend(self.queue.pop(0).data)
+        while self._count:
+            self.read_queue.extend(self.recv().data)
         if count < 0:
             count = len(self.read_queue)
         data = self.read_queue[:count]
         del self.read_queue[:count]
         return data
 
-    def count(self):
-        return len(self.queue)
+    def count(self, tdest=None, tid=None):
+        """number of received frames waiting, optionally only those of a tdest and/or tid"""
+        if tdest is None and tid is None:
+            return self._count
+        if tid is None:
+            return self._dest_counts.get(tdest, 0)
+        if tdest is None:
+            return self._tid_counts.get(tid, 0)
+        return self._flow_counts.get((tdest, tid), 0)
 
-    def empty(self):
-        return self.count() == 0
+    def empty(self, tdest=None, tid=None):
+        return self.count(tdest=tdest, tid=tid) == 0
+
+    def wait(self, clk, tdest=None, tid=None, timeout=None):
+        """
+        generator that waits for a frame, use as yield from sink.wait(clk, ...) in a testbench process
+        tdest, tid - when not None, waits for a frame of that tdest and/or tid
+        timeout - raises TimeoutError after timeout clock cycles, None waits forever
+        """
+        i = 0
+        while self.empty(tdest=tdest, tid=tid):
+            if timeout is not None and i >= timeout:
+                raise TimeoutError(f"no frame with tdest={tdest}, tid={tid} after {timeout} cycles")
+            yield clk.posedge
+            i += 1
 
     @block
     def create_logic(  # noqa: PLR0915
@@ -636,6 +997,7 @@ class AXIStreamSink(object):
         if self.has_logic:
             raise RuntimeError("Logic has already been created for this AXIStreamSink instance.")
         self.has_logic = True
+        log = endpoint_logger(xname)
         tready_int = Signal(bool(False))
         tvalid_int = Signal(bool(False))
 
@@ -658,6 +1020,14 @@ class AXIStreamSink(object):
             user = []
             last = []
             first = True
+            stats = self.stats
+            tracker = None if stats is None else stats.tracker
+            frame_start = 0
+            partial = {}  # (tdest, tid) -> [data, keep, dest, tid, user, last, frame_start] when interleaved
+            part = None
+            keep_top = 1 << (len(axis.tkeep) - 1)
+            # frames are only built when something uses them
+            build = self.store or self.on_frame is not None or tracker is not None
 
             while True:
                 yield clk.posedge, rst.posedge
@@ -672,55 +1042,97 @@ class AXIStreamSink(object):
                     user = []
                     last = []
                     first = True
+                    partial.clear()
                 else:
                     tready_int.next = True
+                    if stats is not None:
+                        stats.cycles += 1
+                        if axis.tvalid:
+                            stats.busy += 1
+                            if not axis.tready:
+                                stats.stalls += 1
                     if tvalid_int:
+                        b = axis.sample()
+                        if self.interleaved:
+                            key = (b.tdest, b.tid)
+                            part = partial.get(key)
+                            first = part is None
+                            if first:
+                                part = partial[key] = [[], [], [], [], [], [], 0]
+                            data, keep, dest, tid, user, last, frame_start = part
                         if not self.skip_asserts:
                             # zero tkeep not allowed
-                            if int(axis.tkeep) == 0:
+                            if b.tkeep == 0:
                                 raise AssertionError("tkeep must not be zero")
                             # tkeep must be contiguous
                             # i.e. 0b00011110 allowed, but 0b00011010 not allowed
-                            b = int(axis.tkeep)
-                            while b & 1 == 0:
-                                b = b >> 1
-                            while b & 1 == 1:
-                                b = b >> 1
-                            if b != 0:
+                            k = b.tkeep
+                            while k & 1 == 0:
+                                k = k >> 1
+                            while k & 1 == 1:
+                                k = k >> 1
+                            if k != 0:
                                 raise AssertionError("tkeep must be contiguous (no gaps allowed)")
                             # tkeep must not have gaps across cycles
                             if not first:
                                 # not first cycle; lowest bit must be set
-                                if not (int(axis.tkeep) & 1):
+                                if not (b.tkeep & 1):
                                     raise AssertionError("Lowest bit of tkeep must be set on non-first cycle")
-                            if not axis.tlast:
+                            if not b.tlast:
                                 # not last cycle; highest bit must be set
-                                if (int(axis.tkeep) & (1 << (len(axis.tkeep) - 1))) == 0:
+                                if (b.tkeep & keep_top) == 0:
                                     raise AssertionError("Highest bit of tkeep must be set on non-last cycle")
 
-                        data.append(int(axis.tdata))
-                        keep.append(int(axis.tkeep))
-                        dest.append(int(axis.tdest))
-                        tid.append(int(axis.tid))
-                        user.append(int(axis.tuser))
-                        last.append(int(axis.tlast))
-                        first = False
-                        if axis.tlast:
-                            frame.from_beats(
-                                tdata=data,
-                                tkeep=keep,
-                                tdest=dest,
-                                tuser=user,
-                                tid=tid,
-                                tlast=last,
-                                capture_leading=self.capture_leading,
+                        self.beats += 1
+                        if stats is not None:
+                            stats.beats += 1
+                            if first:
+                                frame_start = stats.cycles
+                                if part is not None:
+                                    part[6] = frame_start
+                            if b.tlast:
+                                stats.frames += 1
+                                stats.frame_cycles.add(stats.cycles - frame_start)
+                        if self.on_beat is not None:
+                            self.on_beat(
+                                b.tdata,
+                                b.tkeep,
+                                b.tdest,
+                                b.tid,
+                                b.tuser,
+                                b.tlast,
                             )
-                            self.queue.append(copy.deepcopy(frame))
-                            if xname is not None:
-                                if self.repr_items != 0:
-                                    print("[%s] Got frame %s" % (xname, repr(frame)))
-                                else:
-                                    print("r", end="", flush=True)
+                        if build:
+                            data.append(b.tdata)
+                            keep.append(b.tkeep)
+                            dest.append(b.tdest)
+                            tid.append(b.tid)
+                            user.append(b.tuser)
+                            last.append(b.tlast)
+                        first = False
+                        if b.tlast:
+                            self.frames += 1
+                            if data:
+                                frame.from_beats(
+                                    tdata=data,
+                                    tkeep=keep,
+                                    tdest=dest,
+                                    tuser=user,
+                                    tid=tid,
+                                    tlast=last,
+                                    capture_leading=self.capture_leading,
+                                )
+                            if self.store:
+                                rx_frame = copy.deepcopy(frame)
+                                self._put(rx_frame)
+                                if self.on_frame is not None:
+                                    self.on_frame(rx_frame)
+                            elif self.on_frame is not None:
+                                self.on_frame(frame)
+                            if tracker is not None:
+                                tracker.received(frame)
+                            if xname is not None and log.isEnabledFor(logging.DEBUG):
+                                log.debug("Got frame %s", repr(frame))
                             frame.clear()
                             data = []
                             keep = []
@@ -729,5 +1141,7 @@ class AXIStreamSink(object):
                             user = []
                             last = []
                             first = True
+                            if part is not None:
+                                del partial[key]
 
         return logic, pause_logic
@@ -20,453 +20,321 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-
-import inspect
-import sys
+"""
+Interface bundles
+
+Each interface type is described by an IntfcSpec: its parameters and a table of
+IntfcSig entries giving each signal's name, width, default value and direction.
+make_intfc() compiles the table into a class whose __init__ builds every signal
+in straight line code, signals passed in by name are used as they are. The
+class also gets sample(), which reads every signal into one namedtuple, and
+drive(), which only assigns .next of the signals whose value changes. Endpoints
+use them per beat instead of a lookup and int() per signal, and skipping
+unchanged values saves the simulator an update for each of them, under
+cosimulation that is a value that does not cross into the HDL simulator.
+drive() returns the number of signals it assigned so the saving can be counted.
+
+Interface types are kept in a registry, register_intfc() adds new bus types
+such as APB or Avalon-ST. Packages can also provide them through the
+"veri_quickbench.intfc" entry point group, each entry point loads an IntfcSpec
+or a list of them and is read the first time the registry is used. The
+registry answers get_intfc_lst() and get_intfc_inits() for port detection and
+code generation in tb_creator from caches that are rebuilt when it changes.
+
+The bundles keep their signals in the instance __dict__ rather than __slots__,
+MyHDL finds the signals of an interface argument through vars() when converting.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
 
 from myhdl import Signal, _Signal, intbv
 
+IN = "in"  # driven by the slave/sink side
+OUT = "out"  # driven by the master/source side
+
+
+class IntfcSig(object):
+    __slots__ = ("default", "direction", "name", "width")
+
+    def __init__(self, name, width=None, default=0, direction=OUT):
+        """
+        name - signal name, also the __init__ argument and attribute name
+        width - None for a bool Signal, else an int or a Python expression of the
+                interface parameters, ie "DATA_WIDTH // 8"
+        default - initial value, an int or an expression of the parameters and W, the width
+        direction - OUT when driven by the master/source, IN when driven by the slave/sink
+        """
+        self.name = name
+        self.width = width
+        self.default = default
+        self.direction = direction
+
+    def __repr__(self):
+        return f"IntfcSig({self.name!r}, width={self.width!r}, default={self.default!r}, direction={self.direction!r})"
+
+
+class IntfcSpec(object):
+    def __init__(self, name, params, signals, extra_args=()):
+        """
+        name - interface type name, ie "axis"
+        params - list of (parameter name, default value)
+        signals - list of IntfcSig
+        extra_args - __init__ arguments that are accepted and ignored
+        """
+        self.name = name
+        self.params = tuple(params)
+        self.signals = tuple(signals)
+        self.extra_args = tuple(extra_args)
+
+    def param_names(self):
+        return [p[0] for p in self.params]
+
+    def signal_names(self):
+        return [s.name for s in self.signals]
+
+    def init_args(self):
+        """names of the __init__ arguments, parameters first"""
+        return [*self.param_names(), *self.extra_args, *self.signal_names()]
+
+
+def _init_source(spec):
+    """returns the source of the __init__ built for spec"""
+    args = [f"{n}={d!r}" for n, d in spec.params]
+    args += [f"{n}=None" for n in (*spec.extra_args, *spec.signal_names())]
+    lines = [f"def __init__(self, {', '.join(args)}):"]
+    for s in spec.signals:
+        if s.width is None:
+            new = f"Signal({bool(s.default)})"
+        else:
+            lines.append(f"    W = int({s.width})")
+            new = f"Signal(_vec({s.default}, W))"
+        lines.append(f"    self.{s.name} = {s.name} if isinstance({s.name}, _SignalType) else {new}")
+    return "\n".join(lines) + "\n"
+
+
+def _sample_source(spec):
+    """returns the source of the sample() built for spec"""
+    vals = ", ".join(f"int(self.{n}._val)" for n in spec.signal_names())
+    return f"def sample(self):\n    return _Sample({vals})\n"
+
+
+def _drive_source(spec):
+    """returns the source of the drive() built for spec"""
+    names = spec.signal_names()
+    lines = [f"def drive(self, {', '.join(f'{n}=None' for n in names)}):", "    updates = 0"]
+    for n in names:
+        # _next holds the value the signal will have after this cycle
+        lines.append(f"    if {n} is not None and {n} != self.{n}._next:")
+        lines.append(f"        self.{n}.next = {n}")
+        lines.append("        updates += 1")
+    lines.append("    return updates")
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=None)
+def _vec(value, width):
+    """initial intbv of a vector signal, Signal() copies it so one is shared per value and width"""
+    return intbv(value)[width:]
+
+
+def make_intfc(spec):
+    """
+    returns a bundle class for spec
+    sample() - returns the current value of every signal as ints in a namedtuple, the class attribute Sample
+    drive(**values) - assigns .next of the signals named, signals already at that value are left alone,
+                      returns the number of signals assigned
+    """
+    sample_cls = namedtuple(f"{spec.name}_sample", spec.signal_names())
+    namespace = {"Signal": Signal, "_SignalType": _Signal._Signal, "_vec": _vec, "_Sample": sample_cls}
+    src = _init_source(spec) + _sample_source(spec) + _drive_source(spec)
+    exec(compile(src, f"<intfc {spec.name}>", "exec"), namespace)  # noqa: S102
+    attrs = {
+        "__init__": namespace["__init__"],
+        "sample": namespace["sample"],
+        "drive": namespace["drive"],
+        "Sample": sample_cls,
+        "spec": spec,
+        "__module__": __name__,
+    }
+    return type(spec.name, (object,), attrs)
+
+
+AXIS_SPEC = IntfcSpec(
+    "axis",
+    params=[
+        ("DATA_WIDTH", 32),
+        ("USER_WIDTH", 1),
+        ("DEST_WIDTH", 1),
+        ("ID_WIDTH", 1),
+        ("ELEMENT_SIZE_BITS", 8),  # size of element within tdata vector, usually 8 for bytes
+    ],
+    signals=[
+        IntfcSig("tdata", "DATA_WIDTH"),
+        IntfcSig("tkeep", "1 if DATA_WIDTH < 8 else DATA_WIDTH // ELEMENT_SIZE_BITS", "2**W - 1"),
+        IntfcSig("tuser", "USER_WIDTH"),
+        IntfcSig("tdest", "DEST_WIDTH"),
+        IntfcSig("tid", "ID_WIDTH"),
+        IntfcSig("tvalid"),
+        IntfcSig("tready", direction=IN),
+        IntfcSig("tlast"),
+    ],
+    extra_args=["clk", "rst"],
+)
+
+AXI_LITE_SPEC = IntfcSpec(
+    "axi_lite",
+    params=[("AXI_ADDR_WIDTH", 32), ("AXI_ID_WIDTH", 1), ("AXI_DATA_WIDTH", 32)],
+    signals=[
+        IntfcSig("awaddr", "AXI_ADDR_WIDTH"),
+        IntfcSig("awvalid"),
+        IntfcSig("awready", direction=IN),
+        IntfcSig("wdata", "AXI_DATA_WIDTH"),
+        IntfcSig("wstrb", "AXI_DATA_WIDTH // 8"),
+        IntfcSig("wvalid"),
+        IntfcSig("wready", direction=IN),
+        IntfcSig("bresp", 2, direction=IN),
+        IntfcSig("bvalid", direction=IN),
+        IntfcSig("bready"),
+        IntfcSig("araddr", "AXI_ADDR_WIDTH"),
+        IntfcSig("arvalid"),
+        IntfcSig("arready", direction=IN),
+        IntfcSig("rdata", "AXI_DATA_WIDTH", direction=IN),
+        IntfcSig("rresp", 2, direction=IN),
+        IntfcSig("rvalid", direction=IN),
+        IntfcSig("rready"),
+    ],
+)
+
+AXI_SPEC = IntfcSpec(
+    "axi",
+    params=[("AXI_ADDR_WIDTH", 32), ("AXI_ID_WIDTH", 1), ("AXI_DATA_WIDTH", 32)],
+    signals=[
+        IntfcSig("aclk", direction=IN),
+        IntfcSig("aresetn", direction=IN),
+        IntfcSig("awaddr", "AXI_ADDR_WIDTH"),
+        IntfcSig("awlen", 8),
+        IntfcSig("awid", "AXI_ID_WIDTH"),
+        IntfcSig("awsize", 3),
+        IntfcSig("awburst", 2),
+        IntfcSig("awlock"),
+        IntfcSig("awcache", 4),
+        IntfcSig("awprot", 3),
+        IntfcSig("awqos", 4),
+        IntfcSig("awregion", 4),
+        IntfcSig("awvalid"),
+        IntfcSig("awready", direction=IN),
+        IntfcSig("wdata", "AXI_DATA_WIDTH"),
+        IntfcSig("wid", "AXI_ID_WIDTH"),
+        IntfcSig("wstrb", "AXI_DATA_WIDTH // 8", "2**W - 1"),
+        IntfcSig("wlast"),
+        IntfcSig("wvalid"),
+        IntfcSig("wready", direction=IN),
+        IntfcSig("bid", "AXI_ID_WIDTH", direction=IN),
+        IntfcSig("bresp", 2, direction=IN),
+        IntfcSig("bvalid", direction=IN),
+        IntfcSig("bready", default=1),
+        IntfcSig("araddr", "AXI_ADDR_WIDTH"),
+        IntfcSig("arlen", 8),
+        IntfcSig("arid", "AXI_ID_WIDTH"),
+        IntfcSig("arsize", 3),
+        IntfcSig("arburst", 2),
+        IntfcSig("arlock"),
+        IntfcSig("arcache", 4),
+        IntfcSig("arprot", 3),
+        IntfcSig("arvalid"),
+        IntfcSig("arready", direction=IN),
+        IntfcSig("rdata", "AXI_DATA_WIDTH", direction=IN),
+        IntfcSig("rid", "AXI_ID_WIDTH", direction=IN),
+        IntfcSig("rresp", 2, direction=IN),
+        IntfcSig("rlast", direction=IN),
+        IntfcSig("rvalid", direction=IN),
+        IntfcSig("rready"),
+    ],
+)
+
+INTFC_ENTRY_POINT = "veri_quickbench.intfc"
+
+INTFC_SPECS = {}  # interface name -> IntfcSpec
+_INTFC_CLASSES = {}  # interface name -> bundle class
+_intfc_lst = None  # cached get_intfc_lst()
+_intfc_inits = {}  # cached get_intfc_inits()
+_plugins_loaded = False
+
+
+def register_intfc(spec, cls=None, replace=False):
+    """
+    adds an interface type to the registry, returns its bundle class
+    spec - IntfcSpec of the interface
+    cls - bundle class, built with make_intfc(spec) when None
+    replace - if False, registering a name that is already registered raises ValueError
+    """
+    global _intfc_lst  # noqa: PLW0603
+    if spec.name in INTFC_SPECS and not replace:
+        raise ValueError(f"interface {spec.name} is already registered")
+    if cls is None:
+        cls = make_intfc(spec)
+    INTFC_SPECS[spec.name] = spec
+    _INTFC_CLASSES[spec.name] = cls
+    _intfc_lst = None
+    _intfc_inits.pop(spec.name, None)
+    return cls
 
-class axis:
-    def __init__(  # noqa: PLR0912, PLR0913
-        self,
-        DATA_WIDTH=32,
-        USER_WIDTH=1,
-        DEST_WIDTH=1,
-        ID_WIDTH=1,
-        ELEMENT_SIZE_BITS=8,  # size of element within tdata vector, usually 8 for bytes
-        clk=None,
-        rst=None,
-        tdata=None,
-        tkeep=None,
-        tuser=None,
-        tdest=None,
-        tid=None,
-        tvalid=None,
-        tready=None,
-        tlast=None,
-    ):
-        # if isinstance(clk, (_Signal._Signal,)):
-        #     self.aclk = clk
-        # else:
-        #     self.aclk = Signal(bool(0))
-
-        # if isinstance(rst, (_Signal._Signal,)):
-        #     self.aresetn = rst
-        # else:
-        #     self.aresetn = Signal(bool(0))
-
-        if isinstance(tdata, (_Signal._Signal,)):
-            self.tdata = tdata
-        else:
-            self.tdata = Signal(intbv(0)[DATA_WIDTH:])
-
-        if isinstance(tkeep, (_Signal._Signal,)):
-            self.tkeep = tkeep
-        elif DATA_WIDTH < 8:  # noqa: PLR2004
-            self.tkeep = Signal(intbv(1)[1:])
-        else:
-            self.tkeep = Signal(intbv(2 ** int(DATA_WIDTH / ELEMENT_SIZE_BITS) - 1)[(DATA_WIDTH / ELEMENT_SIZE_BITS) :])
-
-        if isinstance(tuser, (_Signal._Signal,)):
-            self.tuser = tuser
-        else:
-            self.tuser = Signal(intbv(0)[USER_WIDTH:])
-
-        if isinstance(tdest, (_Signal._Signal,)):
-            self.tdest = tdest
-        else:
-            self.tdest = Signal(intbv(0)[DEST_WIDTH:])
-
-        if isinstance(tid, (_Signal._Signal,)):
-            self.tid = tid
-        else:
-            self.tid = Signal(intbv(0)[ID_WIDTH:])
-
-        if isinstance(tvalid, (_Signal._Signal,)):
-            self.tvalid = tvalid
-        else:
-            self.tvalid = Signal(bool(0))
-
-        if isinstance(tready, (_Signal._Signal,)):
-            self.tready = tready
-        else:
-            self.tready = Signal(bool(0))
-
-        if isinstance(tlast, (_Signal._Signal,)):
-            self.tlast = tlast
-        else:
-            self.tlast = Signal(bool(0))
-
-
-class axi_lite:
-    def __init__(  # noqa: PLR0912, PLR0913, PLR0915
-        self,
-        AXI_ADDR_WIDTH=32,
-        AXI_ID_WIDTH=1,
-        AXI_DATA_WIDTH=32,
-        awaddr=None,
-        awvalid=None,
-        awready=None,
-        wdata=None,
-        wstrb=None,
-        wvalid=None,
-        wready=None,
-        bresp=None,
-        bvalid=None,
-        bready=None,
-        araddr=None,
-        arvalid=None,
-        arready=None,
-        rdata=None,
-        rresp=None,
-        rvalid=None,
-        rready=None,
-    ):
-        if isinstance(awaddr, (_Signal._Signal,)):
-            self.awaddr = awaddr
-        else:
-            self.awaddr = Signal(intbv(0)[AXI_ADDR_WIDTH:])
-
-        if isinstance(awvalid, (_Signal._Signal,)):
-            self.awvalid = awvalid
-        else:
-            self.awvalid = Signal(bool(0))
-
-        if isinstance(awready, (_Signal._Signal,)):
-            self.awready = awready
-        else:
-            self.awready = Signal(bool(0))
-
-        if isinstance(wdata, (_Signal._Signal,)):
-            self.wdata = wdata
-        else:
-            self.wdata = Signal(intbv(0)[AXI_DATA_WIDTH:])
-
-        if isinstance(wstrb, (_Signal._Signal,)):
-            self.wstrb = wstrb
-        else:
-            self.wstrb = Signal(intbv(0)[(AXI_DATA_WIDTH / 8) :])
-
-        if isinstance(wvalid, (_Signal._Signal,)):
-            self.wvalid = wvalid
-        else:
-            self.wvalid = Signal(bool(0))
-
-        if isinstance(wready, (_Signal._Signal,)):
-            self.wready = wready
-        else:
-            self.wready = Signal(bool(0))
-
-        if isinstance(bresp, (_Signal._Signal,)):
-            self.bresp = bresp
-        else:
-            self.bresp = Signal(intbv(0)[2:])
-
-        if isinstance(bvalid, (_Signal._Signal,)):
-            self.bvalid = bvalid
-        else:
-            self.bvalid = Signal(bool(0))
-
-        if isinstance(bready, (_Signal._Signal,)):
-            self.bready = bready
-        else:
-            self.bready = Signal(bool(0))
-
-        if isinstance(araddr, (_Signal._Signal,)):
-            self.araddr = araddr
-        else:
-            self.araddr = Signal(intbv(0)[AXI_ADDR_WIDTH:])
-
-        if isinstance(arvalid, (_Signal._Signal,)):
-            self.arvalid = arvalid
-        else:
-            self.arvalid = Signal(bool(0))
-
-        if isinstance(arready, (_Signal._Signal,)):
-            self.arready = arready
-        else:
-            self.arready = Signal(bool(0))
-
-        if isinstance(rdata, (_Signal._Signal,)):
-            self.rdata = rdata
-        else:
-            self.rdata = Signal(intbv(0)[AXI_DATA_WIDTH:])
-
-        if isinstance(rresp, (_Signal._Signal,)):
-            self.rresp = rresp
-        else:
-            self.rresp = Signal(intbv(0)[2:])
-
-        if isinstance(rvalid, (_Signal._Signal,)):
-            self.rvalid = rvalid
-        else:
-            self.rvalid = Signal(bool(0))
-
-        if isinstance(rready, (_Signal._Signal,)):
-            self.rready = rready
-        else:
-            self.rready = Signal(bool(0))
-
-
-class axi:
-    def __init__(  # noqa: PLR0912, PLR0913, PLR0915
-        self,
-        AXI_ADDR_WIDTH=32,
-        AXI_ID_WIDTH=1,
-        AXI_DATA_WIDTH=32,
-        aclk=None,
-        aresetn=None,
-        awaddr=None,
-        awlen=None,
-        awid=None,
-        awsize=None,
-        awburst=None,
-        awlock=None,
-        awcache=None,
-        awprot=None,
-        awqos=None,
-        awregion=None,
-        awvalid=None,
-        awready=None,
-        wdata=None,
-        wid=None,
-        wstrb=None,
-        wlast=None,
-        wvalid=None,
-        wready=None,
-        bid=None,
-        bresp=None,
-        bvalid=None,
-        bready=None,
-        araddr=None,
-        arlen=None,
-        arid=None,
-        arsize=None,
-        arburst=None,
-        arlock=None,
-        arcache=None,
-        arprot=None,
-        arvalid=None,
-        arready=None,
-        rdata=None,
-        rid=None,
-        rresp=None,
-        rlast=None,
-        rvalid=None,
-        rready=None,
-    ):
-        if isinstance(aclk, (_Signal._Signal,)):
-            self.aclk = aclk
-        else:
-            self.aclk = Signal(bool(0))
-
-        if isinstance(aresetn, (_Signal._Signal,)):
-            self.aresetn = aresetn
-        else:
-            self.aresetn = Signal(bool(0))
-
-        if isinstance(awaddr, (_Signal._Signal,)):
-            self.awaddr = awaddr
-        else:
-            self.awaddr = Signal(intbv(0)[AXI_ADDR_WIDTH:])
-
-        if isinstance(awlen, (_Signal._Signal,)):
-            self.awlen = awlen
-        else:
-            self.awlen = Signal(intbv(0)[8:])
-
-        if isinstance(awid, (_Signal._Signal,)):
-            self.awid = awid
-        else:
-            self.awid = Signal(intbv(0)[AXI_ID_WIDTH:])
-
-        if isinstance(awsize, (_Signal._Signal,)):
-            self.awsize = awsize
-        else:
-            self.awsize = Signal(intbv(0)[3:])
-
-        if isinstance(awburst, (_Signal._Signal,)):
-            self.awburst = awburst
-        else:
-            self.awburst = Signal(intbv(0)[2:])
-
-        if isinstance(awlock, (_Signal._Signal,)):
-            self.awlock = awlock
-        else:
-            self.awlock = Signal(bool(0))
-
-        if isinstance(awcache, (_Signal._Signal,)):
-            self.awcache = awcache
-        else:
-            self.awcache = Signal(intbv(0)[4:])
-
-        if isinstance(awprot, (_Signal._Signal,)):
-            self.awprot = awprot
-        else:
-            self.awprot = Signal(intbv(0)[3:])
-
-        if isinstance(awqos, (_Signal._Signal,)):
-            self.awqos = awqos
-        else:
-            self.awqos = Signal(intbv(0)[4:])
-
-        if isinstance(awregion, (_Signal._Signal,)):
-            self.awregion = awregion
-        else:
-            self.awregion = Signal(intbv(0)[4:])
-
-        if isinstance(awvalid, (_Signal._Signal,)):
-            self.awvalid = awvalid
-        else:
-            self.awvalid = Signal(bool(0))
-
-        if isinstance(awready, (_Signal._Signal,)):
-            self.awready = awready
-        else:
-            self.awready = Signal(bool(0))
-
-        if isinstance(wdata, (_Signal._Signal,)):
-            self.wdata = wdata
-        else:
-            self.wdata = Signal(intbv(0)[AXI_DATA_WIDTH:])
-
-        if isinstance(wid, (_Signal._Signal,)):
-            self.wid = wid
-        else:
-            self.wid = Signal(intbv(0)[AXI_ID_WIDTH:])
-
-        if isinstance(wstrb, (_Signal._Signal,)):
-            self.wstrb = wstrb
-        else:
-            self.wstrb = Signal(intbv(2 ** (AXI_DATA_WIDTH // 8) - 1)[(AXI_DATA_WIDTH // 8) :])
-
-        if isinstance(wlast, (_Signal._Signal,)):
-            self.wlast = wlast
-        else:
-            self.wlast = Signal(bool(0))
-
-        if isinstance(wvalid, (_Signal._Signal,)):
-            self.wvalid = wvalid
-        else:
-            self.wvalid = Signal(bool(0))
-
-        if isinstance(wready, (_Signal._Signal,)):
-            self.wready = wready
-        else:
-            self.wready = Signal(bool(0))
-
-        if isinstance(bid, (_Signal._Signal,)):
-            self.bid = bid
-        else:
-            self.bid = Signal(intbv(0)[AXI_ID_WIDTH:])
-
-        if isinstance(bresp, (_Signal._Signal,)):
-            self.bresp = bresp
-        else:
-            self.bresp = Signal(intbv(0)[2:])
-
-        if isinstance(bvalid, (_Signal._Signal,)):
-            self.bvalid = bvalid
-        else:
-            self.bvalid = Signal(bool(0))
-
-        if isinstance(bready, (_Signal._Signal,)):
-            self.bready = bready
-        else:
-            self.bready = Signal(bool(1))
-
-        if isinstance(araddr, (_Signal._Signal,)):
-            self.araddr = araddr
-        else:
-            self.araddr = Signal(intbv(0)[AXI_ADDR_WIDTH:])
-
-        if isinstance(arlen, (_Signal._Signal,)):
-            self.arlen = arlen
-        else:
-            self.arlen = Signal(intbv(0)[8:])
-
-        if isinstance(arid, (_Signal._Signal,)):
-            self.arid = arid
-        else:
-            self.arid = Signal(intbv(0)[AXI_ID_WIDTH:])
-
-        if isinstance(arsize, (_Signal._Signal,)):
-            self.arsize = arsize
-        else:
-            self.arsize = Signal(intbv(0)[3:])
-
-        if isinstance(arburst, (_Signal._Signal,)):
-            self.arburst = arburst
-        else:
-            self.arburst = Signal(intbv(0)[2:])
-
-        if isinstance(arlock, (_Signal._Signal,)):
-            self.arlock = arlock
-        else:
-            self.arlock = Signal(bool(0))
 
-        if isinstance(arcache, (_Signal._Signal,)):
-            self.arcache = arcache
-        else:
-            self.arcache = Signal(intbv(0)[4:])
+def unregister_intfc(iface_nm):
+    """removes interface iface_nm from the registry"""
+    global _intfc_lst  # noqa: PLW0603
+    del INTFC_SPECS[iface_nm]
+    del _INTFC_CLASSES[iface_nm]
+    _intfc_lst = None
+    _intfc_inits.pop(iface_nm, None)
 
-        if isinstance(arprot, (_Signal._Signal,)):
-            self.arprot = arprot
-        else:
-            self.arprot = Signal(intbv(0)[3:])
 
-        if isinstance(arvalid, (_Signal._Signal,)):
-            self.arvalid = arvalid
-        else:
-            self.arvalid = Signal(bool(0))
+def _entry_points():
+    from importlib import metadata  # noqa: PLC0415
 
-        if isinstance(arready, (_Signal._Signal,)):
-            self.arready = arready
-        else:
-            self.arready = Signal(bool(0))
+    eps = metadata.entry_points()
+    if hasattr(eps, "select"):
+        return eps.select(group=INTFC_ENTRY_POINT)
+    return eps.get(INTFC_ENTRY_POINT, ())
 
-        if isinstance(rdata, (_Signal._Signal,)):
-            self.rdata = rdata
-        else:
-            self.rdata = Signal(intbv(0)[AXI_DATA_WIDTH:])
 
-        if isinstance(rid, (_Signal._Signal,)):
-            self.rid = rid
-        else:
-            self.rid = Signal(intbv(0)[AXI_ID_WIDTH:])
+def load_intfc_plugins():
+    """registers the interfaces of every installed entry point, only done once"""
+    global _plugins_loaded  # noqa: PLW0603
+    if _plugins_loaded:
+        return
+    _plugins_loaded = True
+    for ep in _entry_points():
+        specs = ep.load()
+        for spec in specs if isinstance(specs, (list, tuple)) else (specs,):
+            register_intfc(spec)
 
-        if isinstance(rresp, (_Signal._Signal,)):
-            self.rresp = rresp
-        else:
-            self.rresp = Signal(intbv(0)[2:])
 
-        if isinstance(rlast, (_Signal._Signal,)):
-            self.rlast = rlast
-        else:
-            self.rlast = Signal(bool(0))
+def get_intfc(iface_nm):
+    """returns the bundle class of interface iface_nm, None when it is not registered"""
+    load_intfc_plugins()
+    return _INTFC_CLASSES.get(iface_nm)
 
-        if isinstance(rvalid, (_Signal._Signal,)):
-            self.rvalid = rvalid
-        else:
-            self.rvalid = Signal(bool(0))
 
-        if isinstance(rready, (_Signal._Signal,)):
-            self.rready = rready
-        else:
-            self.rready = Signal(bool(0))
+axis = register_intfc(AXIS_SPEC)
+axi_lite = register_intfc(AXI_LITE_SPEC)
+axi = register_intfc(AXI_SPEC)
 
 
 def get_intfc_lst(debug=False):
     """
-    returns a list of interfaces in this module
+    returns a tuple of interface name prefixes, ie "axis_", sorted so a name comes before
+    longer names it is the start of, ie "axi_" before "axi_lite_"
     """
-    # get names of all interfaces that are in this module
-    clsmembers = inspect.getmembers(sys.modules[__name__], inspect.isclass)
+    global _intfc_lst  # noqa: PLW0603
+    if not _plugins_loaded:
+        load_intfc_plugins()
+    if _intfc_lst is None:
+        _intfc_lst = tuple(f"{nm}_" for nm in sorted(INTFC_SPECS))
     if debug:
-        print(clsmembers)
-    intfc_lst = [f"{x[0]}_" for x in clsmembers if "intfc" in f"{x[1]}"]
-    return intfc_lst
+        print(_intfc_lst)
+    return _intfc_lst
 
 
 def get_intfc_inits(iface_nm):
@@ -475,15 +343,21 @@ def get_intfc_inits(iface_nm):
 
     Ie. AXI_ADDR_WIDTH, AXI_ID_WIDTH, AXI_DATA_WIDTH
     """
-    clsmembers = inspect.getmembers(sys.modules[__name__], inspect.isclass)
-    for x in clsmembers:
-        if x[0] == iface_nm:
-            return ", ".join(inspect.getfullargspec(x[1].__init__).args[1:])
+    if not _plugins_loaded:
+        load_intfc_plugins()
+    inits = _intfc_inits.get(iface_nm)
+    if inits is None:
+        spec = INTFC_SPECS.get(iface_nm)
+        if spec is None:
+            return None
+        inits = _intfc_inits[iface_nm] = ", ".join(spec.init_args())
+    return inits
 
 
 if __name__ == "__main__":
     # tests
     print(get_intfc_lst())
-
-    clsmembers = inspect.getmembers(sys.modules[__name__], inspect.isclass)
-    intfc_lst = [f"{x[0]}_" for x in clsmembers if "intfc" in f"{x[1]}"]
+    for spec in INTFC_SPECS.values():
+        print(_init_source(spec))
+        print(_sample_source(spec))
+        print(_drive_source(spec))
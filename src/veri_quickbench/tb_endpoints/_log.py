@@ -0,0 +1,174 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Endpoint logging
+
+Endpoints log through the logging module, one logger per xname below
+LOGGER_NAME, so levels can be set per endpoint. Nothing is set up by default:
+warnings still reach stderr through logging's last resort handler, debug
+messages are dropped after a cached level check and frames are only formatted
+once a logger is enabled for them.
+
+log_to_console() and log_to_file() attach handlers that add the simulation
+time to each record, log_to_console() replaces the console handler it
+attached before. The file handlers buffer records and write them in
+batches, the binary one pickles the records without formatting them into
+lines, read_binary_log() reads them back.
+"""
+
+import logging
+import pickle
+from logging.handlers import MemoryHandler
+
+from myhdl import now
+
+LOGGER_NAME = "veri_quickbench.tb_endpoints"
+LOG_FORMAT = "%(simtime)s %(name)s %(levelname)s: %(message)s"
+
+
+def endpoint_logger(xname=None):
+    """returns the logger of endpoint xname, the package logger when xname is None"""
+    if xname is None:
+        return logging.getLogger(LOGGER_NAME)
+    return logging.getLogger(f"{LOGGER_NAME}.{xname}")
+
+
+def set_log_level(level, xname=None):
+    """
+    sets the level of endpoint xname, or of every endpoint when xname is None
+    level - logging level, ie logging.DEBUG or "DEBUG"
+    """
+    endpoint_logger(xname).setLevel(level)
+
+
+class _SimTimeFilter(logging.Filter):
+    def filter(self, record):
+        record.simtime = now()
+        return True
+
+
+def _attach(handler, level, xname):
+    handler.setLevel(level)
+    handler.addFilter(_SimTimeFilter())
+    log = endpoint_logger(xname)
+    log.setLevel(level)
+    log.addHandler(handler)
+    return handler
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """StreamHandler installed by log_to_console(), so a later call can find and replace it"""
+
+
+def log_to_console(level=logging.DEBUG, xname=None):
+    """
+    prints messages of endpoint xname, or of every endpoint when xname is None, to stderr
+    a handler installed by an earlier call for the same xname is replaced, so messages are
+    printed once however often it is called, ie by every generated testbench module imported
+    returns the handler, remove it with endpoint_logger(xname).removeHandler(handler)
+    """
+    log = endpoint_logger(xname)
+    for old in [h for h in log.handlers if isinstance(h, _ConsoleHandler)]:
+        log.removeHandler(old)
+        old.close()
+    handler = _ConsoleHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return _attach(handler, level, xname)
+
+
+class BinaryLogHandler(logging.Handler):
+    def __init__(self, filename, capacity=4096):
+        """
+        Buffers (simtime, logger name, levelno, message) records and pickles them
+        to filename capacity records at a time, see read_binary_log()
+        """
+        super().__init__()
+        self.capacity = capacity
+        self.buffer = []
+        self.stream = open(filename, "wb")
+
+    def emit(self, record):
+        self.buffer.append((getattr(record, "simtime", None), record.name, record.levelno, record.getMessage()))
+        if len(self.buffer) >= self.capacity or record.levelno >= logging.ERROR:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.buffer and self.stream is not None:
+                pickle.dump(self.buffer, self.stream, protocol=pickle.HIGHEST_PROTOCOL)
+                self.stream.flush()
+                self.buffer = []
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            self.flush()
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+        finally:
+            self.release()
+            super().close()
+
+
+class _BufferedFileHandler(MemoryHandler):
+    """MemoryHandler that closes its FileHandler target as well when it is closed"""
+
+    def close(self):
+        # MemoryHandler.close() flushes and then forgets the target
+        target = self.target
+        try:
+            super().close()
+        finally:
+            if target is not None:
+                target.close()
+
+
+def log_to_file(filename, level=logging.DEBUG, xname=None, capacity=4096, binary=False):
+    """
+    writes messages of endpoint xname, or of every endpoint when xname is None, to filename
+    capacity - records buffered between writes, errors are written straight away
+    binary - if True, records are pickled by BinaryLogHandler instead of formatted as text lines
+    returns the handler, buffered records are written when it is closed or at exit
+    """
+    if binary:
+        handler = BinaryLogHandler(filename, capacity=capacity)
+    else:
+        target = logging.FileHandler(filename, mode="w")
+        target.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler = _BufferedFileHandler(capacity, flushLevel=logging.ERROR, target=target)
+    return _attach(handler, level, xname)
+
+
+def read_binary_log(filename):
+    """yields the (simtime, logger name, levelno, message) records written by BinaryLogHandler"""
+    with open(filename, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)  # noqa: S301
+            except EOFError:
+                return
+            yield from batch
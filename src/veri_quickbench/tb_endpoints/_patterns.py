@@ -0,0 +1,271 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Test patterns for AXI-Stream payloads
+
+Patterns produce tdata beats directly as Python ints, the first bit of the
+pattern is bit 0 of the first beat. PRBS sequences are generated a block of
+bits at a time: b[k] = b[k-n] ^ b[k-m] also holds for n, m scaled by any power
+of two (the polynomial squared over GF(2)), so keeping n * 2**j bits of history
+gives m * 2**j new bits with one shift and xor of a big int.
+"""
+
+from ._axis_ep import AXIStreamBeats
+
+# order: m for the ITU-T O.150 polynomials x^order + x^m + 1
+PRBS_TAPS = {7: 6, 9: 5, 11: 9, 15: 14, 20: 3, 23: 18, 29: 27, 31: 28}
+
+
+class PRBS(object):
+    def __init__(self, order=31, seed=None, block_bits=8192):
+        """
+        PRBS generator
+        order - one of PRBS_TAPS, ie 7 for PRBS7 (x^7 + x^6 + 1)
+        seed - initial non zero LFSR state, all ones when None
+        block_bits - approximate number of bits produced per big int step
+        """
+        if order not in PRBS_TAPS:
+            raise ValueError(f"order={order} is not one of the supported PRBS orders {sorted(PRBS_TAPS)}")
+        if seed is None:
+            seed = 2**order - 1
+        if not isinstance(seed, (int,)) or seed <= 0 or seed >= 2**order:
+            raise ValueError(f"seed={seed} must be a non zero {order} bit integer")
+        self.order = order
+        self.taps = PRBS_TAPS[order]
+        # scale >= 8 keeps history and step sizes whole bytes
+        scale = 8
+        while self.taps * scale < block_bits:
+            scale *= 2
+        self._n = order * scale  # bits of history
+        self._m = self.taps * scale  # bits generated per step
+        self._m_mask = 2**self._m - 1
+
+        # fill the history with the unscaled recurrence, taps bits at a time
+        n, m = order, self.taps
+        hist = seed
+        k = order
+        while k < self._n:
+            hist |= (((hist >> (k - n)) ^ (hist >> (k - m))) & (2**m - 1)) << k
+            k += m
+        self._hist = hist & (2**self._n - 1)
+        self._pool = bytearray(self._hist.to_bytes(self._n // 8, "little"))  # generated bytes
+        self._bitpos = 0  # next bit of self._pool to return
+
+    def _step(self):
+        new = (self._hist ^ (self._hist >> (self._n - self._m))) & self._m_mask
+        self._hist = (self._hist >> self._m) | (new << (self._n - self._m))
+        self._pool += new.to_bytes(self._m // 8, "little")
+
+    def bits(self, nbits):
+        """returns the next nbits of the sequence as an int, first bit in bit 0"""
+        end = self._bitpos + nbits
+        while len(self._pool) * 8 < end:
+            self._step()
+        first = self._bitpos >> 3
+        out = int.from_bytes(self._pool[first : (end + 7) >> 3], "little") >> (self._bitpos & 7)
+        self._bitpos = end
+        if first > len(self._pool) // 2:
+            # drop returned bytes once they are half the pool
+            del self._pool[:first]
+            self._bitpos -= first * 8
+        return out & ((1 << nbits) - 1)
+
+    def beats(self, count, data_width):
+        """returns a list of count tdata beats"""
+        return [self.bits(data_width) for _ in range(count)]
+
+
+class CountingPattern(object):
+    def __init__(self, element_size_bits=8, start=0, step=1):
+        """
+        Elements count up by step, wrapping at element_size_bits
+        """
+        self.element_size_bits = element_size_bits
+        self.mask = 2**element_size_bits - 1
+        self.value = start & self.mask
+        self.step = step
+
+    def beats(self, count, data_width):
+        """returns a list of count tdata beats, data_width must be a multiple of element_size_bits"""
+        esize = self.element_size_bits
+        epb = data_width // esize
+        if epb * esize != data_width:
+            raise ValueError(f"data_width={data_width} is not a multiple of element_size_bits={esize}")
+        out = []
+        v = self.value
+        for _ in range(count):
+            if esize == 8 and self.step == 1:  # noqa: PLR2004
+                d = int.from_bytes(bytes((v + i) & 0xFF for i in range(epb)), "little")
+            else:
+                d = 0
+                for i in range(epb):
+                    d |= ((v + i * self.step) & self.mask) << (i * esize)
+            out.append(d)
+            v = (v + epb * self.step) & self.mask
+        self.value = v
+        return out
+
+
+class WalkingOnesPattern(object):
+    def __init__(self, start=0):
+        """
+        A single one bit walks from bit 0 to the top of tdata, one position per beat
+        """
+        self.position = start
+
+    def beats(self, count, data_width):
+        out = []
+        p = self.position % data_width
+        for _ in range(count):
+            out.append(1 << p)
+            p = (p + 1) % data_width
+        self.position = p
+        return out
+
+
+def pattern_frames(pattern, data_width, beats_per_frame, count=None, tdest=0, tid=0, tuser=0):  # noqa: PLR0913
+    """
+    Generator of AXIStreamBeats frames for AXIStreamSource.feed()
+    pattern - PRBS, CountingPattern, WalkingOnesPattern or anything with beats(count, data_width)
+    count - number of frames, None for an endless stream
+    """
+    i = 0
+    while count is None or i < count:
+        yield AXIStreamBeats(pattern.beats(beats_per_frame, data_width), tdest=tdest, tid=tid, tuser=tuser)
+        i += 1
+
+
+class PatternChecker(object):
+    def __init__(self, pattern, data_width=None):
+        """
+        Compares received beats against a fresh copy of a deterministic pattern,
+        for AXIStreamSink(on_beat=...). Only full beats are expected.
+        pattern - CountingPattern, WalkingOnesPattern, PRBS, ... started where the source started
+        """
+        if data_width is None or not isinstance(data_width, (int,)):
+            raise TypeError("data_width must be an integer")
+        self.pattern = pattern
+        self.data_width = data_width
+        self.beats = 0
+        self.errors = 0  # beats that did not match
+
+    def __call__(self, tdata, tkeep, tdest, tid, tuser, tlast):  # noqa: PLR0913
+        self.beats += 1
+        if tdata != self.pattern.beats(1, self.data_width)[0]:
+            self.errors += 1
+
+
+class PRBSChecker(object):
+    def __init__(self, order=31, data_width=None, element_size_bits=8, lock_bits=64, unlock_errors=4):
+        """
+        Self synchronising PRBS checker for AXIStreamSink(on_beat=...)
+        Each received bit is checked against the bits received before it, so the checker
+        locks onto the sequence wherever it starts and recovers after dropped or corrupted data.
+        order - PRBS order, see PRBS_TAPS
+        data_width - width of tdata in bits
+        element_size_bits - size of the element covered by each tkeep bit
+        lock_bits - number of error free bits needed to (re)gain lock
+        unlock_errors - errors within one beat that drop lock, a single flipped bit gives 3 errors
+        errors - bit errors counted while locked
+        resyncs - number of times lock was lost and regained
+        """
+        if order not in PRBS_TAPS:
+            raise ValueError(f"order={order} is not one of the supported PRBS orders {sorted(PRBS_TAPS)}")
+        if data_width is None or not isinstance(data_width, (int,)):
+            raise TypeError("data_width must be an integer")
+        self.order = order
+        self.taps = PRBS_TAPS[order]
+        self.data_width = data_width
+        self.element_size_bits = element_size_bits
+        self.keep_full = 2 ** (data_width // element_size_bits) - 1
+        self.lock_bits = lock_bits
+        self.unlock_errors = unlock_errors
+        self.clear()
+
+    def clear(self):
+        self._hist = 0  # last order bits received
+        self._hist_len = 0
+        self._clean = 0  # error free bits since the last error
+        self.locked = False
+        self.bits = 0
+        self.errors = 0
+        self.resyncs = 0
+        self._was_locked = False
+
+    def __call__(self, tdata, tkeep, tdest, tid, tuser, tlast):  # noqa: PLR0913
+        if tkeep == self.keep_full:
+            nbits = self.data_width
+        else:
+            # kept elements are expected to be the lower elements of the beat
+            nbits = bin(tkeep).count("1") * self.element_size_bits
+            tdata &= (1 << nbits) - 1
+        self.check(tdata, nbits)
+
+    def check(self, data, nbits):  # noqa: PLR0912
+        """checks the next nbits of the received stream, first bit in bit 0 of data"""
+        n = self.order
+        combined = self._hist | (data << self._hist_len)
+        total = self._hist_len + nbits
+        if self._hist_len < n:
+            # not enough history to check the first bits
+            skip = n - self._hist_len
+        else:
+            skip = 0
+        base = self._hist_len - n
+        if skip >= nbits:
+            self._hist = combined
+            self._hist_len = total
+            return
+        # bit k of the stream is checked against bits k-n and k-m
+        if base >= 0:
+            c = combined >> base
+        else:
+            c = combined << -base
+        err = c ^ (c >> (n - self.taps)) ^ (c >> n)
+        err &= ((1 << nbits) - 1) & ~((1 << skip) - 1)
+        nerr = bin(err).count("1")
+        checked = nbits - skip
+        self.bits += checked
+
+        if self.locked:
+            self.errors += nerr
+            if nerr >= self.unlock_errors:
+                self.locked = False
+                self._clean = 0
+            elif nerr:
+                self._clean = nbits - err.bit_length()
+            else:
+                self._clean += checked
+        else:
+            if nerr:
+                self._clean = nbits - err.bit_length()
+            else:
+                self._clean += checked
+            if self._clean >= self.lock_bits:
+                self.locked = True
+                if self._was_locked:
+                    self.resyncs += 1
+                self._was_locked = True
+
+        self._hist = combined >> (total - n)
+        self._hist_len = n
@@ -0,0 +1,260 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+AXI-Stream scoreboard
+
+Expected frames are indexed by their content, so a received frame is matched
+with a dict lookup rather than a walk through the expected list. Each
+(tdest, tid) flow keeps its own ordering queue to tell reordered frames from
+dropped ones. Matched and dropped entries are removed lazily from the queues.
+
+Expected frames with allow_trailing set cannot be hashed, since the received
+frame may carry extra trailing elements. Those are only kept in their flow
+queue and compared with == when a received frame misses the index.
+"""
+
+from collections import OrderedDict, deque
+
+SB_MATCH = "match"
+SB_REORDER = "reorder"
+SB_DUPLICATE = "duplicate"
+SB_UNEXPECTED = "unexpected"
+
+_PENDING = 0
+_MATCHED = 1
+_DROPPED = 2
+
+
+class AXIStreamScoreboardError(Exception):
+    pass
+
+
+def frame_key(frame):
+    """
+    default scoreboard key for an AXIStreamFrame
+    returns (tdest, tid) of the first element and the fields compared by AXIStreamFrame.__eq__
+    """
+    dest = frame.dest[0] if frame.dest else 0
+    tid = frame.tid[0] if frame.tid else 0
+    return (dest, tid), (
+        tuple(frame.data),
+        tuple(frame.keep),
+        tuple(frame.dest),
+        tuple(frame.tid),
+        tuple(frame.user),
+        tuple(frame.last),
+    )
+
+
+class _Entry(object):
+    __slots__ = ("flow", "frame", "key", "seq", "state")
+
+    def __init__(self, seq, flow, key, frame=None):
+        self.seq = seq
+        self.flow = flow
+        self.key = key
+        self.frame = frame  # only kept for allow_trailing frames
+        self.state = _PENDING
+
+
+class AXIStreamScoreboard(object):
+    def __init__(self, ordered=True, window=None, dup_window=1024, key_fn=None, raise_on_error=False):
+        """
+        Matches received AXI-Stream frames against expected frames
+        ordered - if True, frames within a (tdest, tid) flow must arrive in order, expected frames
+                  skipped over are counted as drops straight away
+                - if False, a frame that arrives ahead of earlier expected frames of its flow
+                  is counted as a reorder, the earlier frames stay expected
+        window - when not None, expected frames more than window frames older than the newest
+                 matched frame are expired and counted as drops, this bounds memory
+        dup_window - number of recently matched frames remembered to recognise duplicates
+        key_fn - function returning ((tdest, tid), content) for a frame, see frame_key()
+        raise_on_error - raise AXIStreamScoreboardError on the first drop, duplicate or unexpected frame
+        """
+        self.ordered = ordered
+        self.window = window
+        self.dup_window = dup_window
+        self.key_fn = frame_key if key_fn is None else key_fn
+        self.raise_on_error = raise_on_error
+
+        self._seq = 0
+        self._index = {}  # content key -> deque of entries
+        self._flows = {}  # (tdest, tid) -> deque of entries in expected order
+        self._order = deque()  # all entries in expected order, for window expiry
+        self._recent = OrderedDict()  # recently matched content keys
+        self._newest_match = -1
+        self._trailing = 0  # pending allow_trailing entries
+
+        self.expected = 0
+        self.matched = 0
+        self.drops = 0
+        self.duplicates = 0
+        self.reorders = 0
+        self.unexpected = 0
+        self.last_error = None
+
+    def add_expected(self, frame):
+        """adds a frame that is expected to be received"""
+        flow, content = self.key_fn(frame)
+        key = (flow, content)
+        if getattr(frame, "allow_trailing", False):
+            entry = _Entry(self._seq, flow, None, frame)
+        else:
+            entry = _Entry(self._seq, flow, key)
+            self._index.setdefault(key, deque()).append(entry)
+        self._seq += 1
+        self._flows.setdefault(flow, deque()).append(entry)
+        self._order.append(entry)
+        self.expected += 1
+        if entry.frame is not None:
+            self._trailing += 1
+
+    def pending(self):
+        """number of expected frames that have not been matched or dropped"""
+        return self.expected - self.matched - self.drops
+
+    def _error(self, msg):
+        self.last_error = msg
+        if self.raise_on_error:
+            raise AXIStreamScoreboardError(msg)
+
+    def _settle(self, entry, state):
+        entry.state = state
+        if entry.frame is not None:
+            entry.frame = None
+            self._trailing -= 1
+
+    def _drop(self, entry):
+        self._settle(entry, _DROPPED)
+        # a dropped entry is the oldest pending one of its key and of its flow, so trimming
+        # the settled entries off the front of both queues releases it
+        if entry.key is not None:
+            self._trim(self._index, entry.key)
+        self._trim(self._flows, entry.flow)
+        self.drops += 1
+        self._error(f"expected frame {entry.seq} on flow (tdest, tid)={entry.flow} was dropped")
+
+    @staticmethod
+    def _trim(queues, key):
+        """pops the settled entries at the front of queues[key], deletes the key once it is empty"""
+        q = queues.get(key)
+        if q is None:
+            return
+        while q and q[0].state != _PENDING:
+            q.popleft()
+        if not q:
+            del queues[key]
+
+    def check(self, frame):  # noqa: PLR0912
+        """
+        checks a received frame, returns SB_MATCH, SB_REORDER, SB_DUPLICATE or SB_UNEXPECTED
+        can be used directly as AXIStreamSink(on_frame=scoreboard.check)
+        """
+        flow, content = self.key_fn(frame)
+        key = (flow, content)
+
+        entry = None
+        q = self._index.get(key)
+        while q:
+            e = q.popleft()
+            if e.state == _PENDING:
+                entry = e
+                break
+        if q is not None and not q:
+            del self._index[key]
+        if entry is None and self._trailing:
+            entry = self._match_trailing(flow, frame)
+
+        if entry is None:
+            if key in self._recent:
+                self.duplicates += 1
+                self._error(f"duplicate frame on flow (tdest, tid)={flow}")
+                return SB_DUPLICATE
+            self.unexpected += 1
+            self._error(f"unexpected frame on flow (tdest, tid)={flow}")
+            return SB_UNEXPECTED
+
+        # walk the flow queue up to this entry
+        status = SB_MATCH
+        fq = self._flows[flow]
+        while fq[0].state != _PENDING:
+            fq.popleft()
+        if fq[0] is not entry:
+            if self.ordered:
+                while fq[0] is not entry:
+                    e = fq.popleft()
+                    if e.state == _PENDING:
+                        self._drop(e)
+            else:
+                self.reorders += 1
+                status = SB_REORDER
+
+        if entry.key is not None:
+            self._recent[key] = None
+            if len(self._recent) > self.dup_window:
+                self._recent.popitem(last=False)
+        self._settle(entry, _MATCHED)
+        self.matched += 1
+        self._newest_match = max(self._newest_match, entry.seq)
+        while fq and fq[0].state != _PENDING:
+            fq.popleft()
+        if not fq:
+            del self._flows[flow]
+
+        self._expire()
+        return status
+
+    def _match_trailing(self, flow, frame):
+        """first pending allow_trailing entry of flow that compares equal to frame"""
+        for e in self._flows.get(flow, ()):
+            if e.state == _PENDING and e.frame is not None and e.frame == frame:
+                return e
+        return None
+
+    def _expire(self):
+        """releases settled entries and drops entries outside the window"""
+        while self._order:
+            e = self._order[0]
+            if e.state == _PENDING:
+                if self.window is None or e.seq >= self._newest_match - self.window:
+                    break
+                self._drop(e)
+            self._order.popleft()
+
+    def finish(self):
+        """counts every expected frame that has not been received as dropped"""
+        for e in self._order:
+            if e.state == _PENDING:
+                self._drop(e)
+        self._order.clear()
+        self._index.clear()
+        self._flows.clear()
+
+    def ok(self):
+        return not (self.drops or self.duplicates or self.unexpected)
+
+    def report(self):
+        return (
+            f"expected={self.expected}, matched={self.matched}, pending={self.pending()}, drops={self.drops}, "
+            f"duplicates={self.duplicates}, reorders={self.reorders}, unexpected={self.unexpected}"
+        )
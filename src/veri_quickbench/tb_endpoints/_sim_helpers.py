@@ -22,30 +22,35 @@
 
 
 import inspect
+import logging
 import random
+import sys
+from array import array
 
 from myhdl import StopSimulation, delay, now
 
 from ._axis_ep import AXIStreamFrame
+from ._log import endpoint_logger
+from ._scoreboard import SB_DUPLICATE, SB_UNEXPECTED, AXIStreamScoreboard
 
 
-def wait_axis(sink=None, clk=None, timeout=2000, msg=""):
+def wait_axis(sink=None, clk=None, timeout=2000, msg="", tdest=None, tid=None):  # noqa: PLR0913
     """
     waits for pkt on sink
     sink - AXIStreamSink object
     clk - clock
     timeout - max # of cycles to wait for pkt on sink
     msg - message to print if timeout happens
+    tdest, tid - when not None, waits for a pkt of that tdest and/or tid, see AXIStreamSink.recv()
     """
     i = 0
-    while sink.empty():
+    while sink.empty(tdest=tdest, tid=tid):
         yield clk.posedge
         if not i < timeout:
             raise Exception("Whoops, took too long to receive packet")
         i = i + 1
         if i >= timeout:
-            print(f"Error, timeout waiting for axis @ {now()} : {msg}", flush=True)
-            # sometimes it takes a longer simulation run to get print statements to work...
+            endpoint_logger().error("timeout waiting for axis @ %s : %s", now(), msg)
             yield delay(10000)
             raise StopSimulation
 
@@ -66,7 +71,7 @@ def send_axis(  # noqa: PLR0913
     source - AXIStreamSource object
     data - array of either beats or elements to send
     list_is_beats - boolean - when True, data is beats, else data is elements that need to be constructed into beats
-    debug - boolean - prints axi stream beats when
+    debug - boolean - logs the axi stream beats at DEBUG level, see log_to_console()
     endian - controls placement of element within axi beat
               - 'little' - first data element stored in lower portion of first axi beat
               - 'big' - first data element stored in upper portion of first axi beat
@@ -110,20 +115,18 @@ def send_axis(  # noqa: PLR0913
     if no_tlast:
         frm.last[-1] = 0
     source.send(frm)
-    tdata_i, tkeep_i, tdest_i, tuser_i, tid_i, tlast_i = frm.to_beats()
 
     # TODO: format size of data based on bus widths
-    if debug:
-        print("Axis beats:")
-        print("    tdata:")
-        for b in tdata_i:
-            print(f"        {b:0{frm.elements_per_beat * frm.element_size_bits // 4}x}")
-        print("    tkeep:")
-        for b in tkeep_i:
-            print(f"        {b:0{frm.elements_per_beat // frm.element_size_bits}x}")
-        print("    tuser:")
-        for b in tuser_i:
-            print(f"        {b:01x}")
+    log = endpoint_logger()
+    if debug and log.isEnabledFor(logging.DEBUG):
+        tdata_i, tkeep_i, tdest_i, tuser_i, tid_i, tlast_i = frm.to_beats()
+        lines = ["Axis beats:", "    tdata:"]
+        lines += [f"        {b:0{frm.elements_per_beat * frm.element_size_bits // 4}x}" for b in tdata_i]
+        lines.append("    tkeep:")
+        lines += [f"        {b:0{frm.elements_per_beat // frm.element_size_bits}x}" for b in tkeep_i]
+        lines.append("    tuser:")
+        lines += [f"        {b:01x}" for b in tuser_i]
+        log.debug("%s", "\n".join(lines))
 
     return frm
 
@@ -155,8 +158,7 @@ def checker(eq, msg, maxdelay=100000):
         # producing messages.  Want stuff below to be last
         # at console :)
         yield delay(maxdelay)
-        print(msg)
-        print("Simulation Error.  Look at {}ns in wave file :) !!!".format(simtime))
+        endpoint_logger().error("%s\nSimulation Error.  Look at %sns in wave file :) !!!", msg, simtime)
         raise StopSimulation
 
 
@@ -230,13 +232,16 @@ def send_axis_packets(  # noqa: PLR0913
 def chk_axis_packets(axis_sink, exp_lst, clk, dropped_pkt, sim_max_wait=1000):
     """
     checks a bunch of packets
+    exp_lst - expected AXIStreamFrame list, frames are matched per (tdest, tid) flow with AXIStreamScoreboard
+    dropped_pkt - signal high for each packet the DUT reports as dropped, expected frames that
+                  never arrive are only an error when there are more of them than reported drops
     """
+    sb = AXIStreamScoreboard(ordered=True)
+    for exp_frame in exp_lst:
+        sb.add_expected(exp_frame)
     simtime = 0
     sdrops = 0  # drops observed on slave interface
-    mdrops = 0  # drops observed on master interface
-    packets_sent = len(exp_lst)
-    packets_received = 0
-    while packets_sent > (packets_received + sdrops) and simtime < sim_max_wait:
+    while sb.expected > (sb.matched + sdrops) and simtime < sim_max_wait:
         simtime += 1
         if not simtime < sim_max_wait:
             raise Exception("Error: waiting for packet.")
@@ -244,82 +249,180 @@ def chk_axis_packets(axis_sink, exp_lst, clk, dropped_pkt, sim_max_wait=1000):
         if not axis_sink.empty():
             simtime = 0
             rx_frame = axis_sink.recv()
-            exp_frame = exp_lst.pop(0)
-            packets_received += 1
-            rx_frame.repr_items = -1
-            exp_frame.repr_items = -1
-            # print('Received frame:', rx_frame)
-            # print('Expected frame:', exp_frame)
-            # print(rx_frame==exp_frame)
-
-            # keep poppin from exp_lst until expected packet found or
-            # exp_lst empty or mdrops > sdrops
-            while exp_frame != rx_frame:
-                mdrops += 1
-                exp_frame.repr_items = -1
-                # print("dropped", exp_frame)
+            status = sb.check(rx_frame)
+            # sb.drops are the drops observed on the master interface
+            if status in (SB_DUPLICATE, SB_UNEXPECTED) or sb.drops > sdrops:
+                rx_frame.repr_items = -1
                 msg = "Simulation Error.  Look at {}ns in wave file :) !!!".format(now())
-                msg += "\nReceived:{}\n\nExpected:{}\n".format(rx_frame, exp_frame)
-                msg += "Error: Drops on slave: {}, Drops on master: {}".format(sdrops, mdrops)
-                if not exp_lst:
-                    raise Exception(msg)  # exp_lst should not be empty here, last entry bad?
-                exp_frame = exp_lst.pop(0)
-                if not (sdrops >= mdrops):
-                    raise Exception(msg)
+                msg += "\nReceived ({}):{}\n".format(status, rx_frame)
+                msg += "Error: Drops on slave: {}, Drops on master: {}\n".format(sdrops, sb.drops)
+                msg += sb.report()
+                raise Exception(msg)
 
             # done?
-            if not exp_lst:
+            if not sb.pending():
                 return
 
         if dropped_pkt:
-            print("d", end="", flush=True)  # dropped packet
+            endpoint_logger().debug("dropped packet")
             sdrops += 1
 
         yield clk.posedge
 
 
-def beats2bytes(adr, data, data_bits):
+# array typecode for each machine word size, used to pack beats without a per byte loop
+_ARRAY_CODES = {}
+for _code in "BHILQ":
+    _ARRAY_CODES.setdefault(array(_code).itemsize, _code)
+_WORD = max(_ARRAY_CODES)
+
+
+def _beat_bytes(data_bits):
+    if data_bits < 1:
+        raise ValueError(f"data_bits={data_bits} must be >= 1")
+    return (data_bits + 7) // 8
+
+
+def _restride(buf, count, src, dst):
+    """copies count records of src bytes to records of dst bytes, truncating or zero padding each"""
+    out = bytearray(count * dst)
+    for j in range(min(src, dst)):
+        out[j::dst] = buf[j::src]
+    return out
+
+
+def _reverse_records(buf, size):
+    out = bytearray(len(buf))
+    for j in range(size):
+        out[j::size] = buf[size - 1 - j :: size]
+    return out
+
+
+def beats2buffer(data, data_bits, endian="little"):
+    """
+    Packs a list of beats into one bytes object, each beat takes (data_bits + 7) // 8 bytes
+    data_bits - any beat width in bits
+    endian - byte order within each beat
+    """
+    nbytes = _beat_bytes(data_bits)
+    if not isinstance(data, (list, tuple)):
+        data = list(data)
+    if data and not isinstance(data[0], int):
+        data = [int(d) for d in data]  # ie intbv beats
+    if nbytes in _ARRAY_CODES:
+        a = array(_ARRAY_CODES[nbytes], data)
+        if endian != sys.byteorder:
+            a.byteswap()
+        return a.tobytes()
+    if nbytes > _WORD:
+        # int.to_bytes is one C call per beat, splitting wide beats into machine words is slower
+        return b"".join([d.to_bytes(nbytes, endian) for d in data])
+    if data and max(data) >> (nbytes * 8):
+        raise OverflowError(f"beat wider than data_bits={data_bits}")
+    # pack each beat into the next larger machine word, then cut each beat to nbytes
+    size = min(k for k in _ARRAY_CODES if k > nbytes)
+    a = array(_ARRAY_CODES[size], data)
+    if sys.byteorder != "little":
+        a.byteswap()
+    buf = _restride(a.tobytes(), len(data), size, nbytes)
+    return bytes(_reverse_records(buf, nbytes) if endian == "big" else buf)
+
+
+def buffer2beats(buf, data_bits, endian="little"):
+    """
+    Unpacks a bytes like buffer into a list of beats, the inverse of beats2buffer
+    a trailing partial beat is zero padded
+    """
+    nbytes = _beat_bytes(data_bits)
+    rem = len(buf) % nbytes
+    if rem:
+        buf = bytes(buf) + bytes(nbytes - rem)
+    if nbytes in _ARRAY_CODES:
+        a = array(_ARRAY_CODES[nbytes])
+        a.frombytes(buf)
+        if endian != sys.byteorder:
+            a.byteswap()
+        return a.tolist()
+    if nbytes > _WORD:
+        mv = memoryview(buf)
+        return [int.from_bytes(mv[i : i + nbytes], endian) for i in range(0, len(mv), nbytes)]
+    count = len(buf) // nbytes
+    if endian == "big":
+        buf = _reverse_records(buf, nbytes)
+    size = min(k for k in _ARRAY_CODES if k > nbytes)
+    a = array(_ARRAY_CODES[size])
+    a.frombytes(bytes(_restride(buf, count, nbytes, size)))
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tolist()
+
+
+def beats2ranges(adr, data, data_bits, endian="little"):
+    """
+    Converts arrays of adr and data beats into a list of (start address, bytes) ranges,
+    beats at consecutive addresses are merged into one range
+    """
+    nbytes = _beat_bytes(data_bits)
+    buf = beats2buffer(data, data_bits, endian)
+    return [(start, buf[rng.start * nbytes : rng.stop * nbytes]) for start, rng in _adr_ranges(adr, nbytes)]
+
+
+def _adr_ranges(adr, step):
+    """returns (start address, range of indexes) for each run of adr increasing by step"""
+    out = []
+    start = 0
+    n = len(adr)
+    while start < n:
+        # try the whole remaining run first, it is usually contiguous
+        end = n
+        first = adr[start]
+        if adr[start:end] != list(range(first, first + (end - start) * step, step)):
+            end = start + 1
+            while end < n and adr[end] == adr[end - 1] + step:
+                end += 1
+        out.append((adr[start], range(start, end)))
+        start = end
+    return out
+
+
+def beats2bytes(adr, data, data_bits, endian="little"):
     """
     Converts arrays of adr and data where data is 16, 24, 32 etc bit integers (or lists of)
     data_bits - # bits used for each element in data
+    returns per byte address and data lists, see beats2ranges() for a compact form
     TODO: make this work on data when data elements are bursts :)
     """
+    nbytes = int(data_bits / 8)
+    try:
+        buf = beats2buffer(data, nbytes * 8, endian)
+    except OverflowError:
+        mask = 2 ** (nbytes * 8) - 1
+        buf = beats2buffer([int(d) & mask for d in data], nbytes * 8, endian)
     adr_exp = []
-    data_exp = []
-    for i, d in enumerate(data):
-        for b in range(int(data_bits / 8)):
-            adr_exp.append(adr[i] + b)
-            data_exp.append((d >> (8 * b)) & 0xFF)
-    return adr_exp, data_exp
+    for start, rng in _adr_ranges(adr[: len(data)], nbytes):
+        adr_exp.extend(range(start, start + len(rng) * nbytes))
+    return adr_exp, list(buf)
 
 
-def bytestobeats(adr, data, data_bits):
+def bytestobeats(adr, data, data_bits, endian="little"):
     """
     Converts arrays of adr and data where data is an 8 bit integer
     to an array of 16, 24, 32 etc bit integers
     data_bits - # bits used for each element in data output array
     """
-    adr_exp = []
-    data_exp = []
-    for i in range(0, len(data), int(data_bits / 8)):
-        adr_exp.append(adr[i])
-        d = 0
-        for b in range(int(data_bits / 8)):
-            d = d + (data[i + b] << (b * 8))
-        data_exp.append(d)
-    return adr_exp, data_exp
+    nbytes = int(data_bits / 8)
+    whole = len(data) - len(data) % nbytes
+    data_exp = buffer2beats(bytes(data[:whole]), nbytes * 8, endian)
+    return list(adr[0:whole:nbytes]), data_exp
 
 
-def beats2bytearray(data, num_bytes, data_bits):
+def beats2bytearray(data, num_bytes, data_bits, endian="little"):
     """
     Converts arrays of data where data is 16, 24, 32 etc bit integers (or lists of)
     data_bits - # bits used for each element in data
     TODO: make this work on data when data elements are bursts :)
     """
-    ba = bytearray()
-    for d in data:
-        ba.extend(d.to_bytes(int(data_bits / 8), byteorder="little"))
-    return ba[:num_bytes]
+    return bytearray(memoryview(beats2buffer(data, int(data_bits / 8) * 8, endian))[:num_bytes])
 
 
 def axi4_wait_read_data(axi4, axi4clk, adr, len_beats, sim_max_wait=1000):
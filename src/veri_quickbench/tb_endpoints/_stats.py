@@ -0,0 +1,132 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+AXI-Stream endpoint statistics
+
+Counters and fixed size histograms updated by AXIStreamSource and
+AXIStreamSink when they are given a stats object. Frame latency from source
+enqueue to sink arrival is kept by a FrameLatencyTracker shared by both ends,
+its send times live in a fixed size ring indexed by frame id.
+"""
+
+from myhdl import now
+
+from ._axi_monitor import AXILatencyHistogram
+
+
+class FrameLatencyTracker(object):
+    def __init__(self, size=4096, bins=32, bin_width=100, id_fn=None):
+        """
+        Matches frames sent by an AXIStreamSource to frames received by an AXIStreamSink
+        size - number of frames that can be in flight, older send times are overwritten
+        bins, bin_width - latency histogram in simulation time units, see AXILatencyHistogram
+        id_fn - returns an integer frame id for a frame, ie lambda f: f.data[0]
+              - when None, frames are numbered in the order they are sent and received
+        """
+        if not isinstance(size, (int,)) or size < 1:
+            raise ValueError(f"size={size} must be an integer >= 1")
+        self.size = size
+        self.id_fn = id_fn
+        self.latency = AXILatencyHistogram(bins=bins, bin_width=bin_width)
+        self._ids = [-1] * size
+        self._times = [0] * size
+        self._next_sent = 0
+        self._next_received = 0
+        self.unmatched = 0  # received frames with no send time
+
+    def sent(self, frame):
+        frame_id = self._next_sent if self.id_fn is None else self.id_fn(frame)
+        self._next_sent += 1
+        slot = frame_id % self.size
+        self._ids[slot] = frame_id
+        self._times[slot] = now()
+
+    def received(self, frame):
+        frame_id = self._next_received if self.id_fn is None else self.id_fn(frame)
+        self._next_received += 1
+        slot = frame_id % self.size
+        if self._ids[slot] != frame_id:
+            self.unmatched += 1
+            return
+        self._ids[slot] = -1
+        self.latency.add(now() - self._times[slot])
+
+
+class AXIStreamStats(object):
+    def __init__(self, bins=32, bin_width=4, tracker=None):
+        """
+        Statistics for one AXIStreamSource or AXIStreamSink
+        bins, bin_width - size of the cycle histograms, see AXILatencyHistogram
+        tracker - optional FrameLatencyTracker shared by the source and the sink of a path
+        cycles - clock cycles out of reset
+        busy - cycles with tvalid high
+        beats - beats transferred
+        stalls - cycles with tvalid high and tready low
+        frames - frames transferred
+        queue_latency - source only, cycles from send() to the first beat being accepted
+        frame_cycles - cycles from the first to the last beat of each frame
+        signal_updates - source only, bus signals assigned while driving beats
+        signal_skips - source only, bus signal assignments left out because the value did not change
+        """
+        self.tracker = tracker
+        self.queue_latency = AXILatencyHistogram(bins=bins, bin_width=bin_width)
+        self.frame_cycles = AXILatencyHistogram(bins=bins, bin_width=bin_width)
+        self.clear()
+
+    def clear(self):
+        self.cycles = 0
+        self.busy = 0
+        self.beats = 0
+        self.stalls = 0
+        self.frames = 0
+        self.signal_updates = 0
+        self.signal_skips = 0
+        self.queue_latency.clear()
+        self.frame_cycles.clear()
+
+    def utilization(self):
+        """beats per cycle"""
+        return self.beats / self.cycles if self.cycles else 0.0
+
+    def report(self, xname=None):
+        """returns a printable summary"""
+        name = "" if xname is None else f"{xname}: "
+        lines = [
+            f"{name}cycles={self.cycles}, beats={self.beats} ({self.utilization():.3f}/cycle), "
+            f"frames={self.frames}, stalls={self.stalls}, busy={self.busy}",
+            f"  frame cycles min/mean/p99/max {self.frame_cycles.min}/{self.frame_cycles.mean():.1f}/"
+            f"{self.frame_cycles.percentile(99)}/{self.frame_cycles.max}",
+        ]
+        if self.queue_latency.n:
+            q = self.queue_latency
+            lines.append(f"  queue latency min/mean/p99/max {q.min}/{q.mean():.1f}/{q.percentile(99)}/{q.max}")
+        if self.signal_updates or self.signal_skips:
+            lines.append(f"  signal updates={self.signal_updates}, skipped={self.signal_skips}")
+        if self.tracker is not None and self.tracker.latency.n:
+            t = self.tracker.latency
+            lines.append(
+                f"  frame latency min/mean/p99/max {t.min}/{t.mean():.1f}/{t.percentile(99)}/{t.max}, "
+                f"unmatched={self.tracker.unmatched}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,239 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Pause signal traffic shaping
+
+A PauseEngine drives every pause signal of one clock domain from a single
+process. Pause patterns are generated a batch of cycles at a time as int
+bitmaps, bit i set when the signal is paused on cycle i of the batch. Each
+signal has its own random.Random stream seeded from the engine seed and the
+signal name, so adding a signal does not change the pattern of the others.
+"""
+
+import random
+
+from myhdl import Signal, block, instance
+
+
+class PauseProfile(object):
+    """Base class for pause profiles, subclasses implement fill(rng, n)"""
+
+    def fill(self, rng, n):
+        """returns an n bit int, bit i set to pause on cycle i"""
+        raise NotImplementedError
+
+
+class RandomPause(PauseProfile):
+    # bits of probability used, so probability is rounded to 1/2**16
+    PRECISION = 16
+
+    def __init__(self, probability=0.25):
+        """
+        Pauses each cycle independently with the given probability
+        """
+        if not 0 <= probability <= 1:
+            raise ValueError(f"probability={probability} must be between 0 and 1")
+        self.probability = probability
+        self._p = round(probability * 2**self.PRECISION)
+
+    def fill(self, rng, n):
+        p = self._p
+        if p >= 2**self.PRECISION:
+            return 2**n - 1
+        # bit i of the result is 1 when a uniform PRECISION bit number is below p,
+        # compared for all n bits at once from the lsb of p up
+        out = 0
+        for k in range(self.PRECISION):
+            if (p >> k) & 1:
+                out |= rng.getrandbits(n)
+            else:
+                out &= rng.getrandbits(n)
+        return out
+
+
+class DutyCyclePause(PauseProfile):
+    def __init__(self, period=4, pause_cycles=1, phase=0):
+        """
+        Pauses for pause_cycles out of every period cycles, starting phase cycles into the period
+        """
+        if not isinstance(period, (int,)) or period < 1:
+            raise ValueError(f"period={period} must be an integer >= 1")
+        if not 0 <= pause_cycles <= period:
+            raise ValueError(f"pause_cycles={pause_cycles} must be between 0 and period={period}")
+        self.period = period
+        self.pause_cycles = pause_cycles
+        self.phase = phase % period
+        self._pos = 0
+        pattern = (2**pause_cycles - 1) << self.phase
+        self._pattern = (pattern | (pattern >> period)) & (2**period - 1)
+
+    def fill(self, rng, n):
+        reps = (n + self._pos) // self.period + 1
+        # repeat the pattern by doubling, then skip the cycles already used
+        bits = self._pattern
+        width = self.period
+        while width < reps * self.period:
+            bits |= bits << width
+            width *= 2
+        out = (bits >> self._pos) & (2**n - 1)
+        self._pos = (self._pos + n) % self.period
+        return out
+
+
+class BurstIdlePause(PauseProfile):
+    def __init__(self, burst_mean=16, idle_mean=4):
+        """
+        Alternates bursts without pause and idle periods paused,
+        lengths are geometric with the given mean in cycles
+        """
+        if burst_mean < 1 or idle_mean < 1:
+            raise ValueError("burst_mean and idle_mean must be >= 1")
+        self.burst_mean = burst_mean
+        self.idle_mean = idle_mean
+        self._idle = False
+        self._left = None  # cycles left in the current burst or idle period
+
+    def _length(self, rng, mean):
+        if mean == 1:
+            return 1
+        return 1 + int(rng.expovariate(1 / (mean - 1)) + 0.5)
+
+    def fill(self, rng, n):
+        if self._left is None:
+            self._left = self._length(rng, self.burst_mean)
+        out = 0
+        pos = 0
+        while pos < n:
+            run = min(self._left, n - pos)
+            if self._idle:
+                out |= (2**run - 1) << pos
+            pos += run
+            self._left -= run
+            if not self._left:
+                self._idle = not self._idle
+                self._left = self._length(rng, self.idle_mean if self._idle else self.burst_mean)
+        return out
+
+
+class TokenBucketPause(PauseProfile):
+    def __init__(self, rate=0.5, burst=8, inner=None):
+        """
+        Limits the unpaused cycles to rate per cycle on average with bursts of up to burst cycles
+        a token is added every 1/rate cycles up to burst, each unpaused cycle uses one token
+        inner - optional profile whose pauses are applied as well, ie RandomPause
+        """
+        if not 0 < rate <= 1:
+            raise ValueError(f"rate={rate} must be > 0 and <= 1")
+        if burst < 1:
+            raise ValueError(f"burst={burst} must be >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.inner = inner
+        self._tokens = float(burst)
+
+    def fill(self, rng, n):
+        inner = self.inner.fill(rng, n) if self.inner is not None else 0
+        out = 0
+        tokens = self._tokens
+        rate = self.rate
+        burst = self.burst
+        for i in range(n):
+            tokens = min(tokens + rate, burst)
+            if tokens >= 1 and not (inner >> i) & 1:
+                tokens -= 1
+            else:
+                out |= 1 << i
+        self._tokens = tokens
+        return out
+
+
+class PauseEngine(object):
+    def __init__(self, seed=None, batch=1024):
+        """
+        Drives the pause signals of one clock domain
+        seed - base seed for every signal's random stream, None for a random seed
+        batch - number of cycles generated per pause signal at a time,
+                the pattern for a given seed also depends on batch
+        """
+        if not isinstance(batch, (int,)) or batch < 1:
+            raise ValueError(f"batch={batch} must be an integer >= 1")
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.batch = batch
+        self.channels = []  # [name, signal, profile, rng]
+        self.has_logic = False
+
+    def add(self, name, profile=None, signal=None):
+        """
+        adds a pause signal, returns the signal
+        name - unique name, also selects the random stream of the signal
+        profile - PauseProfile, RandomPause(0.25) when None
+        signal - existing Signal(bool) to drive, a new one is created when None
+        """
+        if self.has_logic:
+            raise RuntimeError("signals must be added before create_logic() is called")
+        if any(c[0] == name for c in self.channels):
+            raise ValueError(f"pause signal {name} has already been added")
+        if profile is None:
+            profile = RandomPause()
+        if signal is None:
+            signal = Signal(bool(0))
+        self.channels.append([name, signal, profile, random.Random(f"{self.seed}:{name}")])  # noqa: S311
+        return signal
+
+    def pattern(self, name, n):
+        """returns the next n cycles of the named signal as a list of bools, without a simulation"""
+        for c in self.channels:
+            if c[0] == name:
+                return _bits(c[2].fill(c[3], n), n)
+        raise KeyError(name)
+
+    @block
+    def create_logic(self, clk):
+        """
+        one process setting every pause signal on each rising edge of clk
+        """
+        if self.has_logic:
+            raise RuntimeError("create_logic() has already been called on this instance.")
+        self.has_logic = True
+        batch = self.batch
+        channels = self.channels
+
+        @instance
+        def logic():
+            while True:
+                patterns = [_bits(profile.fill(rng, batch), batch) for _, _, profile, rng in channels]
+                for i in range(batch):
+                    for (_, sig, _, _), p in zip(channels, patterns):
+                        if sig.val != p[i]:
+                            sig.next = p[i]
+                    yield clk.posedge
+
+        return logic
+
+
+def _bits(value, n):
+    """n bit int as a list of bools, bit 0 first"""
+    return [c == "1" for c in reversed(format(value, f"0{n}b"))] if n else []
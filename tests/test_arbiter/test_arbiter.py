@@ -0,0 +1,88 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from veri_quickbench.tb_endpoints import (
+    AXIStreamArbiter,
+    RandomBurstArbiter,
+    RoundRobinArbiter,
+    WeightedArbiter,
+)
+
+
+def schedule(arb, n):
+    return [arb.select() for _ in range(n)]
+
+
+def test_round_robin():
+    arb = RoundRobinArbiter()
+    arb.update([(0, 0), (1, 0), (2, 0)])
+    assert schedule(arb, 6) == [0, 1, 2, 0, 1, 2]
+    # a finished frame drops out, the turn carries on
+    arb.update([(0, 0), (2, 0)])
+    assert schedule(arb, 3) == [1, 0, 1]
+
+
+def test_weighted():
+    arb = WeightedArbiter(weights={(0, 0): 3})
+    arb.update([(0, 0), (1, 0)])
+    s = schedule(arb, 8)
+    assert s.count(0) == 6  # noqa: PLR2004
+    assert s.count(1) == 2  # noqa: PLR2004
+    # smooth, the heavy flow does not take all its beats in one go
+    assert s[:4] == [0, 0, 1, 0]
+    with pytest.raises(ValueError):
+        WeightedArbiter(weights={(0, 0): 0}).update([(0, 0)])
+
+
+def test_random_burst():
+    with pytest.raises(ValueError):
+        RandomBurstArbiter(max_burst=0)
+    flows = [(0, 0), (1, 0), (2, 0)]
+    a = RandomBurstArbiter(max_burst=4, seed=5)
+    b = RandomBurstArbiter(max_burst=4, seed=5)
+    a.update(flows)
+    b.update(flows)
+    sa = schedule(a, 200)
+    assert sa == schedule(b, 200)
+    assert set(sa) == {0, 1, 2}
+    runs = []
+    for i, x in enumerate(sa):
+        if i and x == sa[i - 1]:
+            runs[-1] += 1
+        else:
+            runs.append(1)
+    assert max(runs) > 1
+    # a burst follows its frame when other frames finish
+    a = RandomBurstArbiter(max_burst=100, seed=0)
+    a.update(flows)
+    i = a.select()
+    a.update([f for j, f in enumerate(flows) if j < i] + [flows[i]])
+    assert a.select() == i
+
+
+def test_base():
+    arb = AXIStreamArbiter()
+    arb.update([(0, 0)])
+    with pytest.raises(NotImplementedError):
+        arb.select()
@@ -0,0 +1,194 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+import random
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    AXILatencyHistogram,
+    AXIMaster,
+    AXIMonitor,
+    AXISlave,
+    axi,
+)
+
+
+def test_latency_histogram():
+    with pytest.raises(ValueError):
+        AXILatencyHistogram(bins=0)
+    with pytest.raises(ValueError):
+        AXILatencyHistogram(bin_width=0)
+    h = AXILatencyHistogram(bins=4, bin_width=10)
+    for lat in (1, 5, 12, 35, 1000):
+        h.add(lat)
+    assert h.counts == [2, 1, 0, 2]
+    assert (h.n, h.min, h.max) == (5, 1, 1000)
+    assert h.percentile(40) == 9  # noqa: PLR2004
+    assert h.percentile(100) == 1000  # noqa: PLR2004
+    h.clear()
+    assert h.counts == [0, 0, 0, 0]
+    assert h.n == 0
+
+
+def tb(mon, AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=32, AXI_ID_WIDTH=2, simlen=10):
+    """
+    Testbench for AXIMonitor watching AXIMaster and AXISlave
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axi_sigs = axi(AXI_ADDR_WIDTH=AXI_ADDR_WIDTH, AXI_DATA_WIDTH=AXI_DATA_WIDTH, AXI_ID_WIDTH=AXI_ID_WIDTH)
+
+        PAUSE_FACTOR = 4  # will pause 1/PAUSE_FACTOR
+        pause = [Signal(bool(0)) for _ in range(5)]
+
+        @instance
+        def randPause():
+            while 1:
+                for p in pause:
+                    p.next = random.randint(1, PAUSE_FACTOR) == 1
+                yield clk.posedge
+
+        axi_m = AXIMaster(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH)
+        axi_m_logic = axi_m.create_logic(clk, rst, axi_sigs, *pause, stats=mon)  # noqa: F841
+        axi_s = AXISlave(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH)
+        axi_s_logic = axi_s.create_logic(clk, rst, axi_sigs, *pause)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            yield clk.posedge
+
+            bpb = AXI_DATA_WIDTH // 8
+            for i in range(simlen):
+                axi_m.issue_write(addr=i * 64, data=[i] * (bpb * (i + 1)), tid=i % 2**AXI_ID_WIDTH)
+                while not axi_m.write_empty():
+                    yield clk.posedge
+            for i in range(simlen):
+                axi_m.issue_read(addr=i * 64, len_beats=i + 1, arid=i % 2**AXI_ID_WIDTH)
+                while not axi_m.read_empty():
+                    yield clk.posedge
+            for _ in range(50):
+                yield clk.posedge
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def test_aximonitor(caplog):
+    with pytest.raises(ValueError):
+        AXIMonitor(interval=0)
+    simlen = 10
+    bpb = 4
+    mon = AXIMonitor(bins=16, bin_width=2, interval=200)
+    with caplog.at_level(logging.WARNING):
+        tb(mon, AXI_DATA_WIDTH=bpb * 8, simlen=simlen)
+    # interval reports are shown at the WARNING level the generated testbench uses
+    assert any(r.levelno == logging.WARNING and "bytes" in r.getMessage() for r in caplog.records)
+    print(mon.report("axi mon"))
+
+    total = bpb * sum(range(1, simlen + 1))
+    assert mon.wr_bytes == total
+    assert mon.rd_bytes == total
+    assert mon.beats["aw"] == mon.beats["b"] == mon.beats["ar"] == simlen
+    assert mon.beats["w"] == mon.beats["r"] == sum(range(1, simlen + 1))
+    assert mon.wr_latency.n == mon.rd_latency.n == simlen
+    assert mon.wr_max_outstanding == mon.rd_max_outstanding == 1
+    assert sorted(mon.wr_done) == sorted(mon.rd_done) == [0, 1, 2, 3]
+    assert sum(mon.wr_done.values()) == sum(mon.rd_done.values()) == simlen
+    assert mon.wr_id_bytes[1] == mon.rd_id_bytes[1] == bpb * (2 + 6 + 10)
+    assert 0 < mon.wr_bytes_per_cycle() < bpb
+    assert mon.stalls("w") == mon.busy["w"] - mon.beats["w"]
+
+
+def test_aximonitor_ids():
+    """two outstanding writes on one id of a 32 bit id bus, each response is credited with its own burst"""
+    wid = 0xDEADBEEF
+    mon = AXIMonitor()
+    seen = []
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axi_sigs = axi(AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=32, AXI_ID_WIDTH=32)
+        mon_logic = mon.create_logic(clk, rst, axi_sigs)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        steps = [{"awvalid": 1, "awready": 1, "awid": wid}] * 2
+        steps += [
+            {"wvalid": 1, "wready": 1, "wstrb": strb, "wlast": last} for strb, last in ((0xF, 0), (0xF, 1), (0x3, 1))
+        ]
+        steps += [{"bvalid": 1, "bready": 1, "bid": wid}, {}] * 2
+
+        @instance
+        def tbstim():
+            yield clk.posedge
+            for values in steps:
+                for name, v in values.items():
+                    getattr(axi_sigs, name).next = v
+                yield clk.posedge
+                yield delay(1)
+                for name in values:
+                    getattr(axi_sigs, name).next = 0
+                if "bid" in values:
+                    seen.append((mon.wr_done[wid], mon.wr_id_bytes[wid], mon.wr_latency.n))
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+    assert seen == [(1, 8, 1), (2, 10, 2)]
+    assert mon.wr_max_outstanding == 2  # noqa: PLR2004
+    assert f"id {wid}: writes=2 (10 bytes)" in mon.report()
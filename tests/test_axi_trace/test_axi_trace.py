@@ -0,0 +1,253 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gc
+import random
+import warnings
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    AXI_TRACE_READ,
+    AXI_TRACE_WRITE,
+    AXIMaster,
+    AXISlave,
+    AXITraceError,
+    AXITraceReader,
+    AXITraceRecord,
+    AXITraceRecorder,
+    AXITraceReplay,
+    axi,
+)
+
+
+def test_axitrace_roundtrip(tmp_path):
+    """
+    Records written through the buffer, across reopens, are read back in order
+    """
+    path = tmp_path / "trace.bin"
+    with AXITraceRecorder(path, buffer_records=3) as rec:
+        for i in range(10):
+            rec.record(AXI_TRACE_WRITE, i, 0x1000 + i, i, 2, i, i + 1, i + 5, resp=i % 4)
+        assert rec.count == 10  # noqa: PLR2004
+    # reopening appends rather than truncating
+    with AXITraceRecorder(path) as rec:
+        rec.record(AXI_TRACE_READ, 7, 2**40, 255, 3, 100, 101, 200)
+
+    with AXITraceReader(path) as rd:
+        assert len(rd) == 11  # noqa: PLR2004
+        recs = list(rd)
+        assert recs[0].addr == 0x1000  # noqa: PLR2004
+        assert recs[3].resp == 3  # noqa: PLR2004
+        assert rd[-1] == (AXI_TRACE_READ, 3, 0, 255, 7, 2**40, 100, 101, 200)
+        assert recs[-1] == rd[10]
+        with pytest.raises(IndexError):
+            rd[11]
+
+
+def test_axitrace_bad_file(tmp_path):
+    path = tmp_path / "not_a_trace.bin"
+    path.write_bytes(b"0123456789abcdef0123")
+    # the file and its mapping are closed before the error is raised
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        with pytest.raises(AXITraceError):
+            AXITraceReader(path)
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+    with pytest.raises(AXITraceError):
+        AXITraceRecorder(path)
+    with pytest.raises(ValueError):
+        AXITraceRecorder(tmp_path / "trace.bin", buffer_records=0)
+    axi_m = AXIMaster(data_width=32, addr_width=32)
+    with pytest.raises(ValueError):
+        AXITraceReplay(axi_m, [], time_scale=-1)
+    with pytest.raises(ValueError):
+        AXITraceReplay(axi_m, [], max_outstanding=0)
+    # a narrow burst, 2 byte beats on a 4 byte bus
+    narrow = AXITraceRecord(AXI_TRACE_WRITE, 1, 0, 3, 0, 0x100, 0, 0, 0)
+    with pytest.raises(AXITraceError):
+        AXITraceReplay(axi_m, [])._issue(narrow)
+
+
+def tb(path_m, path_s, AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=32, AXI_ID_WIDTH=4, simlen=10):
+    """
+    Testbench for tracing AXIMaster and AXISlave transactions
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axi_sigs = axi(AXI_ADDR_WIDTH=AXI_ADDR_WIDTH, AXI_DATA_WIDTH=AXI_DATA_WIDTH, AXI_ID_WIDTH=AXI_ID_WIDTH)
+
+        PAUSE_FACTOR = 4  # will pause 1/PAUSE_FACTOR
+        pause = [Signal(bool(0)) for _ in range(5)]
+
+        @instance
+        def randPause():
+            while 1:
+                for p in pause:
+                    p.next = random.randint(1, PAUSE_FACTOR) == 1
+                yield clk.posedge
+
+        rec_m = AXITraceRecorder(path_m, buffer_records=4)
+        rec_s = AXITraceRecorder(path_s)
+        axi_m = AXIMaster(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH)
+        axi_m_logic = axi_m.create_logic(clk, rst, axi_sigs, *pause, trace=rec_m)  # noqa: F841
+        axi_s = AXISlave(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH)
+        axi_s_logic = axi_s.create_logic(clk, rst, axi_sigs, *pause, trace=rec_s)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            yield clk.posedge
+
+            bpb = AXI_DATA_WIDTH // 8
+            for i in range(simlen):
+                axi_m.issue_write(addr=i * 64, data=[i] * (bpb * (i + 1)), tid=i % 2**AXI_ID_WIDTH)
+                while not axi_m.write_empty():
+                    yield clk.posedge
+            for i in range(simlen):
+                axi_m.issue_read(addr=i * 64, len_beats=i + 1, arid=i % 2**AXI_ID_WIDTH)
+                while not axi_m.read_empty():
+                    yield clk.posedge
+            for _ in range(50):
+                yield clk.posedge
+            rec_m.close()
+            rec_s.close()
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def test_axitrace_master_slave(tmp_path):
+    simlen = 10
+    path_m = tmp_path / "m.bin"
+    path_s = tmp_path / "s.bin"
+    tb(path_m, path_s, simlen=simlen)
+
+    with AXITraceReader(path_m) as rd_m, AXITraceReader(path_s) as rd_s:
+        recs = list(rd_m)
+        # master and slave watch the same bus
+        assert recs == list(rd_s)
+        assert len(recs) == 2 * simlen
+        for i, r in enumerate(recs):
+            n = i % simlen
+            assert r.channel == (AXI_TRACE_WRITE if i < simlen else AXI_TRACE_READ)
+            assert r.addr == n * 64
+            assert r.len == n
+            assert r.id == n
+            assert r.resp == 0
+            assert r.request <= r.accept < r.complete
+
+
+def tb_replay(path_in, path_out, time_scale=1.0, AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=32, AXI_ID_WIDTH=4):
+    """
+    Testbench replaying a trace through AXIMaster while recording it again
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axi_sigs = axi(AXI_ADDR_WIDTH=AXI_ADDR_WIDTH, AXI_DATA_WIDTH=AXI_DATA_WIDTH, AXI_ID_WIDTH=AXI_ID_WIDTH)
+
+        rec = AXITraceRecorder(path_out)
+        rd = AXITraceReader(path_in)
+        axi_m = AXIMaster(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH, log_reads=False)
+        axi_m_logic = axi_m.create_logic(clk, rst, axi_sigs, trace=rec)  # noqa: F841
+        axi_s = AXISlave(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH)
+        axi_s_logic = axi_s.create_logic(clk, rst, axi_sigs)  # noqa: F841
+        replay = AXITraceReplay(axi_m, rd, time_scale=time_scale, max_outstanding=2)
+        replay_logic = replay.create_logic(clk, rst)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            yield clk.posedge
+            while not replay.done:
+                yield clk.posedge
+            assert replay.outstanding() == 0
+            assert axi_m.a == []
+            rec.close()
+            rd.close()
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def test_axitrace_replay(tmp_path):
+    path_in = tmp_path / "in.bin"
+    tb(path_in, tmp_path / "s.bin", simlen=8)
+    with AXITraceReader(path_in) as rd:
+        orig = list(rd)
+
+    spans = []
+    for time_scale in (0, 1.0, 2.0):
+        path_out = tmp_path / f"out_{time_scale}.bin"
+        tb_replay(path_in, path_out, time_scale=time_scale)
+        with AXITraceReader(path_out) as rd:
+            out = list(rd)
+        assert [(r.channel, r.addr, r.len, r.size, r.id) for r in out] == [
+            (r.channel, r.addr, r.len, r.size, r.id) for r in orig
+        ]
+        spans.append(out[-1].request - out[0].request)
+    assert {r.size for r in orig} == {2}  # 4 byte beats
+    orig_span = orig[-1].request - orig[0].request
+    assert spans[0] <= spans[1] <= spans[2]
+    assert spans[1] >= orig_span
+    assert spans[2] >= 2 * orig_span
@@ -0,0 +1,188 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    AXIBusWidthError,
+    AXILiteMaster,
+    AXILiteSlave,
+    AXIMemoryError,
+    AXITransactionError,
+    ElementSizeError,
+    axi_lite,
+)
+
+
+def test_axilite_init():
+    """
+    Testing that exceptions are raised for various invalid inputs
+    """
+    for cls in (AXILiteMaster, AXILiteSlave):
+        with pytest.raises(TypeError):
+            cls(data_width=None, addr_width=32)
+        with pytest.raises(TypeError):
+            cls(data_width=32, addr_width=1.1)
+        with pytest.raises(ElementSizeError):
+            cls(data_width=9, addr_width=32)
+        cls(data_width=32, addr_width=32)
+
+
+def test_axilite_issue():
+    axil_m = AXILiteMaster(data_width=32, addr_width=32)
+    # data too big for bus
+    with pytest.raises(ElementSizeError):
+        axil_m.issue_write(addr=0, data=2**32)
+    # unaligned
+    with pytest.raises(AXITransactionError):
+        axil_m.issue_write(addr=1, data=0)
+    with pytest.raises(AXITransactionError):
+        axil_m.issue_read(addr=2)
+    axil_m.issue_write(addr=4, data=5)
+    assert axil_m.wqueue.popleft() == (4, 5, 0xF)
+    assert axil_m.write_empty()
+
+
+def test_axilite_load():
+    axil_s = AXILiteSlave(data_width=32, addr_width=32)
+    with pytest.raises(AXIMemoryError):
+        axil_s.load(addr=1, data=0)
+    with pytest.raises(ElementSizeError):
+        axil_s.load(addr=0, data=[2**32])
+    axil_s.load(addr=8, data=[1, 2])
+    assert axil_s.regs == {8: 1, 12: 2}
+
+
+def test_axilite_create_logic():
+    axil_m = AXILiteMaster(data_width=32, addr_width=32)
+    with pytest.raises(AXIBusWidthError):
+        axil_m.create_logic(
+            clk=Signal(bool(0)), rst=Signal(bool(0)), axil=axi_lite(AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=64)
+        )
+    axil_s = AXILiteSlave(data_width=32, addr_width=32)
+    with pytest.raises(AXIBusWidthError):
+        axil_s.create_logic(
+            clk=Signal(bool(0)), rst=Signal(bool(0)), axil=axi_lite(AXI_ADDR_WIDTH=16, AXI_DATA_WIDTH=32)
+        )
+
+
+def tb(AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=32, simlen=200):
+    """
+    Testbench for AXILiteMaster and AXILiteSlave
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axil_sigs = axi_lite(AXI_ADDR_WIDTH=AXI_ADDR_WIDTH, AXI_DATA_WIDTH=AXI_DATA_WIDTH)
+
+        PAUSE_FACTOR = 4  # will pause 1/PAUSE_FACTOR
+        pause_m = [Signal(bool(0)) for _ in range(5)]
+        pause_s = [Signal(bool(0)) for _ in range(5)]
+
+        @instance
+        def randPause():
+            while 1:
+                for p in pause_m + pause_s:
+                    p.next = random.randint(1, PAUSE_FACTOR) == 1
+                yield clk.posedge
+
+        axil_m = AXILiteMaster(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH)
+        axil_m_logic = axil_m.create_logic(  # noqa: F841
+            clk, rst, axil_sigs, *pause_m, xname=None
+        )
+        axil_s = AXILiteSlave(data_width=AXI_DATA_WIDTH, addr_width=AXI_ADDR_WIDTH, fill=0)
+        axil_s_logic = axil_s.create_logic(  # noqa: F841
+            clk, rst, axil_sigs, *pause_s, xname=None
+        )
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            yield clk.posedge
+
+            # back to back register writes, then read them back
+            bpb = AXI_DATA_WIDTH // 8
+            exp = {}
+            for _ in range(simlen):
+                addr = random.randint(0, 31) * bpb
+                data = random.randint(0, 2**AXI_DATA_WIDTH - 1)
+                axil_m.issue_write(addr=addr, data=data)
+                exp[addr] = data
+            while not axil_m.write_empty():
+                yield clk.posedge
+            assert axil_s.regs == exp
+            assert axil_m.bresp == [0] * simlen
+
+            for addr in sorted(exp):
+                axil_m.issue_read(addr=addr)
+            while not axil_m.read_empty():
+                yield clk.posedge
+            rd_a, rd_d, rd_resp = axil_m.get_read_log()
+            assert rd_a == sorted(exp)
+            assert rd_d == [exp[a] for a in sorted(exp)]
+            assert rd_resp == [0] * len(exp)
+
+            # byte enables
+            axil_m.clear()
+            axil_m.issue_write(addr=0, data=0, wstrb=0)
+            axil_m.issue_write(addr=0, data=0xAA, wstrb=0x1)
+            while not axil_m.write_empty():
+                yield clk.posedge
+            axil_m.issue_read(addr=0)
+            while not axil_m.empty():
+                yield clk.posedge
+            assert axil_m.d[0] & 0xFF == 0xAA  # noqa: PLR2004
+            assert axil_m.d[0] >> 8 == exp.get(0, 0) >> 8
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def test_axilitemaster_to_axiliteslave():
+    tb(AXI_ADDR_WIDTH=32, AXI_DATA_WIDTH=32, simlen=200)
+    tb(AXI_ADDR_WIDTH=16, AXI_DATA_WIDTH=64, simlen=50)
@@ -0,0 +1,136 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import random
+import zlib
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    AXIStreamByteCounter,
+    AXIStreamCRC32Checker,
+    AXIStreamHashChecker,
+    AXIStreamSink,
+    AXIStreamSource,
+    ElementSizeError,
+    axis,
+)
+
+
+def test_beat_bytes():
+    with pytest.raises(TypeError):
+        AXIStreamCRC32Checker(data_width=None)
+    with pytest.raises(ElementSizeError):
+        AXIStreamCRC32Checker(data_width=32, element_size_bits=9)
+    chk = AXIStreamCRC32Checker(data_width=32)
+    assert chk.beat_bytes(0x44332211, 0xF) == b"\x11\x22\x33\x44"
+    assert chk.beat_bytes(0x44332211, 0x3) == b"\x11\x22"
+    chk = AXIStreamCRC32Checker(data_width=32, endian="big")
+    assert chk.beat_bytes(0x44332211, 0xF) == b"\x44\x33\x22\x11"
+    assert chk.beat_bytes(0x44332211, 0xC) == b"\x44\x33"
+    chk = AXIStreamByteCounter(data_width=18, element_size_bits=9)
+    assert chk.beat_bytes(0x1FF | (0x100 << 9), 0x3) == b"\xff\x01\x00\x01"
+    chk(0, 0x1, 0, 0, 0, 1)
+    assert (chk.beats, chk.frames, chk.bytes) == (1, 1, 2)
+
+
+def tb(DATA_WIDTH=32, simlen=50, checkers=(), on_frame=None):
+    """
+    Testbench for AXIStreamSink with store=False and on_beat checkers
+    """
+    frames = [bytes(random.getrandbits(8) for _ in range(random.randint(1, 40))) for _ in range(simlen)]
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axis_sigs = axis(DATA_WIDTH=DATA_WIDTH)
+        snd_pause = Signal(bool(0))
+        rcv_pause = Signal(bool(0))
+
+        def on_beat(*beat):
+            for c in checkers:
+                c(*beat)
+
+        m_axis = AXIStreamSource()
+        m_axis_logic = m_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=snd_pause)  # noqa: F841
+        s_axis = AXIStreamSink(on_beat=on_beat, on_frame=on_frame, store=False)
+        s_axis_logic = s_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=rcv_pause)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @always(clk.posedge)
+        def pause_rand():
+            snd_pause.next = random.randint(0, 1)
+            rcv_pause.next = random.randint(0, 1)
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            m_axis.feed(list(f) for f in frames)
+            while s_axis.frames < simlen:
+                yield clk.posedge
+            assert s_axis.empty()
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+    return frames
+
+
+def test_sink_checkers():
+    DATA_WIDTH = 32
+    crc = AXIStreamCRC32Checker(data_width=DATA_WIDTH)
+    sha = AXIStreamHashChecker(data_width=DATA_WIDTH)
+    md5 = AXIStreamHashChecker(data_width=DATA_WIDTH, algorithm="md5")
+    cnt = AXIStreamByteCounter(data_width=DATA_WIDTH)
+    lengths = []
+    frames = tb(DATA_WIDTH=DATA_WIDTH, checkers=(crc, sha, md5, cnt), on_frame=lambda f: lengths.append(len(f.data)))
+    stream = b"".join(frames)
+    assert crc.crc == zlib.crc32(stream)
+    assert crc.frame_crc == zlib.crc32(frames[-1])
+    assert sha.hexdigest() == hashlib.sha256(stream).hexdigest()
+    assert md5.hexdigest() == hashlib.md5(stream).hexdigest()  # noqa: S324
+    assert cnt.bytes == len(stream)
+    assert cnt.frames == crc.frames == len(frames)
+    assert cnt.beats == sum((len(f) + 3) // 4 for f in frames)
+    assert lengths == [len(f) for f in frames]
@@ -41,6 +41,8 @@ from veri_quickbench.tb_endpoints import (
     AXIStreamSource,
     BeatSizeError,
     ElementSizeError,
+    RandomBurstArbiter,
+    WeightedArbiter,
     axis,
 )
 
@@ -55,6 +57,8 @@ def tb_main(
     simlen=10,
     vcdtrace=False,
     stim_fn=None,
+    interleave=1,
+    arbiter=None,
 ):
     """
     Testbench for AXIStreamSource and AXIStreamSink
@@ -80,12 +84,12 @@ def tb_main(
         rcv_pause = Signal(bool(0))
 
         # instantiate the design under test
-        m_axis = AXIStreamSource(repr_items=repr_items)
+        m_axis = AXIStreamSource(repr_items=repr_items, interleave=interleave, arbiter=arbiter)
         m_axis_logic = m_axis.create_logic(  # noqa: F841
             clk=clk, rst=rst, axis=axis_sigs, pause=snd_pause, xname="m_axis"
         )
 
-        s_axis = AXIStreamSink(repr_items=repr_items)
+        s_axis = AXIStreamSink(repr_items=repr_items, interleaved=interleave > 1)
         s_axis_logic = s_axis.create_logic(  # noqa: F841
             clk=clk, rst=rst, axis=axis_sigs, pause=rcv_pause, xname="s_axis"
         )
@@ -671,5 +675,240 @@ def test_streams():
     )
 
 
+def frame_feed_receive(
+    clk=None,
+    m_axis=None,
+    s_axis=None,
+    simlen=None,
+    DATA_WIDTH=None,
+    USER_WIDTH=None,
+    DEST_WIDTH=None,
+    ID_WIDTH=None,
+    ELEMENT_SIZE_BITS=None,
+):
+    prefetch = 3
+    produced = []
+
+    def frames():
+        data_max = 2**ELEMENT_SIZE_BITS - 1
+        for _ in range(simlen):
+            frm = AXIStreamFrame(
+                data=[random.randint(0, data_max) for _ in range(random.randint(1, 20))],
+                elements_per_beat=DATA_WIDTH // ELEMENT_SIZE_BITS,
+                element_size_bits=ELEMENT_SIZE_BITS,
+            )
+            produced.append(frm)
+            yield frm
+
+    with pytest.raises(ValueError):
+        m_axis.feed(frames(), prefetch=0)
+    m_axis.feed(frames(), prefetch=prefetch)
+    assert len(produced) == prefetch
+    for i in range(simlen):
+        while s_axis.empty():
+            yield clk.posedge
+        # frames received, the frame now on the bus and at most prefetch queued frames
+        assert len(produced) <= i + s_axis.count() + 1 + prefetch
+        assert s_axis.recv() == produced[i]
+    assert m_axis.empty()
+    assert m_axis.feeder is None
+
+
+def test_stream_feed():
+    tb_main(
+        DATA_WIDTH=16,
+        ELEMENT_SIZE_BITS=8,
+        repr_items=0,
+        simlen=50,
+        stim_fn=frame_feed_receive,
+    )
+
+
+def frame_flow_receive(
+    clk=None,
+    m_axis=None,
+    s_axis=None,
+    simlen=None,
+    DATA_WIDTH=None,
+    USER_WIDTH=None,
+    DEST_WIDTH=None,
+    ID_WIDTH=None,
+    ELEMENT_SIZE_BITS=None,
+):
+    sent = {}
+    for i in range(simlen):
+        flow = (random.randint(0, 2**DEST_WIDTH - 1), random.randint(0, 2**ID_WIDTH - 1))
+        frm = AXIStreamFrame(
+            data=[i % 256] * random.randint(1, 10),
+            dest=flow[0],
+            tid=flow[1],
+            elements_per_beat=DATA_WIDTH // ELEMENT_SIZE_BITS,
+            element_size_bits=ELEMENT_SIZE_BITS,
+        )
+        sent.setdefault(flow, []).append(frm)
+        m_axis.send(frm)
+    # the last flow sent can be waited on by itself
+    yield from s_axis.wait(clk, tdest=flow[0], tid=flow[1], timeout=10000)
+    while s_axis.count() < simlen:
+        yield clk.posedge
+    assert s_axis.count(tdest=flow[0], tid=flow[1]) == len(sent[flow])
+    assert s_axis.count(tdest=flow[0]) == sum(len(v) for k, v in sent.items() if k[0] == flow[0])
+    assert s_axis.count(tid=flow[1]) == sum(len(v) for k, v in sent.items() if k[1] == flow[1])
+    assert s_axis.recv(tdest=2**DEST_WIDTH, tid=0) is None
+    # take frames through every kind of index, order within a flow is kept
+    taken = {k: 0 for k in sent}
+    while not s_axis.empty():
+        k = random.choice([k for k in sent if taken[k] < len(sent[k])])
+        how = random.randint(0, 3)
+        if how == 0:
+            frm = s_axis.recv(tdest=k[0], tid=k[1])
+        elif how == 1:
+            frm = s_axis.recv(tdest=k[0])
+        elif how == 2:  # noqa: PLR2004
+            frm = s_axis.recv(tid=k[1])
+        else:
+            frm = s_axis.recv()
+        k = (frm.dest[0], frm.tid[0])
+        assert frm == sent[k][taken[k]]
+        taken[k] += 1
+    assert taken == {k: len(v) for k, v in sent.items()}
+    assert s_axis.queue == []
+    with pytest.raises(TimeoutError):
+        yield from s_axis.wait(clk, tdest=0, timeout=5)
+
+
+def test_stream_flows():
+    tb_main(
+        DATA_WIDTH=16,
+        DEST_WIDTH=2,
+        ID_WIDTH=2,
+        ELEMENT_SIZE_BITS=8,
+        repr_items=0,
+        simlen=60,
+        stim_fn=frame_flow_receive,
+    )
+
+
+def frame_interleave_receive(
+    clk=None,
+    m_axis=None,
+    s_axis=None,
+    simlen=None,
+    DATA_WIDTH=None,
+    USER_WIDTH=None,
+    DEST_WIDTH=None,
+    ID_WIDTH=None,
+    ELEMENT_SIZE_BITS=None,
+):
+    switches = [0]
+    prev = [None]
+
+    def on_beat(tdata, tkeep, tdest, tid, tuser, tlast):
+        if prev[0] is not None and prev[0] != (tdest, tid):
+            switches[0] += 1
+        prev[0] = None if tlast else (tdest, tid)
+
+    s_axis.on_beat = on_beat
+    sent = {}
+    for i in range(simlen):
+        flow = (random.randint(0, 2**DEST_WIDTH - 1), random.randint(0, 2**ID_WIDTH - 1))
+        frm = AXIStreamFrame(
+            data=[(i + j) % 256 for j in range(random.randint(1, 40))],
+            dest=flow[0],
+            tid=flow[1],
+            elements_per_beat=DATA_WIDTH // ELEMENT_SIZE_BITS,
+            element_size_bits=ELEMENT_SIZE_BITS,
+        )
+        sent.setdefault(flow, []).append(frm)
+        m_axis.send(frm)
+    while s_axis.count() < simlen:
+        yield clk.posedge
+    # frames of a flow are never interleaved with each other, so each flow arrives in order
+    for flow, frms in sent.items():
+        for frm in frms:
+            assert s_axis.recv(tdest=flow[0], tid=flow[1]) == frm
+    assert s_axis.empty()
+    assert m_axis.empty()
+    # beats of different frames did share the bus
+    assert switches[0] > 0
+
+
+def test_stream_interleave():
+    with pytest.raises(ValueError):
+        AXIStreamSource(interleave=0)
+    for arbiter in (None, WeightedArbiter(weights={(0, 0): 3}), RandomBurstArbiter(max_burst=3, seed=1)):
+        tb_main(
+            DATA_WIDTH=16,
+            DEST_WIDTH=2,
+            ID_WIDTH=1,
+            ELEMENT_SIZE_BITS=8,
+            repr_items=0,
+            simlen=40,
+            stim_fn=frame_interleave_receive,
+            interleave=4,
+            arbiter=arbiter,
+        )
+
+
+def tb_rate(rate, burst, interleave=1, simlen=40, DATA_WIDTH=32):
+    """
+    Testbench for a rate limited AXIStreamSource, returns a list with 1 for each cycle with a beat
+    """
+    hs = []
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axis_sigs = axis(DATA_WIDTH=DATA_WIDTH, DEST_WIDTH=2)
+        m_axis = AXIStreamSource(rate=rate, burst=burst, interleave=interleave)
+        m_axis_logic = m_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs)  # noqa: F841
+        s_axis = AXIStreamSink(interleaved=interleave > 1)
+        s_axis_logic = s_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            for i in range(simlen):
+                m_axis.send(AXIStreamFrame(data=list(range(4 * (i % 7 + 1))), dest=i % 4))
+            while s_axis.count() < simlen:
+                yield clk.posedge
+                hs.append(int(axis_sigs.tvalid and axis_sigs.tready))
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+    return hs[hs.index(1) :]
+
+
+def test_stream_rate():
+    with pytest.raises(ValueError):
+        AXIStreamSource(rate=0)
+    with pytest.raises(ValueError):
+        AXIStreamSource(rate=1.5)
+    with pytest.raises(ValueError):
+        AXIStreamSource(rate=0.5, burst=0)
+    for rate, burst, interleave in ((0.8, 1, 1), (0.3, 4, 1), (0.8, 8, 4), (1, 1, 1)):
+        hs = tb_rate(rate, burst, interleave=interleave)
+        beats = 0
+        for k, b in enumerate(hs, start=1):
+            beats += b
+            # never more than burst beats ahead of the rate
+            assert beats <= rate * k + burst
+        # and the average settles on the rate once the bucket is empty
+        assert abs(beats - rate * len(hs)) <= burst + 1
+
+
 if __name__ == "__main__":
     test_frame_from_beats()
@@ -0,0 +1,158 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+from myhdl import Signal, intbv
+from myhdl._simulator import _siglist
+
+from veri_quickbench.tb_endpoints import (
+    INTFC_SPECS,
+    IntfcSig,
+    IntfcSpec,
+    _intfc,
+    axi,
+    axi_lite,
+    axis,
+    get_intfc,
+    get_intfc_inits,
+    get_intfc_lst,
+    make_intfc,
+    register_intfc,
+    unregister_intfc,
+)
+
+
+def test_axis():
+    a = axis(DATA_WIDTH=64, USER_WIDTH=3, DEST_WIDTH=4, ID_WIDTH=5)
+    assert [len(a.tdata), len(a.tkeep), len(a.tuser), len(a.tdest), len(a.tid)] == [64, 8, 3, 4, 5]
+    assert int(a.tkeep) == 0xFF  # noqa: PLR2004
+    assert isinstance(a.tvalid.val, bool)
+    assert len(axis(DATA_WIDTH=27, ELEMENT_SIZE_BITS=9).tkeep) == 3  # noqa: PLR2004
+    # narrower than a byte, a single tkeep bit
+    assert (len(axis(DATA_WIDTH=4).tkeep), int(axis(DATA_WIDTH=4).tkeep)) == (1, 1)
+    # signals passed in are used as they are
+    tdata = Signal(intbv(0)[16:])
+    tready = Signal(bool(1))
+    b = axis(tdata=tdata, tready=tready)
+    assert b.tdata is tdata
+    assert b.tready is tready
+    # each bundle gets its own signals
+    assert axis().tdata is not axis().tdata
+
+
+def test_axi():
+    a = axi(AXI_ADDR_WIDTH=40, AXI_ID_WIDTH=4, AXI_DATA_WIDTH=128)
+    assert list(vars(a)) == INTFC_SPECS["axi"].signal_names()
+    assert (len(a.awaddr), len(a.arid), len(a.wdata), len(a.wstrb)) == (40, 4, 128, 16)
+    assert int(a.wstrb) == 0xFFFF  # noqa: PLR2004
+    assert bool(a.bready)
+    lite = axi_lite(AXI_DATA_WIDTH=64)
+    assert (len(lite.wstrb), int(lite.wstrb), len(lite.bresp)) == (8, 0, 2)
+
+
+def test_sample_drive():
+    a = axis(DATA_WIDTH=16)
+    s = a.sample()
+    assert isinstance(s, axis.Sample)
+    assert s == (0, 3, 0, 0, 0, 0, 0, 0)
+    assert (s.tkeep, s.tvalid) == (3, 0)
+    del _siglist[:]
+    assert a.drive(tdata=0x1234, tkeep=3, tlast=1) == 2  # noqa: PLR2004
+    # tkeep is already 3, only tdata and tlast are updated
+    assert _siglist == [a.tdata, a.tlast]
+    assert (int(a.tdata.next), bool(a.tlast.next)) == (0x1234, True)
+    del _siglist[:]
+    assert a.drive(tdata=0x1234) == 0
+    assert not _siglist
+    with pytest.raises(TypeError):
+        a.drive(tfoo=1)
+
+
+def test_spec_tables():
+    assert get_intfc_lst() == ("axi_", "axi_lite_", "axis_")
+    assert get_intfc_inits("axi_lite").startswith("AXI_ADDR_WIDTH, AXI_ID_WIDTH, AXI_DATA_WIDTH, awaddr")
+    assert get_intfc_inits("nope") is None
+    tready = next(s for s in INTFC_SPECS["axis"].signals if s.name == "tready")
+    assert tready.direction == "in"
+
+
+def test_make_intfc():
+    spec = IntfcSpec(
+        "apb",
+        params=[("ADDR_WIDTH", 16), ("DATA_WIDTH", 32)],
+        signals=[
+            IntfcSig("paddr", "ADDR_WIDTH"),
+            IntfcSig("psel"),
+            IntfcSig("pstrb", "DATA_WIDTH // 8", "2**W - 1"),
+            IntfcSig("pready", default=1, direction="in"),
+        ],
+    )
+    apb = make_intfc(spec)
+    a = apb(ADDR_WIDTH=12)
+    assert apb.__name__ == "apb"
+    assert apb.spec is spec
+    assert (len(a.paddr), len(a.pstrb), int(a.pstrb), bool(a.psel), bool(a.pready)) == (12, 4, 15, False, True)
+
+
+APB_SPEC = IntfcSpec(
+    "apb",
+    params=[("ADDR_WIDTH", 16), ("DATA_WIDTH", 32)],
+    signals=[IntfcSig("paddr", "ADDR_WIDTH"), IntfcSig("psel"), IntfcSig("prdata", "DATA_WIDTH", direction="in")],
+)
+
+
+def test_registry():
+    assert get_intfc("axis") is axis
+    assert get_intfc("apb") is None
+    lst = get_intfc_lst()
+    assert get_intfc_lst() is lst  # cached
+    apb = register_intfc(APB_SPEC)
+    try:
+        assert get_intfc("apb") is apb
+        assert get_intfc_lst() == ("apb_", "axi_", "axi_lite_", "axis_")
+        assert get_intfc_inits("apb") == "ADDR_WIDTH, DATA_WIDTH, paddr, psel, prdata"
+        with pytest.raises(ValueError):
+            register_intfc(APB_SPEC)
+        assert register_intfc(APB_SPEC, replace=True) is not apb
+    finally:
+        unregister_intfc("apb")
+    assert get_intfc_lst() == lst
+
+
+class _EntryPoint(object):
+    def __init__(self, obj):
+        self.obj = obj
+
+    def load(self):
+        return self.obj
+
+
+def test_plugins(monkeypatch):
+    ahb = IntfcSpec("ahb", params=[("ADDR_WIDTH", 32)], signals=[IntfcSig("haddr", "ADDR_WIDTH")])
+    monkeypatch.setattr(_intfc, "_entry_points", lambda: [_EntryPoint(APB_SPEC), _EntryPoint([ahb])])
+    monkeypatch.setattr(_intfc, "_plugins_loaded", False)
+    try:
+        assert "ahb_" in get_intfc_lst()
+        assert len(get_intfc("apb")().paddr) == 16  # noqa: PLR2004
+    finally:
+        unregister_intfc("apb")
+        unregister_intfc("ahb")
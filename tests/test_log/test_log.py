@@ -0,0 +1,153 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    LOGGER_NAME,
+    AXIStreamSink,
+    AXIStreamSource,
+    axis,
+    endpoint_logger,
+    log_to_console,
+    log_to_file,
+    read_binary_log,
+    set_log_level,
+)
+
+
+def tb(simlen=5):
+    """
+    Testbench for endpoint logging on an AXIStreamSource to AXIStreamSink loopback
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axis_sigs = axis(DATA_WIDTH=32)
+        m_axis = AXIStreamSource()
+        m_axis_logic = m_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, xname="m_axis")  # noqa: F841
+        s_axis = AXIStreamSink()
+        s_axis_logic = s_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, xname="s_axis")  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            for i in range(simlen):
+                m_axis.send([i] * 6)
+            while s_axis.count() < simlen:
+                yield clk.posedge
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def _remove(handler, xname=None):
+    log = endpoint_logger(xname)
+    log.removeHandler(handler)
+    log.setLevel(logging.NOTSET)
+    handler.close()
+
+
+def test_log_levels(caplog):
+    assert endpoint_logger("m_axis").name == f"{LOGGER_NAME}.m_axis"
+    # nothing is logged by default
+    with caplog.at_level(logging.WARNING, logger=LOGGER_NAME):
+        tb()
+    assert not caplog.records
+    # only the sink is enabled
+    set_log_level(logging.DEBUG, xname="s_axis")
+    try:
+        with caplog.at_level(logging.NOTSET, logger=LOGGER_NAME):
+            tb(simlen=3)
+    finally:
+        set_log_level(logging.NOTSET, xname="s_axis")
+    assert len(caplog.records) == 3  # noqa: PLR2004
+    assert all(r.name == f"{LOGGER_NAME}.s_axis" for r in caplog.records)
+    assert caplog.records[0].getMessage().startswith("Got frame AXIStreamFrame")
+
+
+def test_log_to_file(tmp_path):
+    txt = tmp_path / "endpoints.log"
+    h = log_to_file(txt, capacity=1000)
+    target = h.target
+    try:
+        tb(simlen=4)
+        # records are buffered until the handler is flushed or closed
+        assert txt.read_text() == ""
+    finally:
+        _remove(h)
+    # closing the handler closes the log file as well
+    assert target.stream is None
+    lines = txt.read_text().splitlines()
+    assert sum("m_axis DEBUG: Sending frame" in x for x in lines) == 4  # noqa: PLR2004
+    assert sum("s_axis DEBUG: Got frame" in x for x in lines) == 4  # noqa: PLR2004
+
+    bin_file = tmp_path / "endpoints.bin"
+    h = log_to_file(bin_file, xname="m_axis", capacity=2, binary=True)
+    try:
+        tb(simlen=5)
+    finally:
+        _remove(h, xname="m_axis")
+    records = list(read_binary_log(bin_file))
+    assert len(records) == 5  # noqa: PLR2004
+    simtime, name, levelno, msg = records[-1]
+    assert simtime > records[0][0]
+    assert name == f"{LOGGER_NAME}.m_axis"
+    assert levelno == logging.DEBUG
+    assert msg.startswith("Sending frame")
+
+
+def test_log_to_console(capsys):
+    # every generated testbench module calls log_to_console() when it is imported
+    for _ in range(3):
+        h = log_to_console(logging.INFO)
+    try:
+        assert endpoint_logger().handlers == [h]
+        endpoint_logger("m_axis").info("hello")
+    finally:
+        _remove(h)
+    assert capsys.readouterr().err.count("m_axis INFO: hello") == 1
@@ -0,0 +1,103 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+
+from veri_quickbench.tb_creator import ModuleCache, get_module_cache, set_module_cache, verilog_module
+from veri_quickbench.tb_creator._module_cache import MODULE_CACHE_ENV, default_cache_dir
+
+VERILOG = """
+module top #(parameter W = 8) (
+  input  wire          clk,
+  input  wire [W-1:0]  s_axis_tdata,
+  input  wire          s_axis_tvalid,
+  output wire          s_axis_tready
+);
+endmodule
+"""
+
+
+def ports(mod):
+    return [(p.pstyle, p.pdir, p.psize, p.pname, p.is_iface) for p in mod.ports_lst]
+
+
+def test_module_cache(tmp_path, monkeypatch):
+    f = tmp_path / "top.v"
+    f.write_text(VERILOG)
+    cache = ModuleCache(path=tmp_path / "cache", size=1)
+    monkeypatch.setattr("veri_quickbench.tb_creator._module_cache._module_cache", cache)
+    assert get_module_cache() is cache
+
+    parsed = verilog_module(str(f))
+    assert (cache.misses, cache.hits, cache.disk_hits) == (1, 0, 0)
+
+    # second build comes from memory and is the same module
+    cached = verilog_module(str(f))
+    assert cache.hits == 1
+    assert cached.name == parsed.name == "top"
+    assert ports(cached) == ports(parsed)
+    assert list(cached.bundles) == ["s_axis"]
+
+    # a new process only has the disk copy
+    fresh = ModuleCache(path=tmp_path / "cache")
+    set_module_cache(fresh)
+    assert ports(verilog_module(str(f))) == ports(parsed)
+    assert (fresh.misses, fresh.disk_hits) == (0, 1)
+
+    # an edited file misses, the LRU of size 1 drops the old entry
+    f.write_text(VERILOG.replace("top", "top2"))
+    assert verilog_module(str(f)).name == "top2"
+    assert fresh.misses == 1
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2  # noqa: PLR2004
+
+    # entries of another parser version are not used
+    for p in (tmp_path / "cache").glob("*.json"):
+        ir = json.loads(p.read_text())
+        ir["version"] = "0:old"
+        p.write_text(json.dumps(ir))
+    fresh.clear()
+    verilog_module(str(f))
+    assert fresh.misses == 2  # noqa: PLR2004
+
+    fresh.clear(disk=True)
+    assert not list((tmp_path / "cache").glob("*.json"))
+
+
+def test_memory_only(tmp_path):
+    f = tmp_path / "top.v"
+    f.write_text(VERILOG)
+    cache = ModuleCache()
+    parse = verilog_module.__new__(verilog_module)
+    parse.debug = False
+    assert cache.load(f, parse.parse_ir)["name"] == "top"
+    assert cache.load(f, None)["name"] == "top"  # not parsed again
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_default_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(MODULE_CACHE_ENV, str(tmp_path))
+    assert default_cache_dir() == tmp_path
+    monkeypatch.setenv(MODULE_CACHE_ENV, "")
+    assert default_cache_dir() is None
+    monkeypatch.delenv(MODULE_CACHE_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "veri_quickbench"
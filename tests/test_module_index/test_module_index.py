@@ -0,0 +1,176 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import io
+import os
+
+import pytest
+
+from veri_quickbench.tb_creator import ModuleIndex, build_index, uut_sources
+from veri_quickbench.tb_creator._module_cache import MODULE_CACHE_ENV
+from veri_quickbench.tb_creator._module_index import INDEX_FILE, index_cache_path
+from veri_quickbench.tb_creator.templates._template_tf_config import write_tf_config
+
+FIFO = """
+module fifo #(parameter W = 8) (
+  input  wire          clk,
+  input  wire [W-1:0]  s_axis_tdata,
+  input  wire          s_axis_tvalid,
+  output wire          s_axis_tready,
+  output wire [W-1:0]  m_axis_tdata,
+  output wire          m_axis_tvalid,
+  input  wire          m_axis_tready
+);
+endmodule
+"""
+
+TOP = """
+module top (input wire clk);
+  wire [7:0] d;
+  fifo #(.W(8)) u_fifo (.clk(clk));
+  fifo u_fifo2 [1:0] (.clk(clk));
+  always @(posedge clk) begin
+    if (d) $display("x");
+  end
+  and g0 (a, b, c);
+  leaf u_leaf (clk);
+endmodule
+
+module leaf (input wire clk);
+endmodule
+"""
+
+
+def test_module_index(tmp_path):
+    src = tmp_path / "ip"
+    (src / "rtl").mkdir(parents=True)
+    (src / ".git").mkdir()
+    (src / "rtl" / "fifo.v").write_text(FIFO)
+    (src / "top.sv").write_text(TOP)
+    (src / ".git" / "skip.v").write_text("module skip; endmodule")
+    (src / "broken.v").write_text("module broken (input wire a")
+    for i in range(8):
+        (src / f"gen{i}.v").write_text(f"module gen{i} (input wire clk); fifo u (clk); endmodule")
+
+    index = build_index(src, jobs=2, in_tree=True)
+    assert index.path == src / INDEX_FILE
+    assert sorted(index.modules) == [
+        "fifo",
+        "gen0",
+        "gen1",
+        "gen2",
+        "gen3",
+        "gen4",
+        "gen5",
+        "gen6",
+        "gen7",
+        "leaf",
+        "top",
+    ]
+    fifo = index.lookup("fifo")
+    assert fifo["file"] == "rtl/fifo.v"
+    assert [p[5] for p in fifo["params"]] == ["W"]
+    assert len(fifo["ports"]) == 7  # noqa: PLR2004
+    assert fifo["interfaces"]["s_axis"] == {"iface": "axis", "master": False, "signals": ["tdata", "tready", "tvalid"]}
+    assert fifo["interfaces"]["m_axis"]["master"] is True
+    assert index.lookup("top")["instances"] == ["fifo", "leaf"]
+    assert index.lookup("gen3")["instances"] == ["fifo"]
+    assert list(index.errors()) == ["broken.v"]
+
+    # nothing changed, nothing is rescanned
+    again = ModuleIndex(src, path=src / INDEX_FILE)
+    assert again.load()
+    assert again.modules == index.modules
+    assert again.update(jobs=1) == {"scanned": 0, "removed": 0, "unchanged": 11}
+
+    # an edit, a removal and a module defined twice
+    (src / "rtl" / "fifo.v").write_text(FIFO.replace("parameter W = 8", "parameter W = 16"))
+    os.utime(src / "rtl" / "fifo.v", ns=(1, 1))
+    (src / "gen7.v").unlink()
+    (src / "copy.v").write_text("module leaf; endmodule")
+    assert again.update(jobs=1) == {"scanned": 2, "removed": 1, "unchanged": 9}
+    assert again.lookup("fifo")["params"][0][6] == "= 16"
+    assert again.lookup("gen7") is None
+    assert again.duplicates == {"leaf": ["copy.v", "top.sv"]}
+
+
+def test_module_index_version(tmp_path):
+    (tmp_path / "a.v").write_text("module a; endmodule")
+    (tmp_path / INDEX_FILE).write_text('{"version": 0, "files": {}}')
+    index = ModuleIndex(tmp_path, path=tmp_path / INDEX_FILE)
+    assert not index.load()
+    assert index.update() == {"scanned": 1, "removed": 0, "unchanged": 0}
+    assert index.lookup("a")["ports"] == []
+
+
+def test_source_list(tmp_path):
+    (tmp_path / "common").mkdir()
+    (tmp_path / "uut.v").write_text("module uut; core u0 (); bram u1 (); endmodule\nmodule unused_in_uut; endmodule")
+    (tmp_path / "cores.v").write_text("module core; fifo u (); IBUF u_buf (); endmodule\nmodule other; endmodule")
+    (tmp_path / "common" / "fifo.v").write_text("module fifo; bram u (); endmodule")
+    (tmp_path / "common" / "bram.sv").write_text("module bram; endmodule")
+    (tmp_path / "unused.v").write_text("module unused; endmodule")
+    index = build_index(tmp_path, jobs=1)
+
+    srcs = index.source_list("uut")
+    assert srcs.files == ["common/bram.sv", "cores.v", "uut.v"]
+    assert srcs.lib_dirs == ["common"]
+    assert srcs.missing == ["IBUF"]
+    assert index.source_list("uut", libs=False).files == ["common/bram.sv", "common/fifo.v", "cores.v", "uut.v"]
+    with pytest.raises(KeyError):
+        index.source_list("nope")
+
+    assert uut_sources(tmp_path / "uut.v") == (srcs.files, srcs.lib_dirs)
+    assert uut_sources(tmp_path / "tb.py") == (["tb.py"], [])
+    f = io.StringIO()
+    write_tf_config(f, uut_name="uut", primary_src_files=srcs.files, primary_lib_dirs=srcs.lib_dirs)
+    assert 'srcs.append(str(SRC_DIR / "uut.v"))\nsrcs.append("-y " + str(SRC_DIR / "common"))\n' in f.getvalue()
+
+
+def test_uut_sources_cache(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "uut.v").write_text("module uut; leaf u (); endmodule")
+    (src / "leaf.v").write_text("module leaf; endmodule")
+    # the index goes to the cache directory, never into the source folder
+    monkeypatch.setenv(MODULE_CACHE_ENV, str(tmp_path / "cache"))
+    assert uut_sources(src / "uut.v") == (["uut.v"], ["."])
+    assert len(list((tmp_path / "cache" / "index").glob("*.json"))) == 1
+    # build_index() and --index use the same index file, so each reuses the other's scan
+    again = ModuleIndex(src)
+    assert again.path == index_cache_path(src)
+    assert again.load()
+    assert again.update() == {"scanned": 0, "removed": 0, "unchanged": 2}
+    (src / "leaf2.v").write_text("module leaf2; endmodule")
+    index = build_index(src)
+    assert index.path == again.path
+    assert index.lookup("leaf2") is not None
+    again = ModuleIndex(src)
+    assert again.load()
+    assert again.update() == {"scanned": 0, "removed": 0, "unchanged": 3}
+    # with caching off the index is only kept in memory
+    monkeypatch.setenv(MODULE_CACHE_ENV, "")
+    assert uut_sources(src / "uut.v") == (["uut.v"], ["."])
+    index = build_index(src)
+    assert index.path is None and not index.load()
+    assert sorted(p.name for p in src.iterdir()) == ["leaf.v", "leaf2.v", "uut.v"]
@@ -0,0 +1,180 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import random
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    PRBS,
+    PRBS_TAPS,
+    AXIStreamSink,
+    AXIStreamSource,
+    CountingPattern,
+    PatternChecker,
+    PRBSChecker,
+    WalkingOnesPattern,
+    axis,
+    pattern_frames,
+)
+
+
+def prbs_ref(order, nbits, seed):
+    """bit serial reference, b[k] = b[k-n] ^ b[k-m]"""
+    n = order
+    m = PRBS_TAPS[order]
+    b = [(seed >> i) & 1 for i in range(n)]
+    while len(b) < nbits:
+        b.append(b[-n] ^ b[-m])
+    return b[:nbits]
+
+
+def test_prbs():
+    with pytest.raises(ValueError):
+        PRBS(order=8)
+    with pytest.raises(ValueError):
+        PRBS(order=7, seed=0)
+    for order in PRBS_TAPS:
+        for block_bits in (64, 8192):
+            p = PRBS(order=order, seed=5, block_bits=block_bits)
+            # odd sized requests straddle byte and block boundaries
+            x = p.bits(500) | (p.bits(13) << 500) | (p.bits(20000) << 513)
+            assert [(x >> i) & 1 for i in range(20513)] == prbs_ref(order, 20513, seed=5)
+    # PRBS7 repeats every 127 bits
+    x = PRBS(order=7).bits(127 * 2)
+    assert x & (2**127 - 1) == x >> 127
+    beats = PRBS(order=15).beats(3, 512)
+    assert beats[0] | (beats[1] << 512) | (beats[2] << 1024) == PRBS(order=15).bits(3 * 512)
+
+
+def test_counting_walking():
+    assert CountingPattern().beats(2, 32) == [0x03020100, 0x07060504]
+    cp = CountingPattern(element_size_bits=4, start=14)
+    assert cp.beats(2, 8) == [0xFE, 0x10]
+    with pytest.raises(ValueError):
+        cp.beats(1, 10)
+    assert WalkingOnesPattern().beats(5, 4) == [1, 2, 4, 8, 1]
+
+
+def test_prbs_checker():
+    with pytest.raises(ValueError):
+        PRBSChecker(order=8, data_width=64)
+    with pytest.raises(TypeError):
+        PRBSChecker(order=7)
+
+    # single bit error, lock is kept
+    chk = PRBSChecker(order=31, data_width=64)
+    beats = PRBS(order=31).beats(100, 64)
+    beats[50] ^= 1 << 10
+    for d in beats:
+        chk(d, 0xFF, 0, 0, 0, 0)
+    assert chk.locked
+    assert chk.errors == 3  # noqa: PLR2004
+    assert chk.resyncs == 0
+    assert chk.bits == 100 * 64 - 31
+
+    # start part way into the sequence, then skip a block of data
+    chk = PRBSChecker(order=7, data_width=32)
+    beats = PRBS(order=7).beats(200, 32)
+    for d in beats[13:80] + beats[120:]:
+        chk(d, 0xF, 0, 0, 0, 0)
+    assert chk.locked
+    assert chk.resyncs == 1
+
+    # partial last beat
+    chk = PRBSChecker(order=9, data_width=32)
+    x = PRBS(order=9).bits(80)
+    chk(x & 0xFFFFFFFF, 0xF, 0, 0, 0, 0)
+    chk(x >> 32 & 0xFFFFFFFF, 0xF, 0, 0, 0, 0)
+    chk(x >> 64, 0x3, 0, 0, 0, 1)
+    assert chk.errors == 0
+    assert chk.bits == 80 - 9
+
+    chk = PatternChecker(CountingPattern(), data_width=32)
+    for d in CountingPattern().beats(10, 32):
+        chk(d, 0xF, 0, 0, 0, 0)
+    chk(0, 0xF, 0, 0, 0, 0)
+    assert (chk.beats, chk.errors) == (11, 1)
+
+
+def tb(DATA_WIDTH=64, frames=20, beats_per_frame=8, checker=None):
+    """
+    Testbench sending a PRBS stream from AXIStreamSource to a checking AXIStreamSink
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axis_sigs = axis(DATA_WIDTH=DATA_WIDTH)
+        snd_pause = Signal(bool(0))
+        rcv_pause = Signal(bool(0))
+
+        m_axis = AXIStreamSource()
+        m_axis_logic = m_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=snd_pause)  # noqa: F841
+        s_axis = AXIStreamSink(on_beat=checker, store=False)
+        s_axis_logic = s_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=rcv_pause)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @always(clk.posedge)
+        def pause_rand():
+            snd_pause.next = random.randint(0, 1)
+            rcv_pause.next = random.randint(0, 1)
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            m_axis.feed(pattern_frames(PRBS(order=31), DATA_WIDTH, beats_per_frame, count=frames))
+            while s_axis.frames < frames:
+                yield clk.posedge
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def test_prbs_stream():
+    chk = PRBSChecker(order=31, data_width=512)
+    tb(DATA_WIDTH=512, frames=20, beats_per_frame=8, checker=chk)
+    assert chk.locked
+    assert chk.errors == 0
+    assert chk.bits == 20 * 8 * 512 - 31
@@ -0,0 +1,89 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from veri_quickbench.tb_creator import PortClassifier, get_port_classifier, verilog_iface, verilog_module
+from veri_quickbench.tb_endpoints import IntfcSig, IntfcSpec, register_intfc, unregister_intfc
+
+VERILOG = """
+module top #(parameter W = 8) (
+  input  wire          clk,
+  input  wire [31:0]   s_axis_tdata,
+  input  wire          s_axis_tvalid,
+  output wire          s_axis_tready,
+  input  wire          s_axis_foo_bar,
+  input  wire [31:0]   axis_out_tdata,
+  output wire          axis_out_tvalid,
+  input  wire          axis_out_tready,
+  output wire [31:0]   m_axi_lite_awaddr,
+  output wire          m_axi_lite_awvalid,
+  input  wire          m_axi_lite_awready
+);
+endmodule
+"""
+
+
+def test_classify():
+    c = PortClassifier()
+    assert c.classify("s_axis_tdata") == ("s_axis", "axis", "tdata")
+    assert c.classify("axis_tlast") == ("axis", "axis", "tlast")
+    assert c.classify("S_AXIS_TVALID") == ("S_AXIS", "axis", "tvalid")
+    assert c.classify("axis_in_tdata") == ("axis_in", "axis", "tdata")
+    assert c.classify("m_axi_lite_awaddr") == ("m_axi_lite", "axi_lite", "awaddr")
+    assert c.classify("m_axi_lite_in_awaddr") == ("m_axi_lite_in", "axi_lite", "awaddr")
+    assert c.classify("m_axi_awlen") == ("m_axi", "axi", "awlen")
+    # the signal has to belong to the interface
+    assert c.classify("s_axis_foo_bar") is None
+    # awlen is only an axi signal, lite is part of the bundle name
+    assert c.classify("m_axi_lite_awlen") == ("m_axi_lite", "axi", "awlen")
+    assert c.classify("tdata") is None
+    assert c.classify("clk") is None
+
+
+def test_classifier_registry():
+    c = get_port_classifier()
+    assert get_port_classifier() is c  # cached
+    register_intfc(IntfcSpec("apb", params=[("ADDR_WIDTH", 32)], signals=[IntfcSig("paddr", "ADDR_WIDTH")]))
+    try:
+        assert get_port_classifier() is not c
+        assert get_port_classifier().classify("s_apb_paddr") == ("s_apb", "apb", "paddr")
+    finally:
+        unregister_intfc("apb")
+    assert get_port_classifier().classify("s_apb_paddr") is None
+
+
+def test_module_bundles(tmp_path):
+    f = tmp_path / "top.v"
+    f.write_text(VERILOG)
+    mod = verilog_module(str(f))
+    assert mod.get_ifaces() == (["s_axis", "axis_out", "m_axi_lite"], ["axis", "axis", "axi_lite"])
+    assert sorted(mod.bundles["s_axis"].ports) == ["tdata", "tready", "tvalid"]
+    # direction comes from the ports, not from the name
+    assert mod.iface_is_master("s_axis") is False
+    assert mod.iface_is_master("axis_out") is True
+    assert mod.iface_is_master("m_axi_lite") is True
+    plain = [p.pname for p in mod.ports_lst if p.pstyle == "port" and not p.is_iface]
+    assert plain == ["clk", "s_axis_foo_bar"]
+
+    iface = verilog_iface(iface_type="axis", name="axis_out", associated_clock="clk", is_master=False)
+    assert not iface.is_master
+    iface = verilog_iface(iface_type="axis", name="s_axis", associated_clock="clk")
+    assert not iface.is_master
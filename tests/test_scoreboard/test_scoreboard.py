@@ -0,0 +1,198 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import random
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    SB_DUPLICATE,
+    SB_MATCH,
+    SB_REORDER,
+    SB_UNEXPECTED,
+    AXIStreamFrame,
+    AXIStreamScoreboard,
+    AXIStreamScoreboardError,
+    AXIStreamSink,
+    AXIStreamSource,
+    axis,
+    chk_axis_packets,
+)
+
+
+def frm(data, dest=0, tid=0):
+    return AXIStreamFrame(data=list(data), dest=dest, tid=tid)
+
+
+def test_scoreboard_ordered():
+    sb = AXIStreamScoreboard()
+    for i in range(4):
+        sb.add_expected(frm([i, i], dest=0))
+    sb.add_expected(frm([9], dest=1))
+    assert sb.check(frm([9], dest=1)) == SB_MATCH  # other flow, not a drop
+    assert sb.check(frm([0, 0])) == SB_MATCH
+    assert sb.check(frm([2, 2])) == SB_MATCH  # skips [1, 1]
+    assert sb.drops == 1
+    assert sb.check(frm([2, 2])) == SB_DUPLICATE
+    assert sb.check(frm([7, 7])) == SB_UNEXPECTED
+    assert sb.check(frm([1, 1])) == SB_UNEXPECTED  # already counted as dropped
+    assert sb.pending() == 1
+    sb.finish()
+    assert (sb.matched, sb.drops, sb.duplicates, sb.unexpected) == (3, 2, 1, 2)
+    assert not sb.ok()
+
+
+def test_scoreboard_reorder():
+    sb = AXIStreamScoreboard(ordered=False)
+    frames = [frm([i], tid=i % 2) for i in range(6)]
+    for f in frames:
+        sb.add_expected(f)
+    assert sb.check(frames[2]) == SB_REORDER
+    assert sb.check(frames[0]) == SB_MATCH
+    for f in frames[1:2] + frames[3:]:
+        assert sb.check(f) == SB_MATCH
+    sb.finish()
+    assert sb.ok()
+    assert (sb.matched, sb.reorders) == (6, 1)
+    assert sb.report().startswith("expected=6, matched=6")
+
+
+def test_scoreboard_window():
+    sb = AXIStreamScoreboard(ordered=False, window=4, dup_window=2)
+    for i in range(100):
+        sb.add_expected(frm([i & 0xFF, i >> 8], tid=i % 3))
+    for i in range(100):
+        if i % 10 != 5:  # noqa: PLR2004
+            sb.check(frm([i & 0xFF, i >> 8], tid=i % 3))
+        assert len(sb._order) <= 100 - i + 4
+    sb.finish()
+    assert (sb.matched, sb.drops) == (90, 10)
+    assert len(sb._recent) == 2  # noqa: PLR2004
+
+    # expired frames are released from the index and the flow queues as well
+    for ordered in (True, False):
+        sb = AXIStreamScoreboard(ordered=ordered, window=8)
+        for i in range(2000):
+            sb.add_expected(frm([i & 0xFF, i >> 8], dest=1))
+            sb.add_expected(frm([i & 0xFF, i >> 8], dest=0))
+            sb.check(frm([i & 0xFF, i >> 8], dest=0))
+        assert (sb.matched, sb.drops + sb.pending()) == (2000, 2000)
+        assert sb.pending() <= 8  # noqa: PLR2004
+        assert len(sb._index) <= 8 and len(sb._flows) <= 1 and len(sb._order) <= 2 * 8 + 1  # noqa: PLR2004
+
+    sb = AXIStreamScoreboard(raise_on_error=True)
+    sb.add_expected(frm([1]))
+    with pytest.raises(AXIStreamScoreboardError):
+        sb.check(frm([2]))
+
+
+def test_scoreboard_trailing():
+    sb = AXIStreamScoreboard()
+    exp = AXIStreamFrame(data=[1, 2, 3], last=[0, 0, 0], allow_trailing=True)
+    sb.add_expected(exp)
+    sb.add_expected(frm([4]))
+    assert sb.check(frm([1, 2, 3, 0])) == SB_MATCH
+    assert sb.check(frm([4])) == SB_MATCH
+    assert sb.pending() == 0
+
+
+def tb(DATA_WIDTH=32, simlen=40, use_sb=True):
+    """
+    Testbench for chk_axis_packets and AXIStreamScoreboard on a loopback
+    """
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axis_sigs = axis(DATA_WIDTH=DATA_WIDTH, DEST_WIDTH=2)
+        snd_pause = Signal(bool(0))
+        rcv_pause = Signal(bool(0))
+        dropped_pkt = Signal(bool(0))
+
+        sb = AXIStreamScoreboard()
+        m_axis = AXIStreamSource()
+        m_axis_logic = m_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=snd_pause)  # noqa: F841
+        if use_sb:
+            s_axis = AXIStreamSink(on_frame=sb.check, store=False)
+        else:
+            s_axis = AXIStreamSink()
+        s_axis_logic = s_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=rcv_pause)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @always(clk.posedge)
+        def pause_rand():
+            snd_pause.next = random.randint(0, 1)
+            rcv_pause.next = random.randint(0, 1)
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            exp_lst = []
+            for i in range(simlen):
+                f = frm([random.getrandbits(8) for _ in range(i + 1)], dest=random.randint(0, 3))
+                m_axis.send(f)
+                exp_lst.append(f)
+            if use_sb:
+                for f in exp_lst:
+                    sb.add_expected(f)
+                while sb.pending():
+                    yield clk.posedge
+                sb.finish()
+                assert sb.ok(), sb.report()
+                assert sb.matched == simlen
+            else:
+                yield from chk_axis_packets(s_axis, exp_lst, clk, dropped_pkt)
+                assert s_axis.empty()
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+
+
+def test_scoreboard_sink():
+    tb(use_sb=True)
+
+
+def test_chk_axis_packets():
+    tb(use_sb=False)
@@ -0,0 +1,116 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import random
+import timeit
+
+import pytest
+from myhdl import intbv
+
+from veri_quickbench.tb_endpoints import (
+    beats2buffer,
+    beats2bytearray,
+    beats2bytes,
+    beats2ranges,
+    buffer2beats,
+    bytestobeats,
+)
+
+
+@pytest.mark.parametrize("data_bits", [8, 12, 16, 24, 32, 40, 64, 72, 128, 200])
+@pytest.mark.parametrize("endian", ["little", "big"])
+def test_buffer_roundtrip(data_bits, endian):
+    nbytes = (data_bits + 7) // 8
+    data = [random.getrandbits(data_bits) for _ in range(33)] + [0, 2**data_bits - 1]
+    buf = beats2buffer(data, data_bits, endian)
+    assert buf == b"".join(d.to_bytes(nbytes, endian) for d in data)
+    assert buffer2beats(buf, data_bits, endian) == data
+    if nbytes > 1:
+        # partial last beat is zero padded
+        assert buffer2beats(buf[:-1], data_bits, endian)[:-1] == data[:-1]
+    with pytest.raises(OverflowError):
+        beats2buffer([2 ** (nbytes * 8)], data_bits, endian)
+
+
+def test_beats2ranges():
+    data = [0x44332211, 0x88776655, 0xCCBBAA99, 0x00FFEEDD]
+    assert beats2ranges([0x100, 0x104, 0x200, 0x204], data, 32) == [
+        (0x100, bytes(range(0x11, 0x99, 0x11))),
+        (0x200, bytes([0x99, 0xAA, 0xBB, 0xCC, 0xDD, 0xEE, 0xFF, 0x00])),
+    ]
+    le = [d.to_bytes(4, "little") for d in data]
+    assert beats2ranges([0, 8, 4, 8], data, 32) == [(0, le[0]), (8, le[1]), (4, le[2] + le[3])]
+    assert beats2buffer([intbv(0x1234)[16:]], 16, "big") == b"\x12\x34"
+
+
+def test_legacy_helpers():
+    adr = [0x10, 0x12, 0x40]
+    data = [0x1234, 0x5678, 0x9ABC]
+    badr, bdata = beats2bytes(adr, data, 16)
+    assert badr == [0x10, 0x11, 0x12, 0x13, 0x40, 0x41]
+    assert bdata == [0x34, 0x12, 0x78, 0x56, 0xBC, 0x9A]
+    assert bytestobeats(badr, bdata, 16) == (adr, data)
+    assert beats2bytearray(data, 5, 16) == bytearray([0x34, 0x12, 0x78, 0x56, 0xBC])
+    assert beats2bytearray(data, 5, 16, endian="big") == bytearray([0x12, 0x34, 0x56, 0x78, 0x9A])
+
+
+def _loop_beats2bytearray(data, num_bytes, data_bits):
+    """the per beat loop beats2bytearray replaced"""
+    ba = bytearray()
+    for d in data:
+        ba.extend(d.to_bytes(data_bits // 8, byteorder="little"))
+    return ba[:num_bytes]
+
+
+def _loop_bytestobeats(adr, data, data_bits):
+    """the per byte loop bytestobeats replaced"""
+    nbytes = data_bits // 8
+    adr_exp = []
+    data_exp = []
+    for i in range(0, len(data), nbytes):
+        adr_exp.append(adr[i])
+        d = 0
+        for b in range(nbytes):
+            d = d + (data[i + b] << (b * 8))
+        data_exp.append(d)
+    return adr_exp, data_exp
+
+
+@pytest.mark.parametrize("data_bits", [16, 64, 128, 512])
+def test_not_slower(data_bits):
+    """the bulk conversions are at least as fast as the loops they replaced, at every beat width"""
+    size = 1 << 16
+    nbytes = data_bits // 8
+    data = [random.getrandbits(data_bits) for _ in range(size // nbytes)]
+    bdata = list(random.randbytes(size))
+    badr = list(range(size))
+
+    def best(f):
+        return min(timeit.repeat(f, number=1, repeat=5))
+
+    assert beats2bytearray(data, size, data_bits) == _loop_beats2bytearray(data, size, data_bits)
+    assert best(lambda: beats2bytearray(data, size, data_bits)) < best(
+        lambda: _loop_beats2bytearray(data, size, data_bits)
+    )
+    assert bytestobeats(badr, bdata, data_bits) == _loop_bytestobeats(badr, bdata, data_bits)
+    assert best(lambda: bytestobeats(badr, bdata, data_bits)) < best(lambda: _loop_bytestobeats(badr, bdata, data_bits))
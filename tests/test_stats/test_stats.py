@@ -0,0 +1,131 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import random
+
+import pytest
+from myhdl import (
+    ResetSignal,
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    AXIStreamSink,
+    AXIStreamSource,
+    AXIStreamStats,
+    FrameLatencyTracker,
+    axis,
+)
+
+
+def tb(src_stats, snk_stats, DATA_WIDTH=32, simlen=40, store=True):
+    """
+    Testbench for AXIStreamStats on an AXIStreamSource to AXIStreamSink loopback
+    """
+    frames = [list(range(random.randint(1, 30))) for _ in range(simlen)]
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        rst = ResetSignal(0, active=1, isasync=True)
+        axis_sigs = axis(DATA_WIDTH=DATA_WIDTH)
+        snd_pause = Signal(bool(0))
+        rcv_pause = Signal(bool(0))
+
+        m_axis = AXIStreamSource(stats=src_stats)
+        m_axis_logic = m_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=snd_pause)  # noqa: F841
+        s_axis = AXIStreamSink(stats=snk_stats, store=store)
+        s_axis_logic = s_axis.create_logic(clk=clk, rst=rst, axis=axis_sigs, pause=rcv_pause)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @always(clk.posedge)
+        def pause_rand():
+            snd_pause.next = random.randint(1, 4) == 1
+            rcv_pause.next = random.randint(1, 3) == 1
+
+        @instance
+        def tbstim():
+            rst.next = rst.active
+            yield clk.posedge
+            yield clk.posedge
+            rst.next = not rst.active
+            for f in frames:
+                m_axis.send(f)
+            while s_axis.frames < simlen:
+                yield clk.posedge
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+    return frames
+
+
+def test_stream_stats():
+    with pytest.raises(ValueError):
+        FrameLatencyTracker(size=0)
+    tracker = FrameLatencyTracker(size=64, bin_width=20)
+    src = AXIStreamStats(tracker=tracker)
+    snk = AXIStreamStats(tracker=tracker)
+    simlen = 40
+    frames = tb(src, snk, simlen=simlen)
+    print(src.report("source"))
+    print(snk.report("sink"))
+
+    beats = sum((len(f) + 3) // 4 for f in frames)
+    assert src.beats == snk.beats == beats
+    assert src.frames == snk.frames == simlen
+    assert src.stalls == snk.stalls > 0
+    assert 0 < snk.utilization() < 1
+    assert src.queue_latency.n == simlen
+    assert src.queue_latency.max > src.queue_latency.min
+    assert snk.frame_cycles.n == simlen
+    assert snk.frame_cycles.min >= 0
+    assert tracker.latency.n == simlen
+    assert tracker.unmatched == 0
+    assert tracker.latency.min > 0
+    # six bus signals per beat, tdest, tid and tuser never change
+    assert src.signal_updates + src.signal_skips == 6 * beats
+    assert src.signal_skips >= 3 * beats
+    assert snk.signal_updates == snk.signal_skips == 0
+
+
+def test_stream_stats_id_fn():
+    # frames carry their length as id, so the tracker matches frames of the same length
+    tracker = FrameLatencyTracker(size=4, id_fn=lambda f: len(f.data))
+    snk = AXIStreamStats(tracker=tracker)
+    tb(AXIStreamStats(tracker=tracker), snk, simlen=20, store=False)
+    assert snk.frames == 20  # noqa: PLR2004
+    assert tracker.latency.n + tracker.unmatched == 20  # noqa: PLR2004
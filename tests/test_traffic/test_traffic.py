@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import random
+
+import pytest
+from myhdl import (
+    Signal,
+    StopSimulation,
+    always,
+    block,
+    delay,
+    instance,
+    instances,
+)
+
+from veri_quickbench.tb_endpoints import (
+    BurstIdlePause,
+    DutyCyclePause,
+    PauseEngine,
+    RandomPause,
+    TokenBucketPause,
+)
+
+
+def test_random_pause():
+    with pytest.raises(ValueError):
+        RandomPause(1.5)
+    rng = random.Random(1)
+    n = 100000
+    for p in (0, 0.1, 0.25, 0.5, 1):
+        ones = bin(RandomPause(p).fill(rng, n)).count("1")
+        assert abs(ones / n - p) < 0.01  # noqa: PLR2004
+
+
+def test_duty_cycle_pause():
+    rng = random.Random(1)
+    prof = DutyCyclePause(period=5, pause_cycles=2, phase=4)
+    bits = prof.fill(rng, 7) | (prof.fill(rng, 8) << 7)
+    assert format(bits, "015b")[::-1] == "100011000110001"
+    with pytest.raises(ValueError):
+        DutyCyclePause(period=2, pause_cycles=3)
+
+
+def test_burst_idle_pause():
+    rng = random.Random(1)
+    n = 200000
+    ones = bin(BurstIdlePause(burst_mean=12, idle_mean=4).fill(rng, n)).count("1")
+    assert abs(ones / n - 0.25) < 0.02  # noqa: PLR2004
+
+
+def test_token_bucket_pause():
+    rng = random.Random(1)
+    prof = TokenBucketPause(rate=0.25, burst=4)
+    bits = format(prof.fill(rng, 64), "064b")[::-1]
+    assert bits.startswith("0000")  # full bucket
+    for start in range(0, 60):
+        window = bits[start : start + 16]
+        assert window.count("0") <= 4 + 16 * 0.25
+    assert abs(bits.count("0") - 4 - 60 * 0.25) <= 1
+    inner = TokenBucketPause(rate=1, burst=1, inner=RandomPause(0.5))
+    assert 0.4 < bin(inner.fill(rng, 1000)).count("1") / 1000 < 0.6  # noqa: PLR2004
+
+
+def test_pause_engine_seed():
+    a = PauseEngine(seed=7)
+    a.add("x")
+    a.add("y", DutyCyclePause())
+    b = PauseEngine(seed=7)
+    b.add("y", DutyCyclePause())
+    b.add("x")
+    assert a.pattern("x", 100) == b.pattern("x", 100)
+    assert a.pattern("y", 8) == [True, False, False, False] * 2
+    c = PauseEngine(seed=8)
+    c.add("x")
+    assert a.pattern("x", 100) != c.pattern("x", 100)
+    with pytest.raises(ValueError):
+        a.add("x")
+    with pytest.raises(KeyError):
+        a.pattern("z", 1)
+
+
+def test_pause_engine_logic():
+    """
+    PauseEngine drives its signals with the pattern of each profile
+    """
+    simlen = 100
+    engine = PauseEngine(seed=3, batch=16)
+    ref = PauseEngine(seed=3)
+    seen = {"a": [], "b": []}
+
+    @block
+    def test():
+        clk = Signal(bool(1))
+        a = engine.add("a", RandomPause(0.5))
+        b = engine.add("b", DutyCyclePause(period=3, pause_cycles=1))
+        ref.add("a", RandomPause(0.5))
+        ref.add("b", DutyCyclePause(period=3, pause_cycles=1))
+        engine_logic = engine.create_logic(clk)  # noqa: F841
+
+        @always(delay(3))
+        def tbclk():
+            clk.next = not clk
+
+        @instance
+        def tbstim():
+            for _ in range(simlen):
+                yield clk.posedge
+                yield delay(1)
+                seen["a"].append(bool(a))
+                seen["b"].append(bool(b))
+            raise StopSimulation
+
+        return instances()
+
+    tb = test()
+    tb.config_sim(backend="myhdl", trace=False)
+    tb.run_sim()
+    tb.quit_sim()
+    # each value is set one clock before it is sampled, so the first one is not seen
+    for name, got in seen.items():
+        exp = []
+        while len(exp) <= simlen:
+            exp += ref.pattern(name, engine.batch)
+        assert got == exp[1 : simlen + 1]
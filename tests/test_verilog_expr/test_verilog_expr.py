@@ -0,0 +1,127 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import pytest
+
+from veri_quickbench.tb_creator import VerilogExprError, eval_expr, eval_params, port_width, verilog_module
+from veri_quickbench.tb_creator._verilog_expr import to_python, width_to_python
+
+VERILOG = """
+module fifo #(
+  parameter DATA_WIDTH = 32,
+  parameter KEEP_WIDTH = DATA_WIDTH/8,
+  parameter DEPTH = 'd1000,
+  parameter MASK = 8'hF0
+) (
+  input  wire                     clk,
+  input  wire [DATA_WIDTH-1:0]    s_axis_tdata,
+  input  wire [KEEP_WIDTH-1:0]    s_axis_tkeep,
+  input  wire                     s_axis_tvalid,
+  output wire                     s_axis_tready,
+  output wire [$clog2(DEPTH):0]   count
+);
+endmodule
+"""
+
+
+def test_eval_expr():
+    assert eval_expr("DATA_WIDTH/8-1", {"DATA_WIDTH": 64}) == 7  # noqa: PLR2004
+    assert eval_expr("$clog2(DEPTH) + 1", {"DEPTH": 1024}) == 11  # noqa: PLR2004
+    assert [eval_expr("$clog2(%d)" % x) for x in (0, 1, 2, 3, 1000)] == [0, 0, 1, 2, 10]
+    assert eval_expr("8'hff + 'd10 + 4'b1_010 + 1_000") == 255 + 10 + 10 + 1000
+    assert eval_expr("W > 8 ? W : 8", {"W": 4}) == 8  # noqa: PLR2004
+    assert eval_expr("1 << 2 + 1") == 8  # noqa: PLR2004
+    # division truncates toward zero, the remainder follows the dividend
+    assert (eval_expr("-7/2"), eval_expr("-7%2")) == (-3, -1)
+    for bad in ("1.5", "4'bx1", "A +", "$bits(A)", "B", "1/0"):
+        with pytest.raises(VerilogExprError):
+            eval_expr(bad, {"A": 1})
+
+
+def test_eval_params():
+    decls = (("W", "= 16"), ("K", "= W/8"), ("M", "= 2**K-1"))
+    assert eval_params(decls) == {"W": 16, "K": 2, "M": 3}
+    assert eval_params(decls, (("W", 64),)) == {"W": 64, "K": 8, "M": 255}
+    # memoized, callers get their own copy
+    eval_params(decls)["W"] = 0
+    assert eval_params(decls)["W"] == 16  # noqa: PLR2004
+    with pytest.raises(VerilogExprError, match="parameter K"):
+        eval_params((("K", "= W/8"),))
+
+
+def test_widths():
+    assert width_to_python("[DATA_WIDTH-1:0]") == "DATA_WIDTH"
+    assert width_to_python("[DATA_WIDTH/8-1:0]") == "(DATA_WIDTH // 8 if DATA_WIDTH >= 0 else -(-DATA_WIDTH // 8))"
+    assert width_to_python("[15:8]") == "8"
+    assert width_to_python("[W:0]") == "W + 1"
+    assert width_to_python("[0:W-1]") == "W"
+    assert width_to_python("[A-1:B]") == "abs(A - 1 - B) + 1"
+    assert to_python("(A+B)*C >> 1") == "(A + B) * C >> 1"
+    assert to_python("$clog2(D)") == "max(D - 1, 0).bit_length()"
+    assert port_width("[DATA_WIDTH/8-1:0]", {"DATA_WIDTH": 32}) == 4  # noqa: PLR2004
+    assert (port_width("[0:7]"), port_width("")) == (8, 1)
+    assert port_width("[A:B]", {"A": 2, "B": 5}) == 4  # noqa: PLR2004
+    with pytest.raises(VerilogExprError, match="bits wide"):
+        port_width("[W-1:8]", {"W": 4})
+    # Verilog division truncates toward zero
+    # and stays exact past 2**53
+    for expr in ("-7/2", "7/-2", "-7%2", "7%-2", "(1-8)/2*3", "-9%4%3", "2**70/3", "-(2**70)/3", "2**70%-3", "5/(2-4)"):
+        assert eval(to_python(expr)) == eval_expr(expr), expr  # noqa: S307
+    # the Python form gives the same width
+    for size in (
+        "[DATA_WIDTH-1:0]",
+        "[(DATA_WIDTH+7)/8-1:0]",
+        "[$clog2(DATA_WIDTH):0]",
+        "[DATA_WIDTH:4]",
+        "[4:DATA_WIDTH]",
+        "[DATA_WIDTH/2:DATA_WIDTH-1]",
+    ):
+        python = eval(width_to_python(size), {"DATA_WIDTH": 30})  # noqa: S307
+        assert python == port_width(size, {"DATA_WIDTH": 30})
+
+
+def test_verilog_module(tmp_path):
+    f = tmp_path / "fifo.v"
+    f.write_text(VERILOG)
+    mod = verilog_module(str(f))
+    assert mod.get_params(value_format="python") == [
+        ("DATA_WIDTH", "32"),
+        ("KEEP_WIDTH", "4"),
+        ("DEPTH", "1000"),
+        ("MASK", "0xf0"),
+    ]
+    assert mod.param_values({"DATA_WIDTH": 64}) == {"DATA_WIDTH": 64, "KEEP_WIDTH": 8, "DEPTH": 1000, "MASK": 240}
+    assert mod.port_widths({"DEPTH": 16}) == {
+        "clk": 1,
+        "s_axis_tdata": 32,
+        "s_axis_tkeep": 4,
+        "s_axis_tvalid": 1,
+        "s_axis_tready": 1,
+        "count": 5,
+    }
+    assert mod.iface_params("s_axis") == {"DATA_WIDTH": "DATA_WIDTH"}
+    assert mod.portsize_to_signal("[KEEP_WIDTH-1:0]") == "intbv(0)[KEEP_WIDTH:]"
+    assert mod.portsize_to_signal("[0:7]") == "intbv(0)[8:]"
+    assert "self.count = Signal(intbv(0)[max(DEPTH - 1, 0).bit_length() + 1:])" in mod.print_myhdl_signals(
+        format_str="self.{} = {}({})"
+    )
@@ -0,0 +1,132 @@
+# MIT License
+#
+# Copyright (c) 2022 Chip Lukes
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pathlib import Path
+
+import pytest
+
+from veri_quickbench.tb_creator import verilog_module, verilog_port
+from veri_quickbench.tb_creator._verilog_scanner import VerilogScanError, scan_file, scan_module
+
+EXAMPLE = Path(__file__).parents[2] / "examples" / "src" / "passthru.v"
+
+VERILOG95 = """
+// verilog 95 style
+module old_style (clk, rst, din, dout);
+  parameter WIDTH = 8;
+  parameter [3:0] MODE = 4'h2;
+  input clk;
+  input wire rst;
+  input signed [WIDTH-1:0] din; // data in
+  output reg [WIDTH-1:0] dout;
+  always @(posedge clk) dout <= din;
+endmodule
+"""
+
+
+def parse(text, scanner):
+    mod = verilog_module.__new__(verilog_module)
+    mod.debug = False
+    return mod.parse_ir(text, scanner=scanner)
+
+
+def port_fields(ir):
+    ports = [verilog_port(*x) for x in ir["ports"]]
+    # pyparsing keeps a comment after the last parameter in its value
+    return [(p.pstyle, p.pdir, p.ptype, p.psign, p.psize, p.pname, p.pvalue.split("//")[0].rstrip()) for p in ports]
+
+
+@pytest.mark.parametrize("text", [EXAMPLE.read_text(), VERILOG95], ids=["passthru", "verilog95"])
+def test_same_as_pyparsing(text):
+    scanned = parse(text, scanner=True)
+    parsed = parse(text, scanner=False)
+    assert scanned["name"] == parsed["name"]
+    assert port_fields(scanned) == port_fields(parsed)
+
+
+def test_scan_module():
+    ir = scan_module("""
+        /* module fake (input x); */
+        module top #(parameter W = 8, D = 2, parameter [3:0] M = 4'h3) (
+            input wire clk,
+            input wire [W-1:0] red, grn,  // one declaration, two ports
+            output reg signed [$clog2(D):0] q = 0
+        );
+        endmodule
+        module second (input wire z);
+        endmodule
+        """)
+    assert ir["name"] == "top"
+    assert ir["ports"] == [
+        ["parameter", "", "", "", "", "W", "= 8"],
+        ["parameter", "", "", "", "", "D", "= 2"],
+        ["parameter", "", "", "", "[3:0]", "M", "= 4'h3"],
+        ["port", "input", "wire", "", "", "clk", ""],
+        ["port", "input", "wire", "", "[W-1:0]", "red", ""],
+        ["port", "input", "wire", "", "[W-1:0]", "grn", ""],
+        ["port", "output", "reg", "signed", "[$clog2(D):0]", "q", "= 0"],
+    ]
+    # function and task inputs are not ports
+    func = VERILOG95.replace("  always", "  function [7:0] f;\n    input [7:0] x;\n    f = x;\n  endfunction\n  always")
+    assert [x[5] for x in scan_module(func)["ports"]] == ["WIDTH", "MODE", "clk", "rst", "din", "dout"]
+    assert scan_module("module empty; endmodule") == {"name": "empty", "ports": []}
+
+
+def test_fallback(monkeypatch):
+    sv = "module sv (input logic clk, axi_if.master m);\nendmodule\n"
+    with pytest.raises(VerilogScanError):
+        scan_module(sv)
+    with pytest.raises(VerilogScanError):
+        scan_module("// nothing here\n")
+    with pytest.raises(VerilogScanError):
+        scan_module("module m (input wire a,\n`ifdef B input wire b, `endif\n input wire c);\nendmodule\n")
+
+    # the pyparsing grammar is used when the scanner gives up
+    def give_up(text):
+        raise VerilogScanError("give up")
+
+    monkeypatch.setattr("veri_quickbench.tb_creator._verilog_module.scan_module", give_up)
+    text = EXAMPLE.read_text()
+    assert parse(text, scanner=True) == parse(text, scanner=False)
+
+
+def test_scan_file_instances():
+    text = """
+    module t #(parameter N = 4) (input a);
+      genvar i;
+      generate for (i = 0; i < N; i = i + 1) begin : g_lane
+        lane #(.W(8)) u_lane (.a(a));
+      end : g_lane
+      endgenerate
+      always @(posedge a) begin : p_seq
+        if (a) $display("a");
+      end
+      fork : f_blk
+        leaf u_leaf (a);
+      join
+    endmodule
+    module lane (input a); endmodule
+    """
+    mods = scan_file(text)
+    assert [m["name"] for m in mods] == ["t", "lane"]
+    assert mods[0]["instances"] == ["lane", "leaf"]
+    assert mods[1]["instances"] == []